@@ -0,0 +1,148 @@
+"""Entity search index
+
+Revision ID: b3e1f4a2c9d7
+Revises: 83fac9948381
+Create Date: 2026-10-18 12:20:41.361902
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'b3e1f4a2c9d7'
+down_revision = '83fac9948381'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+
+    # Normalized entity content stored in a side table, so that searches do not have to compute
+    # diacritic_xform() for each checked entity, maintained by a trigger on entity creation and content
+    # update and removed on entity deletion via cascade.
+
+    op.execute('''
+
+        create extension if not exists pg_trgm;
+
+
+        create table if not exists
+        public.entitysearch (
+
+          client_id BIGINT NOT NULL,
+          object_id BIGINT NOT NULL,
+
+          content_lower TEXT NOT NULL,
+          content_xform TEXT NOT NULL,
+
+          primary key (client_id, object_id),
+
+          foreign key (client_id, object_id)
+            references public.entity (client_id, object_id)
+            on delete cascade);
+
+
+        insert into
+        public.entitysearch
+
+        select
+          client_id,
+          object_id,
+          lower(content),
+          public.diacritic_xform(content)
+
+        from
+          public.entity
+
+        where
+          content is not null
+
+        on conflict do nothing;
+
+
+        create index if not exists
+        entitysearch_content_lower_idx on public.entitysearch using hash
+        (content_lower);
+
+        create index if not exists
+        entitysearch_content_xform_idx on public.entitysearch using hash
+        (content_xform);
+
+        create index if not exists
+        entitysearch_content_lower_trgm_idx on public.entitysearch using gin
+        (content_lower gin_trgm_ops);
+
+        create index if not exists
+        entitysearch_content_xform_trgm_idx on public.entitysearch using gin
+        (content_xform gin_trgm_ops);
+
+
+        create or replace function
+
+        entity_search_update()
+        returns trigger as
+        $$
+
+        begin
+
+          if new.content is null then
+
+            delete from public.entitysearch
+            where
+              client_id = new.client_id and
+              object_id = new.object_id;
+
+          else
+
+            insert into public.entitysearch
+            values (
+              new.client_id,
+              new.object_id,
+              lower(new.content),
+              public.diacritic_xform(new.content))
+
+            on conflict (client_id, object_id) do update
+            set
+              content_lower = excluded.content_lower,
+              content_xform = excluded.content_xform;
+
+          end if;
+
+          return null;
+
+        end
+
+        $$
+        language plpgsql;
+
+
+        drop trigger if exists
+        entity_search_update_trigger on public.entity;
+
+        create trigger
+        entity_search_update_trigger
+
+        after insert or update of content
+        on public.entity
+
+        for each row
+        execute procedure entity_search_update();
+
+        analyze public.entitysearch;
+
+        ''')
+
+
+def downgrade():
+
+    op.execute('''
+
+        drop trigger if exists
+        entity_search_update_trigger on public.entity;
+
+        drop function if exists entity_search_update();
+
+        drop table if exists public.entitysearch;
+
+        ''')
@@ -0,0 +1,79 @@
+"""EAF search index
+
+Revision ID: c4d2a7e9f1b3
+Revises: b3e1f4a2c9d7
+Create Date: 2026-10-18 14:02:17.825310
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'c4d2a7e9f1b3'
+down_revision = 'b3e1f4a2c9d7'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+
+    # Index is filled on demand by EAF search, see lingvodoc.utils.search.eaf_index_update().
+
+    op.execute('''
+
+        create table if not exists
+        public.eaf_index_entity (
+
+          client_id BIGINT NOT NULL,
+          object_id BIGINT NOT NULL,
+
+          error BOOLEAN NOT NULL DEFAULT FALSE,
+
+          primary key (client_id, object_id),
+
+          foreign key (client_id, object_id)
+            references public.entity (client_id, object_id)
+            on delete cascade);
+
+
+        create table if not exists
+        public.eaf_index_word (
+
+          client_id BIGINT NOT NULL,
+          object_id BIGINT NOT NULL,
+
+          tier TEXT NOT NULL,
+          token TEXT NOT NULL,
+
+          time_begin BIGINT,
+          time_end BIGINT,
+
+          foreign key (client_id, object_id)
+            references public.eaf_index_entity (client_id, object_id)
+            on delete cascade);
+
+
+        create index if not exists
+        eaf_index_word_entity_idx on public.eaf_index_word
+        (client_id, object_id);
+
+        create index if not exists
+        eaf_index_word_token_trgm_idx on public.eaf_index_word using gin
+        (token gin_trgm_ops);
+
+        create index if not exists
+        eaf_index_word_tier_trgm_idx on public.eaf_index_word using gin
+        (tier gin_trgm_ops);
+
+        ''')
+
+
+def downgrade():
+
+    op.execute('''
+
+        drop table if exists public.eaf_index_word;
+        drop table if exists public.eaf_index_entity;
+
+        ''')
@@ -41,6 +41,9 @@ from .models import (
 from lingvodoc.cache.caching import (
     initialize_cache)
 
+from lingvodoc.utils.graphql_cache import (
+    DOCUMENT_CACHE)
+
 
 # Setting up logging.
 log = logging.getLogger(__name__)
@@ -695,6 +698,15 @@ def configure_routes(config):
         pattern = '/merge/suggestions/{perspective_client_id}/{perspective_object_id}',
         factory = 'lingvodoc.models.LexicalEntriesEntitiesAcl')
 
+    # API #POST
+    #
+    # Launches background merge suggestions computation task, parameters are the same as of
+    # 'merge_suggestions' route, suggestions are saved as a JSON file linked from the task status.
+    #
+    config.add_route(name = 'merge_suggestions_async',
+        pattern = '/merge/suggestions_async/{perspective_client_id}/{perspective_object_id}',
+        factory = 'lingvodoc.models.LexicalEntriesEntitiesAcl')
+
     # API #POST
     # {'group_list': <group_list>, 'publish_any': bool}
     #
@@ -924,6 +936,50 @@ def main(global_config, **settings):
         initialize_cache(cache_kwargs)
         settings['cache_kwargs'] = cache_kwargs
 
+    # Setting up GraphQL parsed query document cache, see lingvodoc/utils/graphql_cache.py.
+
+    if parser.has_section('graphql'):
+
+        graphql_dict = dict(parser.items('graphql'))
+
+        if 'query_cache_size' in graphql_dict:
+
+            DOCUMENT_CACHE.configure(
+                int(graphql_dict['query_cache_size']))
+
+    # Getting merge suggestions settings, see merge_suggestions_compute() in lingvodoc/views/v2/merge.py.
+
+    merge_dict = {'suggestions_process_count': 1}
+
+    if parser.has_section('merge'):
+
+        merge_section_dict = dict(parser.items('merge'))
+
+        if 'suggestions_process_count' in merge_section_dict:
+
+            merge_dict['suggestions_process_count'] = (
+                int(merge_section_dict['suggestions_process_count']))
+
+    settings['merge'] = merge_dict
+
+    # Getting phonology settings, see phonology_prefetch_iter() and AudioPraatLike.get_pitch() in
+    # lingvodoc/views/v2/phonology.py.
+
+    phonology_dict = {'process_count': 1, 'pitch_process_count': 1}
+
+    if parser.has_section('phonology'):
+
+        phonology_section_dict = dict(parser.items('phonology'))
+
+        for key in phonology_dict:
+
+            if key in phonology_section_dict:
+
+                phonology_dict[key] = (
+                    int(phonology_section_dict[key]))
+
+    settings['phonology'] = phonology_dict
+
     # Getting SMTP account settings.
 
     if parser.has_section('smtp'):
@@ -1,20 +1,28 @@
 
 # Standard library imports.
 
+import collections
+import itertools
 import logging
+import threading
+import uuid
 
 # Library imports.
 
 from pyramid.security import forget
 
 from sqlalchemy import (
+    event,
     literal,
-    or_)
+    tuple_)
 
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
 
 # Project imports.
 
+import lingvodoc.cache.caching as caching
+
 from lingvodoc.models import (
     acl_by_groups,
     acl_by_groups_single_id,
@@ -23,11 +31,15 @@ from lingvodoc.models import (
     DBSession,
     DictionaryPerspective,
     Group,
+    Organization,
     organization_to_group_association,
+    TranslationAtom,
     User,
     user_to_group_association,
     user_to_organization_association)
 
+from lingvodoc.utils import ids_to_id_query
+
 
 # Setting up logging.
 log = logging.getLogger(__name__)
@@ -44,6 +56,254 @@ def get_effective_client_id(client_id, request):
     else:
         return client_id
 
+
+class Group_Cache(object):
+    """
+    Cache of precomputed per-user group data used in permission checks, with in-process LRU in front of the
+    Redis cache in front of the DB.
+
+    Cached data is valid for a generation identified by a token stored in the cache, any change of group
+    memberships, see invalidate_groups(), switches to a new generation after commit. Data stored in Redis
+    also expires after a TTL, just in case.
+    """
+
+    generation_key = 'acl_groups_generation'
+    key_format_str = 'acl_groups:%s'
+
+    def __init__(self, size = 4096, ttl = 3600):
+
+        self.size = size
+        self.ttl = ttl
+
+        self.lock = threading.Lock()
+        self.user_dict = collections.OrderedDict()
+
+        # Used if we do not have a shared cache, e.g. with MockCache.
+
+        self.local_generation = str(uuid.uuid4())
+
+    def generation(self):
+        """
+        Gets current cached data generation token.
+        """
+
+        return (
+
+            caching.cache_generation(
+                self.generation_key,
+                self.local_generation))
+
+    def invalidate(self):
+        """
+        Switches to a new generation, invalidating all cached group data.
+        """
+
+        generation = str(uuid.uuid4())
+
+        with self.lock:
+
+            self.local_generation = generation
+            self.user_dict.clear()
+
+        if caching.CACHE is not None:
+
+            caching.CACHE.set(
+                key = self.generation_key,
+                value = generation)
+
+    def get(self, user_id):
+        """
+        Gets group data of a user, see compute().
+        """
+
+        generation = self.generation()
+
+        with self.lock:
+
+            entry = self.user_dict.get(user_id)
+
+            if entry is not None and entry[0] == generation:
+
+                self.user_dict.move_to_end(user_id)
+                return entry[1]
+
+        cache = caching.CACHE
+        cache_key = self.key_format_str % user_id
+
+        entry = (
+            cache.get(cache_key) if cache is not None else None)
+
+        if entry is None or entry[0] != generation:
+
+            entry = (
+                generation, self.compute(user_id))
+
+            if cache is not None:
+
+                cache.set(
+                    key = cache_key,
+                    value = entry,
+                    ttl = self.ttl)
+
+        with self.lock:
+
+            self.user_dict[user_id] = entry
+            self.user_dict.move_to_end(user_id)
+
+            while len(self.user_dict) > self.size:
+                self.user_dict.popitem(last = False)
+
+        return entry[1]
+
+    @staticmethod
+    def compute(user_id):
+        """
+        Computes group data of a user from the DB with a single query.
+
+        Returns a dictionary with
+
+        'subject': for each subject, names of by-user groups of the subject, for all actions and for only
+        the 'view' action, see groupfinder(),
+
+        'organization': names of by-organization groups, for all actions and for only the 'view' action,
+
+        'permission': set of permission keys, see check_direct().
+        """
+
+        user_query = (
+
+            DBSession
+
+                .query(
+                    BaseGroup.action,
+                    BaseGroup.subject,
+                    Group.subject_client_id,
+                    Group.subject_object_id,
+                    Group.subject_override,
+                    literal(False))
+
+                .filter(
+                    Group.base_group_id == BaseGroup.id,
+                    user_to_group_association.c.user_id == user_id,
+                    user_to_group_association.c.group_id == Group.id))
+
+        organization_query = (
+
+            DBSession
+
+                .query(
+                    BaseGroup.action,
+                    BaseGroup.subject,
+                    Group.subject_client_id,
+                    Group.subject_object_id,
+                    Group.subject_override,
+                    literal(True))
+
+                .filter(
+                    Group.base_group_id == BaseGroup.id,
+                    user_to_organization_association.c.user_id == user_id,
+                    organization_to_group_association.c.organization_id ==
+                        user_to_organization_association.c.organization_id,
+                    organization_to_group_association.c.group_id == Group.id))
+
+        subject_dict = collections.defaultdict(lambda: (set(), set()))
+        organization_name_set, organization_view_set = set(), set()
+
+        permission_set = set()
+
+        for (
+            action,
+            subject,
+            subject_client_id,
+            subject_object_id,
+            subject_override,
+            organization_flag) in user_query.union_all(organization_query):
+
+            # Group names, same as in groupfinder() before caching.
+
+            if subject_override:
+                group_name = action + ":" + subject + ":" + str(subject_override)
+
+            elif subject_client_id or organization_flag:
+                group_name = action + ":" + subject + ":" + str(subject_client_id) + ":" + str(subject_object_id)
+
+            else:
+                group_name = action + ":" + subject + ":" + str(subject_object_id)
+
+            name_set, view_set = (
+                (organization_name_set, organization_view_set) if organization_flag else
+                    subject_dict[subject])
+
+            name_set.add(group_name)
+
+            if action == 'view':
+                view_set.add(group_name)
+
+            # Permission keys.
+
+            if subject_override:
+
+                permission_set.add(('override', action, subject))
+
+                if not organization_flag:
+                    permission_set.add(('user_override', action, subject))
+
+            permission_set.add(('id', action, subject, subject_client_id, subject_object_id))
+            permission_set.add(('object_id', action, subject, subject_object_id))
+
+        return {
+            'subject': dict(subject_dict),
+            'organization': (organization_name_set, organization_view_set),
+            'permission': permission_set}
+
+
+GROUP_CACHE = Group_Cache()
+
+
+def invalidate_groups(session = DBSession):
+    """
+    Marks group memberships as changed, cached group data is invalidated after the session's transaction is
+    committed.
+
+    Changes made through the ORM, e.g. by utils/creation.py:edit_role(), are detected automatically, so
+    it's only required after changes made otherwise, e.g. with direct association table inserts.
+    """
+
+    session.info['acl_groups_changed'] = True
+
+
+@event.listens_for(Session, 'after_flush')
+def groups_after_flush(session, flush_context):
+    """
+    Detects changes of group memberships.
+    """
+
+    if session.info.get('acl_groups_changed'):
+        return
+
+    for instance in itertools.chain(
+        session.new, session.dirty, session.deleted):
+
+        if (isinstance(instance, (Group, BaseGroup, Organization)) or
+
+            isinstance(instance, User) and (
+                get_history(instance, 'groups').has_changes() or
+                get_history(instance, 'organizations').has_changes())):
+
+            session.info['acl_groups_changed'] = True
+            return
+
+
+@event.listens_for(Session, 'after_commit')
+def groups_after_commit(session):
+    """
+    Invalidates cached group data if group memberships were changed.
+    """
+
+    if session.info.pop('acl_groups_changed', False):
+        GROUP_CACHE.invalidate()
+
+
 def groupfinder(client_id, request, factory = None, subject = None):
 
     client_id = get_effective_client_id(client_id, request)
@@ -83,68 +343,33 @@ def groupfinder(client_id, request, factory = None, subject = None):
                         .join(Client) \
                         .filter(Client.id == client_id).first()
 
-        groups = DBSession.query(Group)\
-            .join(BaseGroup)\
-            .join(Group.users)\
-            .options(joinedload('BaseGroup')) \
-            .filter(User.id == user.id)
-        if subject:
-            groups = groups.filter(BaseGroup.subject == subject)
-        groups = groups.all()
+        user_id = user.id
 
     except AttributeError as e:
             log.error('forget in acl.py')
             forget(request)
             return None
 
-    if not user:
-        return None
-
-    groupset = set()
-
-    if user.id == 1:
-        groupset.add('Admin')
-
-    for group in groups:
-        base_group = group.BaseGroup
-
-        # If the user is deactivated, we won't allow any actions except for viewing.
-
-        if not user.is_active and base_group.action != 'view':
-            continue
+    group_dict = GROUP_CACHE.get(user_id)
 
-        if group.subject_override:
-            group_name = base_group.action + ":" + base_group.subject + ":" + str(group.subject_override)
+    # If the user is deactivated, we won't allow any actions except for viewing.
 
-        else:
-            if group.subject_client_id:
-                group_name = base_group.action + ":" + base_group.subject \
-                             + ":" + str(group.subject_client_id) + ":" + str(group.subject_object_id)
-            else:
-                 group_name = base_group.action + ":" + base_group.subject \
-                             + ":" + str(group.subject_object_id)
+    index = 0 if user.is_active else 1
 
-        groupset.add(group_name)
+    groupset = set()
 
-    for org in user.organizations:
-        for group in org.groups:
-            base_group = group.BaseGroup
+    if user_id == 1:
+        groupset.add('Admin')
 
-            # If the user is deactivated, we won't allow any actions except for viewing.
+    subject_set_tuple = group_dict['subject'].get(subject)
 
-            if not user.is_active and base_group.action != 'view':
-                continue
+    if subject_set_tuple:
+        groupset.update(subject_set_tuple[index])
 
-            if group.subject_override:
-                group_name = base_group.action + ":" + base_group.subject + ":" + str(group.subject_override)
-            else:
-                group_name = base_group.action + ":" + base_group.subject \
-                             + ":" + str(group.subject_client_id) + ":" + str(group.subject_object_id)
-
-            groupset.add(group_name)
+    groupset.update(group_dict['organization'][index])
 
     log.debug("GROUPSET: %d, %s", len(groupset), list(sorted(groupset)))
-    return groupset # todo: caching
+    return groupset
 
 
 def check(client_id, request, action, subject, subject_id):
@@ -191,8 +416,8 @@ def check(client_id, request, action, subject, subject_id):
 
 def check_direct(client_id, request, action, subject, subject_id):
     """
-    Checks if a given action on a given subject is permitted for the specified client, accesses DB directly,
-    so should be faster.
+    Checks if a given action on a given subject is permitted for the specified client with set lookups in
+    cached group data, see Group_Cache, so should be faster.
     """
 
     client_id = get_effective_client_id(client_id, request)
@@ -242,167 +467,145 @@ def check_direct(client_id, request, action, subject, subject_id):
         if not user.is_active and action != 'view':
             return False
 
-        # Ok, checking as usual, first through by-user permissions...
-        #
-        # NOTE: using exists() as tests have shown it's slightly faster than limit-count-based method, see
-        # gql_entity.py, CreateEntity mutation.
-
-        user_query = (
-
-            DBSession
-
-                .query(literal(1))
-
-                .filter(
-                    BaseGroup.subject == subject,
-                    BaseGroup.action == action,
-                    Group.base_group_id == BaseGroup.id,
+        # Ok, checking as usual through cached by-user and by-organization permissions.
 
-                    or_(Group.subject_override,
-                        Group.subject_id == subject_id),
+        permission_set = GROUP_CACHE.get(user.id)['permission']
 
-                    user_to_group_association.c.user_id == user.id,
-                    user_to_group_association.c.group_id == Group.id))
-
-        user_exists = (
+        return (
+            ('override', action, subject) in permission_set or
+            ('id', action, subject, subject_id[0], subject_id[1]) in permission_set)
 
-            DBSession
-                .query(user_query.exists())
-                .scalar())
+    # Subject is specified by a single object_id.
 
-        if user_exists:
-            return True
+    elif isinstance(subject_id, int):
 
-        # ...and then through by-organization permissions.
+        # If the user is deactivated, we won't allow any actions except for viewing.
 
-        organization_query = (
+        if not user.is_active and action != 'view':
+            return False
 
-            DBSession
+        # Checking as usual through cached by-user and by-organization permissions.
 
-                .query(literal(1))
+        permission_set = GROUP_CACHE.get(user.id)['permission']
 
-                .filter(
-                    BaseGroup.subject == subject,
-                    BaseGroup.action == action,
-                    Group.base_group_id == BaseGroup.id,
+        return (
+            ('override', action, subject) in permission_set or
+            ('object_id', action, subject, subject_id) in permission_set)
 
-                    or_(Group.subject_override,
-                        Group.subject_id == subject_id),
+    # There could be subjects with no id, because they don't exist yet.
+    # In that case we only need to check if user is authorized to create this type of objects.
 
-                    user_to_organization_association.c.user_id == user.id,
-                    organization_to_group_association.c.organization_id ==
-                        user_to_organization_association.c.organization_id,
-                    organization_to_group_association.c.group_id == Group.id))
+    else:
 
-        return (
+        # If the user is deactivated, we won't allow any actions except for viewing.
 
-            DBSession
-                .query(organization_query.exists())
-                .scalar())
+        if not user.is_active and action != 'view':
+            return False
 
-    # Subject is specified by a single object_id.
+        # There probably shouldn't be organizations with admin permissions, so checking only by-user
+        # permissions.
 
-    elif isinstance(subject_id, int):
+        permission_set = GROUP_CACHE.get(user.id)['permission']
 
-        subject_object_id = subject_id
+        return ('user_override', action, subject) in permission_set
 
-        # If the user is deactivated, we won't allow any actions except for viewing.
+    # Ok, we have a subject we do not know how to process, so we terminate with error.
+    # 
+    # In the normal course of operation we shouldn't ever be able to reach this code, but if we somehow do,
+    # we at least should know that something is not right.
 
-        if not user.is_active and action != 'view':
-            return False
+    raise NotImplementedError
 
-        # Checking as usual, first through by-user permissions...
 
-        user_query = (
 
-            DBSession
+def check_direct_many(client_id, request, action, subject, subject_id_list):
+    """
+    Checks if a given action is permitted for the specified client on each of the subjects specified by
+    client_id/object_id pairs, same as check_direct(), but with a fixed number of queries independent of the
+    number of subjects.
 
-                .query(literal(1))
+    Returns set of (client_id, object_id) tuples of subjects with permission.
+    """
 
-                .filter(
-                    BaseGroup.subject == subject,
-                    BaseGroup.action == action,
-                    Group.base_group_id == BaseGroup.id,
+    client_id = get_effective_client_id(client_id, request)
 
-                    or_(Group.subject_override,
-                        Group.subject_object_id == subject_object_id),
+    subject_id_list = [
+        tuple(subject_id[:2]) for subject_id in subject_id_list]
 
-                    user_to_group_association.c.user_id == user.id,
-                    user_to_group_association.c.group_id == Group.id))
+    try:
+        user = Client.get_user_by_client_id(client_id)
 
-        user_exists = (
+    except:
+        return set()
 
-            DBSession
-                .query(user_query.exists())
-                .scalar())
+    def published_id_set():
+        """
+        Gets ids of perspectives with 'Published' or 'Limited access' state.
+        """
 
-        if user_exists:
-            return True
+        id_list = subject_id_list
 
-        # ...and then through by-organization permissions.
+        if len(id_list) > 2:
+            id_list = ids_to_id_query(id_list)
 
-        organization_query = (
+        return set(
 
             DBSession
 
-                .query(literal(1))
+                .query(
+                    DictionaryPerspective.client_id,
+                    DictionaryPerspective.object_id)
 
                 .filter(
-                    BaseGroup.subject == subject,
-                    BaseGroup.action == action,
-                    Group.base_group_id == BaseGroup.id,
-
-                    or_(Group.subject_override,
-                        Group.subject_object_id == subject_object_id),
+                    tuple_(
+                        DictionaryPerspective.client_id,
+                        DictionaryPerspective.object_id)
+                        .in_(id_list),
+                    TranslationAtom.parent_client_id ==
+                        DictionaryPerspective.state_translation_gist_client_id,
+                    TranslationAtom.parent_object_id ==
+                        DictionaryPerspective.state_translation_gist_object_id,
+                    TranslationAtom.locale_id == 2,
+                    TranslationAtom.content.in_(['Published', 'Limited access']))
+
+                .all())
 
-                    user_to_organization_association.c.user_id == user.id,
-                    organization_to_group_association.c.organization_id ==
-                        user_to_organization_association.c.organization_id,
-                    organization_to_group_association.c.group_id == Group.id))
+    if (not client_id or
+        not user):
 
-        return (
+        # Special case for perspective, we allow anonymous view access based on perspective state.
 
-            DBSession
-                .query(organization_query.exists())
-                .scalar())
+        if action != 'view' and action != 'preview':
+            return set()
 
-    # There could be subjects with no id, because they don't exist yet.
-    # In that case we only need to check if user is authorized to create this type of objects.
+        return published_id_set()
 
-    else:
+    result_set = set()
 
-        # If the user is deactivated, we won't allow any actions except for viewing.
+    # Special case for 'approve_entities' perspective subject, permission depends on perspective's state, see
+    # check_direct().
 
-        if not user.is_active and action != 'view':
-            return False
+    if (subject == 'approve_entities' and
+        (action == 'view' or action == 'preview')):
 
-        user_query = (
+        result_set = published_id_set()
 
-            DBSession.
+    # If the user is deactivated, we won't allow any actions except for viewing.
 
-                query(literal(1))
+    if not user.is_active and action != 'view':
+        return result_set
 
-                .filter(
-                    BaseGroup.subject == subject,
-                    BaseGroup.action == action,
-                    Group.base_group_id == BaseGroup.id,
-                    Group.subject_override,
-                    user_to_group_association.c.user_id == user.id,
-                    user_to_group_association.c.group_id == Group.id))
+    permission_set = GROUP_CACHE.get(user.id)['permission']
 
-        # There probably shouldn't be organizations with admin permissions, so not checking through
-        # organizations.
+    if ('override', action, subject) in permission_set:
+        return set(subject_id_list)
 
-        return (
+    result_set.update(
 
-            DBSession
-                .query(user_query.exists())
-                .scalar())
+        subject_id
 
-    # Ok, we have a subject we do not know how to process, so we terminate with error.
-    # 
-    # In the normal course of operation we shouldn't ever be able to reach this code, but if we somehow do,
-    # we at least should know that something is not right.
+        for subject_id in subject_id_list
 
-    raise NotImplementedError
+        if ('id', action, subject, subject_id[0], subject_id[1]) in permission_set)
 
+    return result_set
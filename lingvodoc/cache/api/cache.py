@@ -17,3 +17,18 @@ class ICache:
 
     def rem(self, key):
         raise NotImplementedError
+
+    def get_many(self, keys):
+        """
+        :param keys: list of keys
+        :return: list of cached values, with None for keys without cached values.
+        """
+        return [self.get(key) for key in keys]
+
+    def set_many(self, key_value, ttl=None):
+        """
+        :param key_value: dictionary of key-value pairs to cache.
+        :param ttl: optional time to live in seconds.
+        """
+        for key, value in key_value.items():
+            self.set(key, value)
@@ -1,9 +1,8 @@
 __author__ = 'alexander'
 
-import dill
-
 # from dogpile.cache.api import NO_VALUE
 
+from lingvodoc.cache import codec
 from lingvodoc.cache.api.cache import ICache
 
 
@@ -19,11 +18,38 @@ class CommonCache(ICache):
         cached = self.cache.get(key)
         if cached is None:
             return None
-        return dill.loads(cached)
+        return codec.loads(cached)
 
     # TODO: add try/catch handlers.
-    def set(self, key, value):
-        self.cache.set(key, dill.dumps(value))
+    def set(self, key, value, ttl=None):
+        self.cache.set(key, codec.dumps(value), ex=ttl)
 
     def rem(self, key):
         self.cache.delete(key)
+
+    def get_many(self, keys):
+        """
+        Gets values of a list of keys with a single MGET.
+        """
+        if not keys:
+            return []
+        return [
+            None if cached is None else codec.loads(cached)
+            for cached in self.cache.mget(keys)]
+
+    def set_many(self, key_value, ttl=None):
+        """
+        Sets key-value pairs with a single MSET, or with a single pipeline round trip if we have TTL.
+        """
+        if not key_value:
+            return
+        data_dict = {
+            key: codec.dumps(value)
+            for key, value in key_value.items()}
+        if ttl is None:
+            self.cache.mset(data_dict)
+            return
+        pipeline = self.cache.pipeline(transaction=False)
+        for key, data in data_dict.items():
+            pipeline.set(key, data, ex=ttl)
+        pipeline.execute()
@@ -1,8 +1,11 @@
+import json
 import time
 # from dogpile.cache.api import NO_VALUE
 # from dogpile.cache import make_region
 from redis import Redis
+from redis.exceptions import ResponseError
 
+from lingvodoc.cache import codec
 from lingvodoc.cache.basic.cache import CommonCache
 from lingvodoc.cache.mock.cache import MockCache
 from lingvodoc.cache.through.cache import ThroughCache
@@ -61,7 +64,77 @@ def initialize_cache(args):
     CACHE = ThroughCache(Redis(**args))
 
 
+def cache_redis():
+    """
+    Gets Redis client of the cache, or None if the cache is not Redis-based, e.g. is a MockCache.
+    """
+
+    if isinstance(CACHE, (CommonCache, ThroughCache)):
+        return CACHE.cache
+
+    return None
+
+
+def cache_generation(key, local_generation):
+    """
+    Gets cached data generation token stored under a given key.
+
+    If we do not have a stored token, e.g. after Redis restart or eviction, stores a fresh one unless some
+    other process already did it and returns whatever token ends up stored, so that cached data of any
+    previous generation, including the local one, is not valid anymore.
+
+    If the cache is not Redis-based, e.g. is a MockCache, returns the local generation token.
+    """
+
+    redis = cache_redis()
+
+    if redis is None:
+        return local_generation
+
+    generation = CACHE.get(key)
+
+    if generation is not None:
+        return generation
+
+    fresh_generation = str(uuid.uuid4())
+
+    redis.set(
+        key, codec.dumps(fresh_generation), nx = True)
+
+    generation = CACHE.get(key)
+
+    return (
+        generation if generation is not None else fresh_generation)
+
+
 class TaskStatus():
+    """
+    Status of a background task.
+
+    Stored in Redis as a hash under the 'task:<task_id>' key with JSON-encoded field values, tasks of a user
+    are indexed by the 'task_index:<user_id>' sorted set scored by task creation time.
+
+    Status updates write only changed fields with a single HMSET, and updates changing only progress and
+    coming faster than once in throttle_interval seconds are merged with the next ones.
+    """
+
+    field_list = (
+        'id',
+        'key',
+        'user_id',
+        'current_stage',
+        'total_stages',
+        'progress',
+        'task_family',
+        'task_details',
+        'status',
+        'result_link_list',
+        'created_at')
+
+    index_key_format_str = 'task_index:%s'
+
+    throttle_interval = 0.5
+
     def __init__(self, user_id, task_family, task_details, total_stages):
         self.id = str(uuid.uuid4())
         self.user_id = str(user_id)
@@ -78,45 +151,143 @@ class TaskStatus():
 
         self.put_to_cache()
 
-    def put_to_cache(self):
-        if CACHE:
-            CACHE.set(self.key, dill.dumps(self))
-            current_tasks = CACHE.get("current_tasks:" + self.user_id)
-            if current_tasks:
-                current_tasks = dill.loads(current_tasks)
-                if self.key not in current_tasks:
-                    current_tasks.add(self.key)
-            else:
-                current_tasks = set([self.key])
-            CACHE.set("current_tasks:" + self.user_id, dill.dumps(current_tasks))
+    def field_dict(self):
+
+        return {
+            name: getattr(self, name, None)
+            for name in self.field_list}
+
+    @classmethod
+    def from_hash(cls, hash_dict):
+        """
+        Restores task status from its Redis hash.
+        """
+
+        task = cls.__new__(cls)
+
+        field_dict = {
+            name: None for name in cls.field_list}
+
+        field_dict['result_link_list'] = []
+        field_dict['created_at'] = 0
+
+        for name, value in hash_dict.items():
+
+            if isinstance(name, bytes):
+                name = name.decode('utf-8')
+
+            if isinstance(value, bytes):
+                value = value.decode('utf-8')
+
+            field_dict[name] = json.loads(value)
+
+        task.__dict__.update(field_dict)
+
+        # Restored status is as written, but its first update should not be throttled.
+
+        task._written_dict = dict(field_dict)
+        task._written_at = 0
+
+        return task
+
+    def put_to_cache(self, throttle = False):
+        redis = cache_redis()
+        if redis is None:
+            return
+
+        field_dict = self.field_dict()
+        written_dict = getattr(self, '_written_dict', None)
+
+        # Not yet written or converted from a legacy dill-serialized status, writing the whole hash.
+
+        if written_dict is None:
+
+            pipeline = redis.pipeline()
+
+            pipeline.delete(self.key)
+
+            pipeline.hmset(
+                self.key,
+                {name: json.dumps(value) for name, value in field_dict.items()})
+
+            pipeline.zadd(
+                self.index_key_format_str % self.user_id,
+                **{self.key: field_dict['created_at'] or 0})
+
+            pipeline.execute()
+
+        else:
+
+            update_dict = {
+                name: value
+                for name, value in field_dict.items()
+                if value != written_dict.get(name)}
+
+            if not update_dict:
+                return
+
+            if (throttle and
+                list(update_dict) == ['progress'] and
+                self.progress < 100 and
+                time.time() - self._written_at < self.throttle_interval):
+                return
+
+            redis.hmset(
+                self.key,
+                {name: json.dumps(value) for name, value in update_dict.items()})
+
+        self._written_dict = field_dict
+        self._written_at = time.time()
 
     @classmethod
     def get_from_cache(cls, task_key):
-        if CACHE:
+        redis = cache_redis()
+        if redis is None:
+            return TaskStatus(0, "Dummy task", "task not found" if CACHE else "cache failure", 1)
+
+        try:
+            hash_dict = redis.hgetall(task_key)
+
+        # Legacy dill-serialized task status.
+
+        except ResponseError:
             task = CACHE.get(task_key)
-            if task:
-                return dill.loads(task)
-            else:
-                return TaskStatus(0, "Dummy task", "task not found", 1)
+            return dill.loads(task) if task else TaskStatus(0, "Dummy task", "task not found", 1)
+
+        if hash_dict:
+            return cls.from_hash(hash_dict)
         else:
-            return TaskStatus(0, "Dummy task", "cache failure", 1)
+            return TaskStatus(0, "Dummy task", "task not found", 1)
 
     @classmethod
     def get_user_tasks(cls, user_id, clear_out=False):
         task_list = []
-        if CACHE:
-            current_tasks = CACHE.get("current_tasks:" + str(user_id))
-            current_tasks = dill.loads(current_tasks) if current_tasks else []
-            for task_id in current_tasks:
-                task = CACHE.get(task_id)
-                if task:
-                    task = dill.loads(task)
-                    task_list.append(task)
+        redis = cache_redis()
+        if redis is not None:
+            index_key = cls.index_key_format_str % str(user_id)
+            task_key_list = redis.zrevrange(index_key, 0, -1)
+
+            # Getting all tasks in a single round trip, and dropping index entries of deleted tasks.
+
+            pipeline = redis.pipeline(transaction = False)
+            for task_key in task_key_list:
+                pipeline.hgetall(task_key)
+
+            deleted_key_list = []
+            for task_key, hash_dict in zip(task_key_list, pipeline.execute()):
+                if hash_dict:
+                    task_list.append(cls.from_hash(hash_dict))
+                else:
+                    deleted_key_list.append(task_key)
+
+            if deleted_key_list:
+                redis.zrem(index_key, *deleted_key_list)
+
         task_list.sort(
-            key=lambda task: (getattr(task, 'created_at', 0), task.id),
+            key=lambda task: (task.created_at or 0, task.id),
             reverse=True)
         if clear_out:
-            return [task.__dict__ for task in task_list]
+            return [task.field_dict() for task in task_list]
         else:
             return task_list
 
@@ -131,15 +302,13 @@ class TaskStatus():
         if result_link_list:
             self.result_link_list.extend(result_link_list)
 
-        self.put_to_cache()
+        self.put_to_cache(throttle = True)
 
     def delete(self):
-        if CACHE:
-            current_tasks = CACHE.get("current_tasks:" + self.user_id)
-            if current_tasks:
-                current_tasks = dill.loads(current_tasks)
-                if self.key in current_tasks:
-                    current_tasks.remove(self.key)
-                    CACHE.set("current_tasks:" + self.user_id, dill.dumps(current_tasks))
-                    CACHE.rem(self.key)
+        redis = cache_redis()
+        if redis is not None:
+            pipeline = redis.pipeline()
+            pipeline.zrem(self.index_key_format_str % self.user_id, self.key)
+            pipeline.delete(self.key)
+            pipeline.execute()
         return None
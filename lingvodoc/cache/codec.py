@@ -0,0 +1,73 @@
+import marshal
+
+import dill
+
+
+'''
+Cached values serialization.
+
+Plain values, i.e. None, bools, numbers, strings, bytes and tuples, lists, sets and dicts of plain values, which
+are the bulk of cached data, e.g. translations, are serialized with marshal, which is several times faster
+than dill both ways and gives more compact results. Anything else, e.g. SQLAlchemy objects, falls back to
+dill.
+
+Marshal-serialized values are tagged with a prefix byte, untagged values are dill pickles, so that values
+cached before are still readable.
+'''
+
+MARSHAL_TAG = b'M'
+
+# Marshal format version 2 is the last one without object references, which we do not need, and is much
+# faster to load.
+
+MARSHAL_VERSION = 2
+
+PLAIN_TYPE_SET = {
+    type(None), bool, int, float, str, bytes}
+
+CONTAINER_TYPE_SET = {
+    tuple, list, set, frozenset}
+
+
+def is_plain(value):
+    """
+    Checks if a value can be exactly restored after marshal serialization.
+
+    We can't just try marshal.dumps(), because it accepts subclasses of builtin types, e.g. named tuples
+    or default dicts, and loses their types.
+    """
+
+    value_type = type(value)
+
+    if value_type in PLAIN_TYPE_SET:
+        return True
+
+    if value_type in CONTAINER_TYPE_SET:
+        return all(is_plain(item) for item in value)
+
+    if value_type is dict:
+
+        return all(
+            is_plain(key) and is_plain(item)
+            for key, item in value.items())
+
+    return False
+
+
+def dumps(value):
+
+    if is_plain(value):
+
+        return (
+            MARSHAL_TAG +
+            marshal.dumps(value, MARSHAL_VERSION))
+
+    return dill.dumps(value)
+
+
+def loads(data):
+
+    if data[:1] == MARSHAL_TAG:
+        return marshal.loads(data[1:])
+
+    return dill.loads(data)
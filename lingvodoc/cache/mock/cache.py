@@ -7,5 +7,14 @@ class MockCache(ICache):
     def get(self, key):
         return None
 
-    def set(self, key, value):
+    def set(self, key, value, ttl=None):
+        pass
+
+    def rem(self, key):
+        pass
+
+    def get_many(self, keys):
+        return [None] * len(keys)
+
+    def set_many(self, key_value, ttl=None):
         pass
@@ -1,9 +1,9 @@
 __author__ = 'winking-maniac'
 
-import dill
 # from lingvodoc.models import DBSession, Entity
 # from dogpile.cache.api import NO_VALUE
 
+from lingvodoc.cache import codec
 from lingvodoc.cache.api.cache import ICache
 
 import logging
@@ -81,15 +81,9 @@ class ThroughCache(ICache):
             cached = self.cache.get(keys)
             if not cached:
                 return None
-            return dill.loads(cached)
+            return codec.loads(cached)
         elif isinstance(keys, list):
-            result = []
-            for key in keys:
-                cached = self.cache.get(key)
-                if cached is None:
-                    result.append(None)
-                result.append(dill.loads(cached))
-            return result
+            return self.get_many(keys)
 
         if not DBSession:
             err_msg = 'DBSession cannot be None'
@@ -115,11 +109,11 @@ class ThroughCache(ICache):
                     if not cached:
                         pass
                     else:
-                        self.cache.set(key, dill.dumps(cached))
+                        self.cache.set(key, codec.dumps(cached))
                 else:
                     # potentially race condition following data loss
                     # cached = DBSession.merge(dill.loads(cached), load=False)
-                    cached = dill.loads(cached)
+                    cached = codec.loads(cached)
                     try:
                         DBSession.add(cached)
                     except:
@@ -140,7 +134,8 @@ class ThroughCache(ICache):
 
 
     # TODO: add try/catch handlers.
-    def set(self, key = None, value = None, key_value = None, objects = list(), transaction = False, DBSession=None):
+    def set(self, key = None, value = None, key_value = None, objects = list(), transaction = False, DBSession=None,
+            ttl = None):
         """
         Inserts objects to cache and database
 
@@ -148,22 +143,18 @@ class ThroughCache(ICache):
             Stores key-value pair in cache. No database queries.
         :key_value: dictionary
             Stores key-value pairs in cache. No database queries.
+        :ttl: int
+            Optional time to live in seconds of key-value pairs stored in cache.
         :objects: list/tuple of objects
             Inserts objects into database, then to cache. Basically stores one by one.
             If you want to save all or nothing, use :transaction:
             Returns list of True/False(one value if :transaction:) flags of success
         """
         if key is not None:
-            self.cache.set(key, dill.dumps(value))
+            self.cache.set(key, codec.dumps(value), ex=ttl)
             return
         if key_value is not None:
-            self.cache.mset(
-                dict(
-                    map(lambda key_value_pair: (key_value_pair[0], dill.dumps(key_value_pair[1]) ),
-                        key_value.items()
-                    )
-                )
-            )
+            self.set_many(key_value, ttl)
 
 
 
@@ -175,7 +166,7 @@ class ThroughCache(ICache):
                 accepted_for_caching = dict(
                     map(
                         lambda obj:
-                            (f'auto:{obj.__class__.__name__}:{obj.client_id}:{obj.object_id}', dill.dumps(obj)),
+                            (f'auto:{obj.__class__.__name__}:{obj.client_id}:{obj.object_id}', codec.dumps(obj)),
                         objects
                     )
                 )
@@ -193,7 +184,7 @@ class ThroughCache(ICache):
                 try:
                     DBSession.add(obj)
                     DBSession.flush()
-                    self.cache.set(key, dill.dumps(obj))
+                    self.cache.set(key, codec.dumps(obj))
                     result.append(True)
                 except:
                     result.append(False)
@@ -210,3 +201,32 @@ class ThroughCache(ICache):
             self.cache.delete(keys)
         elif isinstance(keys, list):
             self.cache.delete(*keys)
+
+    def get_many(self, keys):
+        """
+        Gets values of a list of keys with a single MGET, no database queries.
+        Returns list of values, with None for keys without cached values.
+        """
+        if not keys:
+            return []
+        return [
+            None if cached is None else codec.loads(cached)
+            for cached in self.cache.mget(keys)]
+
+    def set_many(self, key_value, ttl = None):
+        """
+        Stores key-value pairs in cache with a single MSET, or with a single pipeline round trip if TTL is
+        specified. No database queries.
+        """
+        if not key_value:
+            return
+        data_dict = {
+            key: codec.dumps(value)
+            for key, value in key_value.items()}
+        if ttl is None:
+            self.cache.mset(data_dict)
+            return
+        pipeline = self.cache.pipeline(transaction = False)
+        for key, data in data_dict.items():
+            pipeline.set(key, data, ex = ttl)
+        pipeline.execute()
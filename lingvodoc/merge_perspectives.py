@@ -1,5 +1,11 @@
+import collections
+import logging
+import multiprocessing
 import re
-from pylev import levenshtein as edit_distance
+
+
+# Setting up logging.
+log = logging.getLogger(__name__)
 
 
 braces = re.compile(r"\([^()]*\)")
@@ -15,8 +21,256 @@ def flattenDict(d):
     return [(ent, trans, origent[2]) for origent in d for ent in getWordParts(origent[0]) for trans in getWordParts(origent[1])]
 
 
+def bounded_edit_distance(a, b, limit):
+    """
+    Levenshtein distance of two strings if it does not exceed the limit, or limit + 1 otherwise.
+
+    Computes only a diagonal band of width 2 * limit + 1 of the distance matrix, as proposed by Ukkonen, and
+    stops as soon as all values of a row exceed the limit.
+    """
+
+    if a == b:
+        return 0
+
+    if len(a) > len(b):
+        a, b = b, a
+
+    if len(b) - len(a) > limit:
+        return limit + 1
+
+    # Common prefix and suffix do not change the distance.
+
+    start = 0
+    while start < len(a) and a[start] == b[start]:
+        start += 1
+
+    end = 0
+    while end < len(a) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+
+    a = a[start : len(a) - end]
+    b = b[start : len(b) - end]
+
+    if not a:
+        return len(b)
+
+    over = limit + 1
+
+    previous = [j if j <= limit else over for j in range(len(b) + 1)]
+
+    for i in range(1, len(a) + 1):
+
+        char_a = a[i - 1]
+
+        current = [over] * (len(b) + 1)
+        current[0] = i if i <= limit else over
+
+        row_min = current[0]
+
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+
+            value = previous[j - 1] + (char_a != b[j - 1])
+
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+
+            if value > over:
+                value = over
+
+            current[j] = value
+
+            if value < row_min:
+                row_min = value
+
+        if row_min > limit:
+            return over
+
+        previous = current
+
+    return previous[-1]
+
+
+def edit_distance_pairs(string_list, limit, start = 0, stop = None):
+    """
+    Finds all pairs of strings of a list with Levenshtein distance not exceeding the limit, yields them as
+    pairs (index_a, index_b), index_a < index_b, ordered by index_b and then by index_a.
+
+    If start and/or stop are specified, yields only pairs with start <= index_b < stop, allowing to split
+    the pair space into independently processed chunks.
+
+    Candidate pairs are generated via an inverted index of string segments: if a string is split into
+    limit + 1 segments and another string is within the limit distance from it, by pigeonhole principle one
+    of the segments is a substring of the other string with position shifted no more than by the limit, see
+    Li et al. 2011, "Pass-Join: a partition-based method for similarity joins". Strings too short to be
+    split are checked directly. Candidates are then checked with bounded_edit_distance().
+    """
+
+    segment_count = limit + 1
+
+    def segment_list(length):
+        """
+        Positions and lengths of segments of a string of a given length.
+        """
+
+        short_length, long_count = divmod(length, segment_count)
+
+        position = 0
+        result_list = []
+
+        for i in range(segment_count):
+
+            segment_length = short_length + (i >= segment_count - long_count)
+            result_list.append((position, segment_length))
+
+            position += segment_length
+
+        return result_list
+
+    segment_index = collections.defaultdict(list)
+    short_index = collections.defaultdict(list)
+
+    def candidate_set(b):
+        """
+        Indices of already indexed strings which can be within the limit distance from a given string.
+        """
+
+        result_set = set()
+
+        for length in range(max(len(b) - limit, 0), len(b) + limit + 1):
+
+            # Strings shorter than the number of segments are compared directly.
+
+            if length < segment_count:
+                result_set.update(short_index[length])
+                continue
+
+            for i, (position, segment_length) in enumerate(segment_list(length)):
+
+                for b_position in range(
+                    max(position - limit, 0),
+                    min(position + limit, len(b) - segment_length) + 1):
+
+                    result_set.update(
+                        segment_index.get((length, i, b[b_position : b_position + segment_length]), ()))
+
+        return result_set
+
+    if stop is None or stop > len(string_list):
+        stop = len(string_list)
+
+    for index_b in range(stop):
+
+        b = string_list[index_b]
+
+        # Strings before the start are only indexed.
+
+        if index_b >= start:
+
+            for index_a in sorted(candidate_set(b)):
+                if bounded_edit_distance(string_list[index_a], b, limit) <= limit:
+                    yield index_a, index_b
+
+        # Indexing the string for the following ones.
+
+        if len(b) < segment_count:
+            short_index[len(b)].append(index_b)
+            continue
+
+        for i, (position, segment_length) in enumerate(segment_list(len(b))):
+            segment_index[(len(b), i, b[position : position + segment_length])].append(index_b)
+
+
+def edit_distance_match_count(argument_tuple):
+    """
+    Counts matches between entries of pairs of strings within the Levenshtein distance limit, see
+    edit_distance_pairs(), for pairs with second string index in a [start, stop) range.
+
+    Takes a tuple (string_list, entry_id_list_list, limit, start, stop), with entry_id_list_list containing
+    lists of ids of entries of each string, so that it can be used with multiprocessing pools. Returns
+    Counter of matches by pairs of entry ids (entry_id_a, entry_id_b), entry_id_a < entry_id_b.
+    """
+
+    string_list, entry_id_list_list, limit, start, stop = argument_tuple
+
+    match_counter = collections.Counter()
+
+    for index_a, index_b in edit_distance_pairs(string_list, limit, start, stop):
+
+        other_id_list = entry_id_list_list[index_b]
+
+        for entry_id in entry_id_list_list[index_a]:
+            for other_id in other_id_list:
+
+                if entry_id == other_id:
+                    continue
+
+                key = ((entry_id, other_id)
+                    if entry_id <= other_id else (other_id, entry_id))
+
+                match_counter[key] += 1
+
+    return match_counter
+
+
+# Data shared by worker processes of a matching pool, see edit_distance_match_pool().
+
+match_pool_data = None
+
+
+def match_pool_initializer(string_list, entry_id_list_list, limit):
+
+    global match_pool_data
+
+    match_pool_data = (
+        string_list, entry_id_list_list, limit)
+
+
+def edit_distance_match_range(range_tuple):
+    """
+    Counts matches in a matching pool worker process for pairs with second string index in a given
+    (start, stop) range, see edit_distance_match_count().
+    """
+
+    return (
+
+        edit_distance_match_count(
+            match_pool_data + tuple(range_tuple)))
+
+
+def edit_distance_match_pool(process_count, string_list, entry_id_list_list, limit):
+    """
+    Creates process pool for parallel computation of edit_distance_match_range(), with matching data sent
+    to each worker process once via pool initializer, or returns None if we can't create it, e.g. in a
+    daemonic process, so that matching is done in a single process.
+    """
+
+    # Daemonic processes, e.g. workers of another pool, are not allowed to have children.
+
+    if multiprocessing.current_process().daemon:
+        return None
+
+    try:
+
+        return (
+
+            multiprocessing.Pool(
+                process_count,
+                initializer = match_pool_initializer,
+                initargs = (string_list, entry_id_list_list, limit)))
+
+    except AssertionError:
+
+        log.warning(
+            'failed to create matching process pool, falling back to single process computation')
+
+        return None
+
+
 def additional_checks(w1, w2, levenstein = 1):
-    r = edit_distance(w1, w2)
+    r = bounded_edit_distance(w1, w2, levenstein)
     return r <= levenstein
 
 
@@ -1,6 +1,7 @@
 
 # Standard library imports.
 
+import collections
 import datetime
 import logging
 import uuid
@@ -687,6 +688,31 @@ class ParentMixin(PrimeTableArgs):
                 cls.parent_object_id))
 
 
+def select_translation_locale(
+    all_translations_dict,
+    locale_id):
+    """
+    Selects locale of a translation to show from a non-empty {str(locale_id): content} dictionary of
+    available translations: the required locale, then English, or Russian if English is the required one,
+    then anything at all.
+    """
+
+    main_locale = str(locale_id)
+
+    if all_translations_dict.get(main_locale) is not None:
+        return main_locale
+
+    fallback_locale = (
+        str(ENGLISH_LOCALE) if main_locale != str(ENGLISH_LOCALE) else str(RUSSIAN_LOCALE))
+
+    if all_translations_dict.get(fallback_locale) is not None:
+        return fallback_locale
+
+    # Ok, no main, no fallback, so we get anything at all.
+
+    return min(all_translations_dict)
+
+
 def get_translation(
     locale_id,
     client_id,
@@ -701,7 +727,6 @@ def get_translation(
     cache = caching.CACHE
 
     main_locale = str(locale_id)
-    fallback_locale = str(ENGLISH_LOCALE) if str(locale_id) != str(ENGLISH_LOCALE) else str(RUSSIAN_LOCALE)
 
     key_main = key_format_str % (
         str(client_id), str(object_id), str(main_locale))
@@ -721,35 +746,16 @@ def get_translation(
     if not all_translations_dict:
         return default if default is not None else "Translation missing for all locales"
 
-    elif all_translations_dict.get(main_locale) is not None:
-        translation = all_translations_dict.get(main_locale)
-        cache.set(key=key_main, value=translation)
-        return translation
-    elif all_translations_dict.get(fallback_locale) is not None:
-        translation = all_translations_dict.get(fallback_locale)
-        key_fallback = key_format_str % (
-            str(client_id), str(object_id), str(fallback_locale))
-        cache.set(key=key_fallback, value=translation)
-        return translation
-
-    # Ok, no main, no fallback, so we get anything at all.
-
-    for locale, translation in sorted(all_translations_dict.items()):
-
-        if locale != main_locale and locale != fallback_locale:
+    locale = (
+        select_translation_locale(all_translations_dict, main_locale))
 
-            key = key_format_str % (
-                str(client_id), str(object_id), str(locale))
-
-            cache.set(key = key, value = translation)
-            return translation
+    translation = all_translations_dict[locale]
 
-    # Should be unreachable, so just in case.
+    key = key_format_str % (
+        str(client_id), str(object_id), locale)
 
-    if default is not None:
-        return default
-
-    return "Translation missing for all locales"
+    cache.set(key = key, value = translation)
+    return translation
 
 
 def get_translations(
@@ -796,6 +802,258 @@ def get_translations(
     return all_translations_dict or None
 
 
+def get_translation_atom_dict(
+    gist_id_list,
+    session = DBSession,
+    chunk_size = 1000):
+    """
+    Gets non-deleted translations of a list of translation gists, with a single query for each chunk of
+    gist ids.
+
+    Returns dictionary of {str(locale_id): content} dictionaries by gist ids, only for gists with
+    translations.
+    """
+
+    translation_dict = collections.defaultdict(dict)
+
+    gist_id_list = list(gist_id_list)
+
+    for i in range(0, len(gist_id_list), chunk_size):
+
+        atom_query = (
+
+            session
+
+                .query(
+                    TranslationAtom.parent_client_id,
+                    TranslationAtom.parent_object_id,
+                    TranslationAtom.locale_id,
+                    TranslationAtom.content)
+
+                .filter(
+                    tuple_(
+                        TranslationAtom.parent_client_id,
+                        TranslationAtom.parent_object_id)
+                        .in_(gist_id_list[i : i + chunk_size]),
+                    TranslationAtom.marked_for_deletion == False))
+
+        for client_id, object_id, locale_id, content in atom_query:
+            translation_dict[(client_id, object_id)][str(locale_id)] = content
+
+    return translation_dict
+
+
+def get_translation_many(
+    locale_id,
+    gist_id_list,
+    session = DBSession,
+    key_format_str = 'translation:%s:%s:%s',
+    default = None):
+    """
+    Batched variant of get_translation(), gets translations of a list of translation gists with a single
+    cache MGET and a single DB query for gists without cached translations, with the same locale fallbacks.
+
+    Returns dictionary of translations by gist ids.
+    """
+
+    cache = caching.CACHE
+
+    main_locale = str(locale_id)
+
+    gist_id_list = list(set(
+        tuple(gist_id) for gist_id in gist_id_list))
+
+    cached_list = (
+
+        cache.get_many([
+            key_format_str % (str(client_id), str(object_id), main_locale)
+            for client_id, object_id in gist_id_list]))
+
+    result_dict = {}
+    miss_id_list = []
+
+    for gist_id, translation in zip(gist_id_list, cached_list):
+
+        if translation:
+            result_dict[gist_id] = translation
+
+        else:
+            miss_id_list.append(gist_id)
+
+    if not miss_id_list:
+        return result_dict
+
+    log.debug("No cached values, getting %d gists from DB", len(miss_id_list))
+
+    translation_dict = (
+        get_translation_atom_dict(miss_id_list, session))
+
+    cache_dict = {}
+
+    for gist_id in miss_id_list:
+
+        all_translations_dict = translation_dict.get(gist_id)
+
+        if not all_translations_dict:
+
+            result_dict[gist_id] = (
+                default if default is not None else "Translation missing for all locales")
+
+            continue
+
+        locale = (
+            select_translation_locale(all_translations_dict, main_locale))
+
+        translation = all_translations_dict[locale]
+
+        result_dict[gist_id] = translation
+
+        cache_dict[
+            key_format_str % (str(gist_id[0]), str(gist_id[1]), locale)] = translation
+
+    cache.set_many(cache_dict)
+
+    return result_dict
+
+
+def get_translations_many(
+    gist_id_list,
+    session = DBSession,
+    key_format_str = 'translations:%s:%s'):
+    """
+    Batched variant of get_translations(), gets all translations of a list of translation gists with a
+    single cache MGET and a single DB query for gists without cached translations.
+
+    Returns dictionary of translation dictionaries by gist ids, with None for gists without translations.
+    """
+
+    cache = caching.CACHE
+
+    gist_id_list = list(set(
+        tuple(gist_id) for gist_id in gist_id_list))
+
+    cached_list = (
+
+        cache.get_many([
+            key_format_str % (str(client_id), str(object_id))
+            for client_id, object_id in gist_id_list]))
+
+    result_dict = {}
+    miss_id_list = []
+
+    for gist_id, translations in zip(gist_id_list, cached_list):
+
+        if translations:
+            result_dict[gist_id] = translations
+
+        else:
+            miss_id_list.append(gist_id)
+
+    if not miss_id_list:
+        return result_dict
+
+    log.debug("No cached values, getting %d gists from DB", len(miss_id_list))
+
+    translation_dict = (
+        get_translation_atom_dict(miss_id_list, session))
+
+    cache_dict = {}
+
+    for gist_id in miss_id_list:
+
+        all_translations_dict = translation_dict.get(gist_id, {})
+
+        result_dict[gist_id] = all_translations_dict or None
+
+        cache_dict[
+            key_format_str % (str(gist_id[0]), str(gist_id[1]))] = all_translations_dict
+
+    cache.set_many(cache_dict)
+
+    return result_dict
+
+
+class Translation_Resolver(object):
+    """
+    Batched resolution of translations of translation gists.
+
+    Gist ids are registered via add(), and then the first lookup of a translation in some locale, or of all
+    translations, resolves it for all registered gists at once with a single cache MGET and a single DB
+    query for cache misses, see get_translation_many() and get_translations_many().
+    """
+
+    def __init__(self, session = DBSession):
+
+        self.session = session
+
+        self.gist_id_set = set()
+
+        self.translation_dict = {}
+        self.translations_dict = {}
+
+    def add(self, gist_id_iter):
+        """
+        Registers gist ids for batch resolution.
+        """
+
+        self.gist_id_set.update(
+            tuple(gist_id) for gist_id in gist_id_iter)
+
+    def translation(self, gist_id, locale_id):
+        """
+        Gets translation of a gist with the same locale fallbacks as get_translation(), resolving
+        translations of all other registered gists in the same locale if required.
+        """
+
+        gist_id = tuple(gist_id)
+        key = (gist_id, str(locale_id))
+
+        if key not in self.translation_dict:
+
+            self.gist_id_set.add(gist_id)
+
+            locale_str = str(locale_id)
+
+            gist_id_list = [
+                gist_id
+                for gist_id in self.gist_id_set
+                if (gist_id, locale_str) not in self.translation_dict]
+
+            result_dict = (
+
+                get_translation_many(
+                    locale_id, gist_id_list, self.session))
+
+            for result_id, translation in result_dict.items():
+                self.translation_dict[(result_id, locale_str)] = translation
+
+        return self.translation_dict[key]
+
+    def translations(self, gist_id):
+        """
+        Gets all translations of a gist, same as get_translations(), resolving translations of all other
+        registered gists if required.
+        """
+
+        gist_id = tuple(gist_id)
+
+        if gist_id not in self.translations_dict:
+
+            self.gist_id_set.add(gist_id)
+
+            gist_id_list = [
+                gist_id
+                for gist_id in self.gist_id_set
+                if gist_id not in self.translations_dict]
+
+            self.translations_dict.update(
+
+                get_translations_many(
+                    gist_id_list, self.session))
+
+        return self.translations_dict[gist_id]
+
+
 class TranslationMixin(PrimeTableArgs):
     translation_gist_client_id = Column(SLBigInteger(), nullable=False)
     translation_gist_object_id = Column(SLBigInteger(), nullable=False)
@@ -2000,6 +2258,59 @@ class PublishingEntity(
                 cls.object_id))
 
 
+class EntitySearch(
+    TableNameMixin,
+    Base):
+    """
+    Normalized entity content used by advanced search, lowercased and lowercased with diacritics
+    stripped via the diacritic_xform() database function, with trigram and hash indexes.
+
+    Maintained by a trigger on the entity table on entity creation and content update, see alembic
+    revision 'b3e1f4a2c9d7'; entities without content have no rows.
+    """
+
+    __parentname__ = 'Entity'
+    __table_args__ = ((ForeignKeyConstraint(['client_id', 'object_id'],
+                                            [__parentname__.lower() + '.client_id',
+                                             __parentname__.lower() + '.object_id'],
+                                            ondelete = 'CASCADE'),)
+                      )
+
+    client_id = Column(SLBigInteger(), primary_key = True)
+    object_id = Column(SLBigInteger(), primary_key = True)
+
+    content_lower = Column(UnicodeText, nullable = False)
+    content_xform = Column(UnicodeText, nullable = False)
+
+
+# Index of tier annotations of EAF markup entities used by EAF search, see alembic revision 'c4d2a7e9f1b3'.
+#
+# Entities are indexed on demand, each indexed entity has a row in eaf_index_entity, with error flag set if
+# its EAF file could not be parsed, and a row in eaf_index_word for each annotation, with lowercased tier
+# name and annotation value and annotation time interval in milliseconds, if known.
+
+eaf_index_entity = Table('eaf_index_entity', Base.metadata,
+                         Column('client_id', SLBigInteger(), primary_key = True),
+                         Column('object_id', SLBigInteger(), primary_key = True),
+                         Column('error', Boolean, default = False, nullable = False),
+                         ForeignKeyConstraint(['client_id', 'object_id'],
+                                              ['entity.client_id', 'entity.object_id'],
+                                              ondelete = 'CASCADE')
+                         )
+
+eaf_index_word = Table('eaf_index_word', Base.metadata,
+                       Column('client_id', SLBigInteger(), nullable = False),
+                       Column('object_id', SLBigInteger(), nullable = False),
+                       Column('tier', UnicodeText, nullable = False),
+                       Column('token', UnicodeText, nullable = False),
+                       Column('time_begin', BigInteger),
+                       Column('time_end', BigInteger),
+                       ForeignKeyConstraint(['client_id', 'object_id'],
+                                            ['eaf_index_entity.client_id', 'eaf_index_entity.object_id'],
+                                            ondelete = 'CASCADE')
+                       )
+
+
 user_to_group_association = Table('user_to_group_association', Base.metadata,
                                   Column('user_id', SLBigInteger(), ForeignKey('user.id')),
                                   Column('group_id', UUIDType, ForeignKey('group.id'))
@@ -19,6 +19,7 @@ import re
 import shutil
 import string
 import textwrap
+import threading
 import time
 import traceback
 import uuid
@@ -59,11 +60,13 @@ import sqlalchemy
 
 from sqlalchemy import (
     and_,
+    case,
     create_engine,
     func,
     literal,
     tuple_)
 
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm import aliased
 
 import sqlalchemy.types
@@ -113,7 +116,7 @@ from lingvodoc.utils.search import (
     find_lexical_entries_by_tags)
 
 import lingvodoc.views.v2.phonology as phonology
-from lingvodoc.views.v2.phonology import process_sound_markup, PickleCache
+from lingvodoc.views.v2.phonology import Acoustic_Cache, process_sound_markup
 
 from lingvodoc.views.v2.utils import anonymous_userid
 from pdb import set_trace as A
@@ -152,6 +155,55 @@ except:
     cognate_suggestions_f = None
 
 
+# In-memory LRU cache of distance graph embeddings, see CognateAnalysis.graph_embedding().
+
+graph_embedding_cache_dict = collections.OrderedDict()
+graph_embedding_cache_lock = threading.Lock()
+graph_embedding_cache_size = 256
+
+# Graphs with more points are embedded via L-BFGS-B instead of BFGS, as dense inverse Hessian updates of the
+# latter dominate minimization time for large graphs.
+
+graph_embedding_bfgs_limit = 64
+
+
+class Cognate_Data_Cache(Acoustic_Cache):
+    """
+    Persistent cache of per-perspective cognate analysis source data and of entry grouping data.
+
+    Keys include change stamps of the data, see CognateAnalysis.perspective_stamp_dict() and
+    CognateAnalysis.tag_stamp(), so that entries of changed perspectives are simply not found anymore and
+    are eventually evicted.
+    """
+
+    default_max_size = 1 << 30
+
+    cache_dir_name = 'cognate_cache'
+
+    #: Version of cached data format, should be changed when it changes.
+    data_version = 1
+
+
+def flag_digest(flag, client_id, object_id):
+    """
+    Aggregate MD5 digest of ordered ids of rows with a set flag, used in data change stamps, see
+    CognateAnalysis.perspective_stamp_dict().
+
+    Unlike sums of object ids, which are per-client counters, can't stay the same when one row's flag is
+    unset and another's is set.
+    """
+
+    return (
+
+        func.md5(
+            func.array_to_string(
+                func.array_agg(
+                    aggregate_order_by(
+                        case([(flag, func.concat(client_id, ':', object_id))]),
+                        tuple_(client_id, object_id))),
+                ',')))
+
+
 class PhonemicAnalysis(graphene.Mutation):
 
     class Arguments:
@@ -1222,6 +1274,398 @@ class CognateAnalysis(graphene.Mutation):
 
         return entry_already_set, group_list, time.time() - start_time
 
+    @staticmethod
+    def tag_data_union_find(
+        perspective_info_list,
+        tag_field_id):
+        """
+        Gets lexical entry grouping data with the same results as tag_data_plpgsql(), but instead of
+        calling linked_group() for each group, gets all tags linked to the entries of the specified
+        perspectives with a single recursive query and groups entries with union-find, computes elapsed
+        time.
+        """
+
+        start_time = time.time()
+
+        perspective_id_list = [
+            perspective_id
+            for _, perspective_id, _, _, _ in perspective_info_list]
+
+        if not perspective_id_list:
+
+            return set(), [], time.time() - start_time
+
+        # Tagged lexical entries of the perspectives, in the same order as in tag_data_plpgsql().
+
+        entry_id_list = (
+
+            DBSession.query(
+                dbLexicalEntry.client_id,
+                dbLexicalEntry.object_id)
+
+            .filter(
+
+                tuple_(
+                    dbLexicalEntry.parent_client_id,
+                    dbLexicalEntry.parent_object_id)
+
+                    .in_(
+                        ids_to_id_query(
+                            perspective_id_list)),
+
+                dbLexicalEntry.marked_for_deletion == False,
+                dbEntity.parent_client_id == dbLexicalEntry.client_id,
+                dbEntity.parent_object_id == dbLexicalEntry.object_id,
+                dbEntity.field_client_id == tag_field_id[0],
+                dbEntity.field_object_id == tag_field_id[1],
+                dbEntity.marked_for_deletion == False,
+                dbPublishingEntity.client_id == dbEntity.client_id,
+                dbPublishingEntity.object_id == dbEntity.object_id,
+                dbPublishingEntity.published == True,
+                dbPublishingEntity.accepted == True)
+
+            .group_by(
+                dbLexicalEntry.client_id,
+                dbLexicalEntry.object_id)
+
+            .all())
+
+        # All tags reachable from the tags of the perspectives' entries through entries sharing tags,
+        # which is what linked_cycle() computes iteratively for each group.
+
+        def tag_filter(entity, publishing_entity, entry):
+
+            return (
+
+                and_(
+                    entity.field_client_id == tag_field_id[0],
+                    entity.field_object_id == tag_field_id[1],
+                    entity.marked_for_deletion == False,
+                    publishing_entity.client_id == entity.client_id,
+                    publishing_entity.object_id == entity.object_id,
+                    publishing_entity.published == True,
+                    publishing_entity.accepted == True,
+                    entry.client_id == entity.parent_client_id,
+                    entry.object_id == entity.parent_object_id,
+                    entry.marked_for_deletion == False))
+
+        tag_cte = (
+
+            DBSession.query(
+                dbEntity.content.label('tag'))
+
+            .filter(
+
+                tuple_(
+                    dbLexicalEntry.parent_client_id,
+                    dbLexicalEntry.parent_object_id)
+
+                    .in_(
+                        ids_to_id_query(
+                            perspective_id_list)),
+
+                tag_filter(
+                    dbEntity, dbPublishingEntity, dbLexicalEntry))
+
+            .cte(recursive = True))
+
+        Link = aliased(dbEntity, name = 'Link')
+        PublishingLink = aliased(dbPublishingEntity, name = 'PublishingLink')
+        LinkEntry = aliased(dbLexicalEntry, name = 'LinkEntry')
+
+        Tag = aliased(dbEntity, name = 'Tag')
+        PublishingTag = aliased(dbPublishingEntity, name = 'PublishingTag')
+
+        tag_cte = (
+
+            tag_cte.union(
+
+                DBSession.query(
+                    Tag.content)
+
+                .filter(
+                    Link.content == tag_cte.c.tag,
+                    tag_filter(Link, PublishingLink, LinkEntry),
+                    Tag.parent_client_id == LinkEntry.client_id,
+                    Tag.parent_object_id == LinkEntry.object_id,
+                    Tag.field_client_id == tag_field_id[0],
+                    Tag.field_object_id == tag_field_id[1],
+                    Tag.marked_for_deletion == False,
+                    PublishingTag.client_id == Tag.client_id,
+                    PublishingTag.object_id == Tag.object_id,
+                    PublishingTag.published == True,
+                    PublishingTag.accepted == True)))
+
+        tag_entry_query = (
+
+            DBSession.query(
+                dbEntity.parent_client_id,
+                dbEntity.parent_object_id,
+                dbEntity.content)
+
+            .filter(
+                dbEntity.content == tag_cte.c.tag,
+                tag_filter(
+                    dbEntity, dbPublishingEntity, dbLexicalEntry)))
+
+        # Grouping entries linked through tags with union-find, entries are (client_id, object_id) tuples
+        # and tags are strings, so they can share the parent dictionary.
+
+        parent_dict = {}
+
+        def find(x):
+
+            root = x
+
+            while True:
+
+                parent = parent_dict.setdefault(root, root)
+
+                if parent == root:
+                    break
+
+                root = parent
+
+            while x != root:
+                parent_dict[x], x = root, parent_dict[x]
+
+            return root
+
+        tag_entry_id_set = set()
+
+        for entry_client_id, entry_object_id, tag in tag_entry_query.yield_per(16384):
+
+            entry_id = (entry_client_id, entry_object_id)
+            tag_entry_id_set.add(entry_id)
+
+            entry_root = find(entry_id)
+            tag_root = find(tag)
+
+            if entry_root != tag_root:
+                parent_dict[tag_root] = entry_root
+
+        group_dict = collections.defaultdict(set)
+
+        for entry_id in tag_entry_id_set:
+            group_dict[find(entry_id)].add(entry_id)
+
+        entry_already_set = set()
+        group_list = []
+
+        for entry_id in entry_id_list:
+
+            entry_id = tuple(entry_id)
+
+            if entry_id in entry_already_set:
+                continue
+
+            entry_id_set = (
+                group_dict.get(find(entry_id)) or {entry_id})
+
+            entry_already_set.update(entry_id_set)
+            group_list.append(entry_id_set)
+
+        return entry_already_set, group_list, time.time() - start_time
+
+    @staticmethod
+    def tag_data_benchmark(
+        perspective_info_list,
+        tag_field_id,
+        repeat_count = 3):
+        """
+        Compares lexical entry grouping via tag_data_union_find() with grouping via tag_data_plpgsql(),
+        checking that the results are the same and returning best elapsed times of both.
+        """
+
+        def key(group_list):
+
+            return [
+                sorted(entry_id_set)
+                for entry_id_set in group_list]
+
+        plpgsql_time = None
+        union_find_time = None
+
+        for i in range(repeat_count):
+
+            plpgsql_entry_set, plpgsql_group_list, elapsed_time = (
+
+                CognateAnalysis.tag_data_plpgsql(
+                    perspective_info_list, tag_field_id))
+
+            plpgsql_time = (
+                elapsed_time if plpgsql_time is None else
+                min(plpgsql_time, elapsed_time))
+
+            union_find_entry_set, union_find_group_list, elapsed_time = (
+
+                CognateAnalysis.tag_data_union_find(
+                    perspective_info_list, tag_field_id))
+
+            union_find_time = (
+                elapsed_time if union_find_time is None else
+                min(union_find_time, elapsed_time))
+
+        same_flag = (
+            plpgsql_entry_set == union_find_entry_set and
+            key(plpgsql_group_list) == key(union_find_group_list))
+
+        log.debug(
+            '\ntag_data_benchmark:'
+            '\n{} perspectives, {} entries, {} groups'
+            '\nplpgsql: {:.3f}s, union-find: {:.3f}s, same result: {}'.format(
+                len(perspective_info_list),
+                len(union_find_entry_set),
+                len(union_find_group_list),
+                plpgsql_time,
+                union_find_time,
+                same_flag))
+
+        return {
+            'entry_count': len(union_find_entry_set),
+            'group_count': len(union_find_group_list),
+            'plpgsql_time': plpgsql_time,
+            'union_find_time': union_find_time,
+            'same_flag': same_flag}
+
+    @staticmethod
+    def perspective_stamp_dict(perspective_id_list):
+        """
+        Computes change stamps of data of the specified perspectives.
+
+        As entities are never modified, only created and marked for deletion or published / accepted, a
+        stamp consists of counts and maximum creation times of lexical entries and entities of a
+        perspective and of digests of ids of deleted, published and accepted ones, see flag_digest(), and
+        changes on any data change.
+        """
+
+        if not perspective_id_list:
+            return {}
+
+        # Maximum creation times are retrieved as plain timestamps, as EpochType can't process NULLs.
+
+        entry_list = (
+
+            DBSession
+
+                .query(
+                    dbLexicalEntry.parent_client_id,
+                    dbLexicalEntry.parent_object_id,
+                    func.count(),
+                    func.max(dbLexicalEntry.created_at, type_ = sqlalchemy.types.DateTime),
+                    flag_digest(
+                        dbLexicalEntry.marked_for_deletion, dbLexicalEntry.client_id, dbLexicalEntry.object_id))
+
+                .filter(
+                    tuple_(
+                        dbLexicalEntry.parent_client_id,
+                        dbLexicalEntry.parent_object_id)
+
+                        .in_(
+                            ids_to_id_query(
+                                perspective_id_list)))
+
+                .group_by(
+                    dbLexicalEntry.parent_client_id,
+                    dbLexicalEntry.parent_object_id)
+
+                .all())
+
+        entity_list = (
+
+            DBSession
+
+                .query(
+                    dbLexicalEntry.parent_client_id,
+                    dbLexicalEntry.parent_object_id,
+                    func.count(),
+                    func.max(dbEntity.created_at, type_ = sqlalchemy.types.DateTime),
+                    flag_digest(
+                        dbEntity.marked_for_deletion, dbEntity.client_id, dbEntity.object_id),
+                    flag_digest(
+                        dbPublishingEntity.published, dbEntity.client_id, dbEntity.object_id),
+                    flag_digest(
+                        dbPublishingEntity.accepted, dbEntity.client_id, dbEntity.object_id))
+
+                .filter(
+                    tuple_(
+                        dbLexicalEntry.parent_client_id,
+                        dbLexicalEntry.parent_object_id)
+
+                        .in_(
+                            ids_to_id_query(
+                                perspective_id_list)),
+
+                    dbEntity.parent_client_id == dbLexicalEntry.client_id,
+                    dbEntity.parent_object_id == dbLexicalEntry.object_id,
+                    dbPublishingEntity.client_id == dbEntity.client_id,
+                    dbPublishingEntity.object_id == dbEntity.object_id)
+
+                .group_by(
+                    dbLexicalEntry.parent_client_id,
+                    dbLexicalEntry.parent_object_id)
+
+                .all())
+
+        stamp_dict = (
+            collections.defaultdict(lambda: [None, None]))
+
+        for index, row_list in enumerate((entry_list, entity_list)):
+
+            for row in row_list:
+
+                stamp_dict[tuple(row[:2])][index] = (
+
+                    tuple(
+                        value if isinstance(value, (int, float, type(None))) else str(value)
+                        for value in row[2:]))
+
+        return {
+            tuple(perspective_id): tuple(stamp_dict[tuple(perspective_id)])
+            for perspective_id in perspective_id_list}
+
+    @staticmethod
+    def tag_stamp(tag_field_id):
+        """
+        Computes change stamp of all tag data of the specified tag field, in the same manner as
+        perspective_stamp_dict().
+
+        Entry grouping can depend on tags of entries outside of the analyzed perspectives, so all tag data
+        is taken into account.
+        """
+
+        row = (
+
+            DBSession
+
+                .query(
+                    func.count(),
+                    func.max(dbEntity.created_at, type_ = sqlalchemy.types.DateTime),
+                    flag_digest(
+                        dbEntity.marked_for_deletion, dbEntity.client_id, dbEntity.object_id),
+                    flag_digest(
+                        dbPublishingEntity.published, dbEntity.client_id, dbEntity.object_id),
+                    flag_digest(
+                        dbPublishingEntity.accepted, dbEntity.client_id, dbEntity.object_id),
+                    flag_digest(
+                        dbLexicalEntry.marked_for_deletion, dbLexicalEntry.client_id, dbLexicalEntry.object_id))
+
+                .filter(
+                    dbEntity.field_client_id == tag_field_id[0],
+                    dbEntity.field_object_id == tag_field_id[1],
+                    dbPublishingEntity.client_id == dbEntity.client_id,
+                    dbPublishingEntity.object_id == dbEntity.object_id,
+                    dbLexicalEntry.client_id == dbEntity.parent_client_id,
+                    dbLexicalEntry.object_id == dbEntity.parent_object_id)
+
+                .one())
+
+        return (
+
+            tuple(
+                value if isinstance(value, (int, float, type(None))) else str(value)
+                for value in row))
+
     @staticmethod
     def export_xlsx(
         language_str,
@@ -1987,294 +2431,276 @@ class CognateAnalysis(graphene.Mutation):
         return result
 
     @staticmethod
-    def graph_2d_embedding(d_ij, verbose = False):
+    def graph_embedding_stress(d_ij, dimension):
+        """
+        Returns stress function and its gradient for embedding of a graph specified by non-negative
+        simmetric distance matrix into a space of a given dimension, see graph_embedding.
         """
-        Computes 2d embedding of a graph specified by non-negative simmetric distance matrix via stress
-        minimization.
-
-        Stress is based on relative strain for non-zero distances and absolute strain for zero distances.
-
-        Let S_ij be source distances, D_ij be 2d distances, then stress is
 
-          Sum[D_ij^2] for S_ij == 0 +
-          Sum[D_ij^2 / S_ij^2 + S_ij^2 / D_ij^2] for S_ij > 0.
+        N = numpy.size(d_ij, 0)
 
-        Given D_ij^2 = (x_i - x_j)^2 + (y_i - y_j)^2, xy-gradient used for minimization can be computed
-        using following:
+        # Using only the lower triangle of the source distance matrix, same as for 1 <= i < N, 0 <= j < i.
 
-          d[D_ij^2, x_i] = 2 (x_i - x_j)
-          d[D_ij^2, x_j] = -2 (x_i - x_j)
-          d[D_ij^2, y_i] = 2 (y_i - y_j)
-          d[D_ij^2, y_j] = -2 (y_i - y_j)
+        d_lower = numpy.tril(d_ij, -1)
+        d_full = d_lower + d_lower.T
 
-        Obviously, d[D_ij^2 / S_ij^2, x_i] = 2 (x_i - x_j) / S_ij^2, and so on.
+        off_diagonal = ~numpy.eye(N, dtype = bool)
 
-        And, with checking via WolframAlpha,
+        zero_mask = (d_full <= 0) & off_diagonal
+        non_zero_mask = (d_full > 0) & off_diagonal
 
-          d[S_ij^2 / D_ij^2, x_i] = -2 S_ij^2 (x_i - x_j) / D_ij^4, and so on.
-
-        """
-
-        N = numpy.size(d_ij, 0)
+        non_zero_d_ij = d_full[non_zero_mask]
 
         min_non_zero_d_ij = (
-
-            min(
-                (d_ij[i,j]
-                    for i in range(1, N)
-                    for j in range(i)
-                    if d_ij[i,j] > 0),
-
-                default = 1))
+            non_zero_d_ij.min() if non_zero_d_ij.size else 1)
 
         zero_d_ij_scale = 1. / min(1, min_non_zero_d_ij)
 
-        def f(xy):
+        d2_ij = numpy.where(non_zero_mask, d_full ** 2, 1.0)
+
+        def dr2_f(xy):
             """
-            Computes stress given xy-coordinates.
+            Computes pairwise coordinate differences and squared embedding distances.
             """
 
-            x = xy[:N]
-            y = xy[N:]
+            xy = xy.reshape(dimension, N)
 
-            result = 0.0
+            diff = xy[:, :, None] - xy[:, None, :]
+            dr2 = (diff ** 2).sum(0)
 
-            for i in range(1, N):
-                for j in range(i):
+            return diff, numpy.where(non_zero_mask, dr2, 1.0), dr2
 
-                    dr2 = (x[i] - x[j]) ** 2 + (y[i] - y[j]) ** 2
+        def f(xy):
+            """
+            Computes stress given coordinates.
+            """
 
-                    if d_ij[i,j] <= 0:
-                        result += 4 * dr2 * zero_d_ij_scale
+            _, dr2_safe, dr2 = dr2_f(xy)
 
-                    else:
-                        d2_ij = d_ij[i,j] ** 2
-                        result += dr2 / d2_ij + d2_ij / dr2
+            return (
 
-            return result
+                0.5 * (
+                    4 * zero_d_ij_scale * dr2[zero_mask].sum() +
+                    (dr2_safe / d2_ij + d2_ij / dr2_safe)[non_zero_mask].sum()))
 
         def df(xy):
             """
-            Computes gradient at the given xy-coordinates.
+            Computes gradient at the given coordinates.
             """
 
-            x = xy[:N]
-            y = xy[N:]
-
-            df_x = numpy.zeros(N)
-            df_y = numpy.zeros(N)
-
-            for i in range(1, N):
-                for j in range(i):
-
-                    dx = x[i] - x[j]
-                    dy = y[i] - y[j]
+            diff, dr2_safe, _ = dr2_f(xy)
 
-                    dr2 = dx ** 2 + dy ** 2
+            factor = (
 
-                    if d_ij[i,j] <= 0:
+                numpy.where(
+                    zero_mask,
+                    4 * zero_d_ij_scale,
+                    numpy.where(
+                        non_zero_mask,
+                        1 / d2_ij - d2_ij / dr2_safe ** 2,
+                        0.0)))
 
-                        df_x[i] += 4 * dx * zero_d_ij_scale
-                        df_x[j] -= 4 * dx * zero_d_ij_scale
+            # Each pair contributes twice to the full matrix stress, each contribution giving the same
+            # gradient term, hence the factor of 2 cancelling the 1/2 factor of the stress.
 
-                        df_y[i] += 4 * dy * zero_d_ij_scale
-                        df_y[j] -= 4 * dy * zero_d_ij_scale
+            return 2 * (diff * factor).sum(2).ravel()
 
-                    else:
-
-                        d2_ij = d_ij[i,j] ** 2
-                        factor = (1 / d2_ij - d2_ij / dr2 ** 2)
-
-                        df_x[i] += dx * factor
-                        df_x[j] -= dx * factor
-
-                        df_y[i] += dy * factor
-                        df_y[j] -= dy * factor
+        return f, df
 
-            return numpy.concatenate((df_x, df_y))
-
-        iter_count = 0
-
-        def f_callback(xy):
-            """
-            Shows minimization progress, if enabled.
-            """
+    @staticmethod
+    def graph_embedding(
+        d_ij,
+        dimension,
+        initial_x = None,
+        verbose = False,
+        cache_flag = False):
+        """
+        Computes embedding of a graph specified by non-negative simmetric distance matrix via stress
+        minimization into a space of a given dimension.
 
-            nonlocal iter_count
+        Stress is based on relative strain for non-zero distances and absolute strain for zero distances.
 
-            log.debug(
-                '\niteration {0}:\nxy:\n{1}\nf:\n{2}\ndf:\n{3}'.format(
-                iter_count, xy, f(xy), df(xy)))
+        Let S_ij be source distances, D_ij be embedding distances, then stress is
 
-            iter_count += 1
+          Sum[D_ij^2] for S_ij == 0 +
+          Sum[D_ij^2 / S_ij^2 + S_ij^2 / D_ij^2] for S_ij > 0.
 
-        # Performing minization, returning minimization results.
-        #
-        # To get deterministic results we use the source distance matrix to seed the initial pseudo-random
-        # coordinates we start optimization from.
+        Given D_ij^2 = (x_i - x_j)^2 + (y_i - y_j)^2 + ..., gradient used for minimization can be computed
+        using following:
 
-        rng = (
+          d[D_ij^2, x_i] = 2 (x_i - x_j)
+          d[D_ij^2, x_j] = -2 (x_i - x_j)
 
-            numpy.random.Generator(
-                numpy.random.PCG64(
+        and so on for y, z, ...
 
-                    tuple(
-                        hash(value)
-                        for value in d_ij.flat))))
+        Obviously, d[D_ij^2 / S_ij^2, x_i] = 2 (x_i - x_j) / S_ij^2, and so on.
 
-        result = (
+        And, with checking via WolframAlpha,
 
-            scipy.optimize.minimize(f,
-                rng.random(N * 2),
-                jac = df,
-                callback = f_callback if verbose else None,
-                options = {'disp': verbose}))
+          d[S_ij^2 / D_ij^2, x_i] = -2 S_ij^2 (x_i - x_j) / D_ij^4, and so on.
 
-        result_x = numpy.stack((result.x[:N], result.x[N:])).T
+        Both stress and its gradient are computed on full N x N matrices of pairwise coordinate differences
+        obtained via broadcasting, each pair contributing twice, hence the 1/2 factor of the stress.
 
-        return result_x, f(result.x)
+        Large graphs are minimized via L-BFGS-B, see graph_embedding_bfgs_limit.
 
-    @staticmethod
-    def graph_3d_embedding(d_ij, verbose = False):
-        """
-        Computes 3d embedding of a graph specified by non-negative simmetric distance matrix via stress
-        minimization.
+        Coordinates are arranged by dimension, i.e. first all x-coordinates, then all y-coordinates and so
+        on. If initial coordinates are not specified, minimization starts from pseudo-random coordinates
+        seeded by the source distance matrix.
 
-        The same as with 2d embedding, see graph_2d_embedding.
+        If enabled, results are cached in memory keyed by the hash of the distance matrix and of the
+        initial coordinates, if any.
         """
 
         N = numpy.size(d_ij, 0)
-        N2 = N * 2
 
-        min_non_zero_d_ij = (
+        if cache_flag:
 
-            min(
-                (d_ij[i,j]
-                    for i in range(1, N)
-                    for j in range(i)
-                    if d_ij[i,j] > 0),
+            hash_obj = hashlib.sha256()
 
-                default = 1))
+            hash_obj.update(
+                repr((dimension, d_ij.shape, initial_x is not None)).encode('utf-8'))
 
-        zero_d_ij_scale = 1. / min(1, min_non_zero_d_ij)
+            hash_obj.update(
+                numpy.ascontiguousarray(d_ij, dtype = numpy.float64).tobytes())
 
-        def f(xyz):
-            """
-            Computes stress given xyz-coordinates.
-            """
+            if initial_x is not None:
 
-            x = xyz[:N]
-            y = xyz[N:N2]
-            z = xyz[N2:]
+                hash_obj.update(
+                    numpy.ascontiguousarray(initial_x, dtype = numpy.float64).tobytes())
 
-            result = 0.0
+            cache_key = hash_obj.hexdigest()
 
-            for i in range(1, N):
-                for j in range(i):
+            with graph_embedding_cache_lock:
 
-                    dr2 = (x[i] - x[j]) ** 2 + (y[i] - y[j]) ** 2 + (z[i] - z[j]) ** 2
+                cache_value = graph_embedding_cache_dict.get(cache_key)
 
-                    if d_ij[i,j] <= 0:
-                        result += 4 * dr2 * zero_d_ij_scale
+                if cache_value is not None:
 
-                    else:
-                        d2_ij = d_ij[i,j] ** 2
-                        result += dr2 / d2_ij + d2_ij / dr2
+                    graph_embedding_cache_dict.move_to_end(cache_key)
+
+                    result_x, stress = cache_value
+                    return result_x.copy(), stress
 
-            return result
+        f, df = (
+            CognateAnalysis.graph_embedding_stress(d_ij, dimension))
+
+        iter_count = 0
 
-        def df(xyz):
+        def f_callback(xy):
             """
-            Computes gradient at a given xyz-coordinates.
+            Shows minimization progress, if enabled.
             """
 
-            x = xyz[:N]
-            y = xyz[N:N2]
-            z = xyz[N2:]
+            nonlocal iter_count
 
-            df_x = numpy.zeros(N)
-            df_y = numpy.zeros(N)
-            df_z = numpy.zeros(N)
+            log.debug(
+                '\niteration {0}:\ncoordinates:\n{1}\nf:\n{2}\ndf:\n{3}'.format(
+                iter_count, xy.reshape(dimension, N).T, f(xy), df(xy)))
 
-            for i in range(1, N):
-                for j in range(i):
+            iter_count += 1
 
-                    dx = x[i] - x[j]
-                    dy = y[i] - y[j]
-                    dz = z[i] - z[j]
+        # Performing minization, returning minimization results.
+        #
+        # To get deterministic results we use the source distance matrix to seed the initial pseudo-random
+        # coordinates we start optimization from, if we do not have any.
 
-                    dr2 = dx ** 2 + dy ** 2 + dz ** 2
+        if initial_x is None:
 
-                    if d_ij[i,j] <= 0:
+            rng = (
 
-                        df_x[i] += 4 * dx * zero_d_ij_scale
-                        df_x[j] -= 4 * dx * zero_d_ij_scale
+                numpy.random.Generator(
+                    numpy.random.PCG64(
 
-                        df_y[i] += 4 * dy * zero_d_ij_scale
-                        df_y[j] -= 4 * dy * zero_d_ij_scale
+                        tuple(
+                            hash(value)
+                            for value in d_ij.flat))))
 
-                        df_z[i] += 4 * dz * zero_d_ij_scale
-                        df_z[j] -= 4 * dz * zero_d_ij_scale
+            initial_x = rng.random(N * dimension)
 
-                    else:
+        initial_x = numpy.asarray(initial_x, dtype = numpy.float64).ravel()
 
-                        d2_ij = d_ij[i,j] ** 2
-                        factor = (1 / d2_ij - d2_ij / dr2 ** 2)
+        if N <= graph_embedding_bfgs_limit:
 
-                        df_x[i] += dx * factor
-                        df_x[j] -= dx * factor
+            result = (
 
-                        df_y[i] += dy * factor
-                        df_y[j] -= dy * factor
+                scipy.optimize.minimize(f,
+                    initial_x,
+                    jac = df,
+                    callback = f_callback if verbose else None,
+                    options = {'disp': verbose}))
 
-                        df_z[i] += dz * factor
-                        df_z[j] -= dz * factor
+        else:
 
-            return numpy.concatenate((df_x, df_y, df_z))
+            result = (
 
-        iter_count = 0
+                scipy.optimize.minimize(f,
+                    initial_x,
+                    method = 'L-BFGS-B',
+                    jac = df,
+                    callback = f_callback if verbose else None,
+                    options = {
+                        'disp': verbose,
+                        'maxiter': 15000,
+                        'maxfun': 30000,
+                        'maxcor': 20,
+                        'ftol': 1e-13,
+                        'gtol': 1e-7}))
 
-        def f_callback(xyz):
-            """
-            Shows minimization progress, if enabled.
-            """
+        result_x = result.x.reshape(dimension, N).T.copy()
+        stress = f(result.x)
 
-            nonlocal iter_count
+        if cache_flag:
 
-            log.debug(
-                '\niteration {0}:\nxyz:\n{1}\nf:\n{2}\ndf:\n{3}'.format(
-                iter_count,
-                numpy.stack((xyz[:N], xyz[N:N2], xyz[N2:])).T,
-                f(xyz),
-                df(xyz)))
+            with graph_embedding_cache_lock:
 
-            iter_count += 1
+                graph_embedding_cache_dict[cache_key] = (result_x.copy(), stress)
+                graph_embedding_cache_dict.move_to_end(cache_key)
 
-        # Performing minization, returning minimization results.
-        #
-        # To get deterministic results we use the source distance matrix to seed the initial pseudo-random
-        # coordinates we start optimization from.
+                while len(graph_embedding_cache_dict) > graph_embedding_cache_size:
+                    graph_embedding_cache_dict.popitem(last = False)
 
-        rng = (
+        return result_x, stress
 
-            numpy.random.Generator(
-                numpy.random.PCG64(
-                    
-                    tuple(
-                        hash(value)
-                        for value in d_ij.flat))))
+    @staticmethod
+    def graph_2d_embedding(
+        d_ij,
+        verbose = False,
+        initial_x = None,
+        cache_flag = False):
+        """
+        Computes 2d embedding of a graph specified by non-negative simmetric distance matrix via stress
+        minimization, see graph_embedding.
+        """
+
+        return (
 
-        result = (
+            CognateAnalysis.graph_embedding(
+                d_ij,
+                2,
+                initial_x = initial_x,
+                verbose = verbose,
+                cache_flag = cache_flag))
 
-            scipy.optimize.minimize(f,
-                rng.random(N * 3),
-                jac = df,
-                callback = f_callback if verbose else None,
-                options = {'disp': verbose}))
+    @staticmethod
+    def graph_3d_embedding(
+        d_ij,
+        verbose = False,
+        initial_x = None,
+        cache_flag = False):
+        """
+        Computes 3d embedding of a graph specified by non-negative simmetric distance matrix via stress
+        minimization, see graph_embedding.
+        """
 
-        result_x = numpy.stack((result.x[:N], result.x[N:N2], result.x[N2:])).T
+        return (
 
-        return result_x, f(result.x)
+            CognateAnalysis.graph_embedding(
+                d_ij,
+                3,
+                initial_x = initial_x,
+                verbose = verbose,
+                cache_flag = cache_flag))
 
     @staticmethod
     def distance_graph(
@@ -2286,6 +2712,7 @@ class CognateAnalysis(graphene.Mutation):
             storage,
             storage_dir,
             analysis_str = 'cognate_analysis',
+            embedding_cache_flag = True,
             __debug_flag__ = False,
             __plot_flag__ = True):
 
@@ -2303,7 +2730,11 @@ class CognateAnalysis(graphene.Mutation):
         if len(distance_data_array) > 1:
 
             embedding_2d, strain_2d = (
-                CognateAnalysis.graph_2d_embedding(d_ij, verbose = __debug_flag__))
+
+                CognateAnalysis.graph_2d_embedding(
+                    d_ij,
+                    verbose = __debug_flag__,
+                    cache_flag = embedding_cache_flag))
 
             embedding_2d_pca = (
                 sklearn.decomposition.PCA(n_components = 2)
@@ -2331,8 +2762,31 @@ class CognateAnalysis(graphene.Mutation):
 
         if len(distance_data_array) > 1:
 
+            # Warm-starting 3d embedding from the 2d one, with deterministic pseudo-random third
+            # coordinates seeded by the distance matrix.
+
+            rng = (
+
+                numpy.random.Generator(
+                    numpy.random.PCG64(
+
+                        tuple(
+                            hash(value)
+                            for value in d_ij.flat))))
+
+            initial_3d = (
+
+                numpy.concatenate((
+                    embedding_2d.T.ravel(),
+                    rng.random(len(embedding_2d)))))
+
             embedding_3d, strain_3d = (
-                CognateAnalysis.graph_3d_embedding(d_ij, verbose = __debug_flag__))
+
+                CognateAnalysis.graph_3d_embedding(
+                    d_ij,
+                    verbose = __debug_flag__,
+                    initial_x = initial_3d,
+                    cache_flag = embedding_cache_flag))
 
             # At least three points, standard PCA-based orientation.
 
@@ -2734,14 +3188,40 @@ class CognateAnalysis(graphene.Mutation):
 
         text_dict = {}
         entry_id_dict = {}
-        perspective_cache_dict = {}
+
+        acoustic_cache = Acoustic_Cache(storage)
+        cognate_cache = Cognate_Data_Cache(storage)
+
+        perspective_id_list = [
+            tuple(perspective_info[1])
+            for perspective_info in perspective_info_list]
+
+        perspective_stamp_dict = (
+            CognateAnalysis.perspective_stamp_dict(perspective_id_list))
 
         if not __debug_flag__:
 
-            entry_already_set, group_list, group_time = (
+            # Grouping data depends only on tags, so we can reuse it if no tags were changed.
 
-                CognateAnalysis.tag_data_plpgsql(
-                    perspective_info_list, group_field_id))
+            tag_data_key = (
+                'tag_data',
+                Cognate_Data_Cache.data_version,
+                tuple(group_field_id),
+                tuple(perspective_id_list),
+                CognateAnalysis.tag_stamp(group_field_id))
+
+            tag_data = cognate_cache.get(tag_data_key)
+
+            if tag_data is None:
+
+                tag_data = (
+
+                    CognateAnalysis.tag_data_union_find(
+                        perspective_info_list, group_field_id))
+
+                cognate_cache.set(tag_data_key, tag_data)
+
+            entry_already_set, group_list, group_time = tag_data
 
         else:
 
@@ -2770,7 +3250,7 @@ class CognateAnalysis(graphene.Mutation):
 
                 entry_already_set, group_list, group_time = (
 
-                    CognateAnalysis.tag_data_plpgsql(
+                    CognateAnalysis.tag_data_union_find(
                         perspective_info_list, group_field_id))
 
                 with gzip.open(tag_data_file_name, 'wb') as tag_data_file:
@@ -2851,71 +3331,51 @@ class CognateAnalysis(graphene.Mutation):
                 repr(perspective_name.strip()),
                 repr(transcription_rules)))
 
-            # Getting text data.
+            # Getting text data, if we do not have cached data of this perspective.
+            #
+            # Data of an unchanged perspective is reused, see perspective_stamp_dict(), and we cache only
+            # text and acoustic data of its entries, processing it depending on the mode and grouping
+            # afterwards.
 
-            transcription_query = (
+            text_data_key = (
+                'text_data',
+                Cognate_Data_Cache.data_version,
+                tuple(perspective_id),
+                tuple(transcription_field_id),
+                tuple(translation_field_id),
+                phonology.cache_version if mode == 'acoustic' else None,
+                perspective_stamp_dict[tuple(perspective_id)])
 
-                DBSession.query(
-                    dbLexicalEntry.client_id,
-                    dbLexicalEntry.object_id).filter(
-                        dbLexicalEntry.parent_client_id == perspective_id[0],
-                        dbLexicalEntry.parent_object_id == perspective_id[1],
-                        dbLexicalEntry.marked_for_deletion == False,
-                        dbEntity.parent_client_id == dbLexicalEntry.client_id,
-                        dbEntity.parent_object_id == dbLexicalEntry.object_id,
-                        dbEntity.field_client_id == transcription_field_id[0],
-                        dbEntity.field_object_id == transcription_field_id[1],
-                        dbEntity.marked_for_deletion == False,
-                        dbPublishingEntity.client_id == dbEntity.client_id,
-                        dbPublishingEntity.object_id == dbEntity.object_id,
-                        dbPublishingEntity.published == True,
-                        dbPublishingEntity.accepted == True)
-
-                .add_columns(
-                    func.array_agg(dbEntity.content).label('transcription'))
+            text_data_list = cognate_cache.get(text_data_key)
 
-                .group_by(dbLexicalEntry)).subquery()
+            if text_data_list is None:
 
-            translation_query = (
+                text_data_list = []
 
-                DBSession.query(
-                    dbLexicalEntry.client_id,
-                    dbLexicalEntry.object_id).filter(
-                        dbLexicalEntry.parent_client_id == perspective_id[0],
-                        dbLexicalEntry.parent_object_id == perspective_id[1],
-                        dbLexicalEntry.marked_for_deletion == False,
-                        dbEntity.parent_client_id == dbLexicalEntry.client_id,
-                        dbEntity.parent_object_id == dbLexicalEntry.object_id,
-                        dbEntity.field_client_id == translation_field_id[0],
-                        dbEntity.field_object_id == translation_field_id[1],
-                        dbEntity.marked_for_deletion == False,
-                        dbPublishingEntity.client_id == dbEntity.client_id,
-                        dbPublishingEntity.object_id == dbEntity.object_id,
-                        dbPublishingEntity.published == True,
-                        dbPublishingEntity.accepted == True)
-
-                .add_columns(
-                    func.array_agg(dbEntity.content).label('translation'))
-
-                .group_by(dbLexicalEntry)).subquery()
-
-            # Main query for transcription/translation data.
-
-            data_query = (
-                DBSession.query(transcription_query)
+                transcription_query = (
 
-                .outerjoin(translation_query, and_(
-                    transcription_query.c.client_id == translation_query.c.client_id,
-                    transcription_query.c.object_id == translation_query.c.object_id))
-
-                .add_columns(
-                    translation_query.c.translation))
+                    DBSession.query(
+                        dbLexicalEntry.client_id,
+                        dbLexicalEntry.object_id).filter(
+                            dbLexicalEntry.parent_client_id == perspective_id[0],
+                            dbLexicalEntry.parent_object_id == perspective_id[1],
+                            dbLexicalEntry.marked_for_deletion == False,
+                            dbEntity.parent_client_id == dbLexicalEntry.client_id,
+                            dbEntity.parent_object_id == dbLexicalEntry.object_id,
+                            dbEntity.field_client_id == transcription_field_id[0],
+                            dbEntity.field_object_id == transcription_field_id[1],
+                            dbEntity.marked_for_deletion == False,
+                            dbPublishingEntity.client_id == dbEntity.client_id,
+                            dbPublishingEntity.object_id == dbEntity.object_id,
+                            dbPublishingEntity.published == True,
+                            dbPublishingEntity.accepted == True)
 
-            # If we need to do an acoustic analysis, we also get sound/markup data.
+                    .add_columns(
+                        func.array_agg(dbEntity.content).label('transcription'))
 
-            if mode == 'acoustic':
+                    .group_by(dbLexicalEntry)).subquery()
 
-                sound_markup_query = (
+                translation_query = (
 
                     DBSession.query(
                         dbLexicalEntry.client_id,
@@ -2923,86 +3383,168 @@ class CognateAnalysis(graphene.Mutation):
                             dbLexicalEntry.parent_client_id == perspective_id[0],
                             dbLexicalEntry.parent_object_id == perspective_id[1],
                             dbLexicalEntry.marked_for_deletion == False,
-                            dbMarkup.parent_client_id == dbLexicalEntry.client_id,
-                            dbMarkup.parent_object_id == dbLexicalEntry.object_id,
-                            dbMarkup.marked_for_deletion == False,
-                            dbMarkup.additional_metadata.contains({'data_type': 'praat markup'}),
-                            dbPublishingMarkup.client_id == dbMarkup.client_id,
-                            dbPublishingMarkup.object_id == dbMarkup.object_id,
-                            dbPublishingMarkup.published == True,
-                            dbPublishingMarkup.accepted == True,
-                            dbSound.client_id == dbMarkup.self_client_id,
-                            dbSound.object_id == dbMarkup.self_object_id,
-                            dbSound.marked_for_deletion == False,
-                            dbPublishingSound.client_id == dbSound.client_id,
-                            dbPublishingSound.object_id == dbSound.object_id,
-                            dbPublishingSound.published == True,
-                            dbPublishingSound.accepted == True)
+                            dbEntity.parent_client_id == dbLexicalEntry.client_id,
+                            dbEntity.parent_object_id == dbLexicalEntry.object_id,
+                            dbEntity.field_client_id == translation_field_id[0],
+                            dbEntity.field_object_id == translation_field_id[1],
+                            dbEntity.marked_for_deletion == False,
+                            dbPublishingEntity.client_id == dbEntity.client_id,
+                            dbPublishingEntity.object_id == dbEntity.object_id,
+                            dbPublishingEntity.published == True,
+                            dbPublishingEntity.accepted == True)
 
                     .add_columns(
-
-                        func.jsonb_agg(func.jsonb_build_array(
-                            dbSound.client_id, dbSound.object_id, dbSound.content,
-                            dbMarkup.client_id, dbMarkup.object_id, dbMarkup.content))
-
-                        .label('sound_markup'))
+                        func.array_agg(dbEntity.content).label('translation'))
 
                     .group_by(dbLexicalEntry)).subquery()
 
-                # Adding sound/markup retrieval to the main query.
+                # Main query for transcription/translation data.
 
                 data_query = (
-                    data_query
+                    DBSession.query(transcription_query)
 
-                    .outerjoin(sound_markup_query, and_(
-                        transcription_query.c.client_id == sound_markup_query.c.client_id,
-                        transcription_query.c.object_id == sound_markup_query.c.object_id))
+                    .outerjoin(translation_query, and_(
+                        transcription_query.c.client_id == translation_query.c.client_id,
+                        transcription_query.c.object_id == translation_query.c.object_id))
 
                     .add_columns(
-                        sound_markup_query.c.sound_markup))
+                        translation_query.c.translation))
 
-            # If we are in asynchronous mode, we need to look up how many data rows we need
-            # to process for this perspective.
+                # If we need to do an acoustic analysis, we also get sound/markup data.
 
-            if task_status is not None:
+                if mode == 'acoustic':
 
-                row_count = data_query.count()
+                    sound_markup_query = (
 
-                log.debug(
-                    'cognate_analysis {0}: perspective {1}/{2}: {3} data rows'.format(
-                    language_str,
-                    perspective_id[0], perspective_id[1],
-                    row_count))
+                        DBSession.query(
+                            dbLexicalEntry.client_id,
+                            dbLexicalEntry.object_id).filter(
+                                dbLexicalEntry.parent_client_id == perspective_id[0],
+                                dbLexicalEntry.parent_object_id == perspective_id[1],
+                                dbLexicalEntry.marked_for_deletion == False,
+                                dbMarkup.parent_client_id == dbLexicalEntry.client_id,
+                                dbMarkup.parent_object_id == dbLexicalEntry.object_id,
+                                dbMarkup.marked_for_deletion == False,
+                                dbMarkup.additional_metadata.contains({'data_type': 'praat markup'}),
+                                dbPublishingMarkup.client_id == dbMarkup.client_id,
+                                dbPublishingMarkup.object_id == dbMarkup.object_id,
+                                dbPublishingMarkup.published == True,
+                                dbPublishingMarkup.accepted == True,
+                                dbSound.client_id == dbMarkup.self_client_id,
+                                dbSound.object_id == dbMarkup.self_object_id,
+                                dbSound.marked_for_deletion == False,
+                                dbPublishingSound.client_id == dbSound.client_id,
+                                dbPublishingSound.object_id == dbSound.object_id,
+                                dbPublishingSound.published == True,
+                                dbPublishingSound.accepted == True)
 
-            '''
-            Cache initialization
-            '''
-            if not perspective_cache_dict.get(tuple(perspective_id)):
-                perspective_cache_dict[tuple(perspective_id)] = PickleCache(storage, perspective_id)
+                        .add_columns(
 
-            # Grouping transcriptions and translations by lexical entries.
+                            func.jsonb_agg(func.jsonb_build_array(
+                                dbSound.client_id, dbSound.object_id, dbSound.content,
+                                dbMarkup.client_id, dbMarkup.object_id, dbMarkup.content))
 
-            for row_index, row in enumerate(data_query.all()):
+                            .label('sound_markup'))
 
-                entry_id = tuple(row[:2])
-                transcription_list, translation_list = row[2:4]
+                        .group_by(dbLexicalEntry)).subquery()
 
-                transcription_list = (
-                    [] if not transcription_list else [
-                        transcription.strip()
-                        for transcription in transcription_list
-                        if transcription.strip()])
+                    # Adding sound/markup retrieval to the main query.
 
-                # If we have no trascriptions for this lexical entry, we skip it altogether.
+                    data_query = (
+                        data_query
 
-                if not transcription_list:
-                    continue
+                        .outerjoin(sound_markup_query, and_(
+                            transcription_query.c.client_id == sound_markup_query.c.client_id,
+                            transcription_query.c.object_id == sound_markup_query.c.object_id))
 
-                translation_list = (
-                    [] if not translation_list else [
-                        translation.strip()
-                        for translation in translation_list
-                        if translation.strip()])
+                        .add_columns(
+                            sound_markup_query.c.sound_markup))
+
+                # If we are in asynchronous mode, we need to look up how many data rows we need
+                # to process for this perspective.
+
+                if task_status is not None:
+
+                    row_count = data_query.count()
+
+                    log.debug(
+                        'cognate_analysis {0}: perspective {1}/{2}: {3} data rows'.format(
+                        language_str,
+                        perspective_id[0], perspective_id[1],
+                        row_count))
+
+                # Gathering transcriptions, translations and acoustic data of lexical entries.
+
+                for row_index, row in enumerate(data_query.all()):
+
+                    entry_id = tuple(row[:2])
+                    transcription_list, translation_list = row[2:4]
+
+                    transcription_list = (
+                        [] if not transcription_list else [
+                            transcription.strip()
+                            for transcription in transcription_list
+                            if transcription.strip()])
+
+                    # If we have no trascriptions for this lexical entry, we skip it altogether.
+
+                    if not transcription_list:
+                        continue
+
+                    translation_list = (
+                        [] if not translation_list else [
+                            translation.strip()
+                            for translation in translation_list
+                            if translation.strip()])
+
+                    # If we are fetching additional acoustic data, it's possible we have to process
+                    # sound recordings and markup this lexical entry has.
+
+                    if len(row) > 4 and row[4]:
+
+                        row_list = row[4][0]
+
+                        result = (
+                            CognateAnalysis.acoustic_data(
+                                base_language_id,
+                                tuple(row_list[0:2]), row_list[2],
+                                tuple(row_list[3:5]), row_list[5],
+                                storage,
+                                acoustic_cache,
+                                __debug_flag__))
+
+                        # Updating task progress, if required.
+
+                        if task_status is not None:
+
+                            percent = int(math.floor(90.0 *
+                                (index + float(row_index + 1) / row_count) /
+                                len(perspective_info_list)))
+
+                            task_status.set(2, 5 + percent, 'Gathering analysis source data')
+
+                        text_data_list.append((
+                            entry_id,
+                            transcription_list,
+                            translation_list,
+                            result))
+
+                    # No additional acoustic data.
+
+                    else:
+
+                        text_data_list.append((
+                            entry_id,
+                            transcription_list,
+                            translation_list))
+
+                cognate_cache.set(text_data_key, text_data_list)
+
+            # Grouping transcriptions and translations by lexical entries.
+
+            for entry_id, *entry_data_list in text_data_list:
+
+                transcription_list, translation_list = entry_data_list[:2]
 
                 # Saving transcription / translation data.
 
@@ -3034,43 +3576,7 @@ class CognateAnalysis(graphene.Mutation):
                     if len(transcription_list) > 1 and len(translation_list) > 1:
                         sg_both_count += 1
 
-                # If we are fetching additional acoustic data, it's possible we have to process
-                # sound recordings and markup this lexical entry has.
-
-                if len(row) > 4 and row[4]:
-
-                    row_list = row[4][0]
-
-                    result = (
-                        CognateAnalysis.acoustic_data(
-                            base_language_id,
-                            tuple(row_list[0:2]), row_list[2],
-                            tuple(row_list[3:5]), row_list[5],
-                            storage,
-                            perspective_cache_dict[tuple(perspective_id)],
-                            __debug_flag__))
-
-                    # Updating task progress, if required.
-
-                    if task_status is not None:
-
-                        percent = int(math.floor(90.0 *
-                            (index + float(row_index + 1) / row_count) /
-                            len(perspective_info_list)))
-
-                        task_status.set(2, 5 + percent, 'Gathering analysis source data')
-
-                    entry_data_list = (index,
-                        transcription_list,
-                        translation_list,
-                        result)
-
-                # No additional acoustic data.
-
-                else:
-                    entry_data_list = (index, transcription_list, translation_list)
-
-                text_dict[entry_id] = entry_data_list
+                text_dict[entry_id] = (index, *entry_data_list)
 
                 entry_id_key = (
 
@@ -3080,11 +3586,8 @@ class CognateAnalysis(graphene.Mutation):
 
                 entry_id_dict[entry_id_key] = entry_id
 
-        '''
-        Writing cache to file if there is any change
-        '''
-        for cache in perspective_cache_dict.values():
-            cache.flush()
+        acoustic_cache.flush()
+        cognate_cache.flush()
 
         # Showing some info on non-grouped entries, if required.
 
@@ -4435,6 +4938,77 @@ class CognateAnalysis(graphene.Mutation):
                 'Exception:\n' + traceback_string)
 
 
+def split_translation(lex):
+    """
+    Splits a translation by commas and open brackets into a set of its normalized forms, excluding
+    bracketed notes.
+    """
+
+    # Reducing multiple spaces.
+
+    lex = ' '.join(lex.lower().split())
+
+    if "убрать из стословника" in lex:
+        return frozenset()
+
+    return frozenset(
+        form.replace('ё', 'е').strip()
+        for form in lex.replace('(', ',').split(',')
+        if form.strip() and ')' not in form)
+
+
+class Lexeme_Matcher(object):
+    """
+    Matches lexemes against a fixed list of reference lexemes, e.g. the Swadesh list.
+
+    Reference lexemes are normalized once into an inverted form -> index map, normalized forms of matched
+    lexemes are memoized, so that matching a lexeme is a dictionary lookup per each of its forms.
+    Lexemes match if their sets of normalized forms intersect.
+    """
+
+    def __init__(self, lex_list = (), split_f = split_translation):
+
+        self.lex_list = list(lex_list)
+        self.split_f = split_f
+
+        self.form_dict = collections.defaultdict(list)
+        self.form_cache = {}
+
+        for index, lex in enumerate(self.lex_list):
+            for form in split_f(lex):
+                self.form_dict[form].append(index)
+
+    def forms(self, lex):
+        """
+        Returns normalized forms of a lexeme.
+        """
+
+        form_collection = self.form_cache.get(lex)
+
+        if form_collection is None:
+
+            form_collection = self.split_f(lex)
+            self.form_cache[lex] = form_collection
+
+        return form_collection
+
+    def match(self, lex):
+        """
+        Returns sorted list of indices of reference lexemes matching a given lexeme.
+        """
+
+        index_set = set()
+
+        for form in self.forms(lex):
+
+            index_list = self.form_dict.get(form)
+
+            if index_list:
+                index_set.update(index_list)
+
+        return sorted(index_set)
+
+
 class SwadeshAnalysis(graphene.Mutation):
     class Arguments:
 
@@ -4663,28 +5237,17 @@ class SwadeshAnalysis(graphene.Mutation):
                         'жёлтый','белый','чёрный','ночь','тёплый','холодный','полный','новый','хороший','круглый',
                         'сухой','имя']
 
-        def compare_translations(swadesh_lex, dictionary_lex):
-            def split_lex(lex):
-                # Split by commas and open brackets to separate
-                # various forms of lexeme and extra note if is
-                lex = ' '.join(lex.lower().split()) # reduce multi spaces
-                if "убрать из стословника" in lex:
-                    return set()
-
-                return set(form.replace('ё', 'е').strip()
-                           for form in lex.replace('(', ',').split(',')
-                           if form.strip() and ')' not in form)  # exclude notes
-
-            # return true if the intersection is not empty
-            return bool(split_lex(swadesh_lex) & split_lex(dictionary_lex))
+        # Swadesh words are normalized only once, translations are normalized once per distinct
+        # translation string.
 
+        swadesh_matcher = Lexeme_Matcher(swadesh_list)
 
         # Gathering entry grouping data.
 
         if not debug_flag:
 
             _, group_list, _ = (
-                CognateAnalysis.tag_data_plpgsql(
+                CognateAnalysis.tag_data_union_find(
                     perspective_info_list, group_field_id))
 
         else:
@@ -4718,7 +5281,7 @@ class SwadeshAnalysis(graphene.Mutation):
 
                 r1, group_list, r3 = (
 
-                    CognateAnalysis.tag_data_plpgsql(
+                    CognateAnalysis.tag_data_union_find(
                         perspective_info_list, group_field_id))
 
                 with gzip.open(tag_data_file_name, 'wb') as tag_data_file:
@@ -4848,23 +5411,36 @@ class SwadeshAnalysis(graphene.Mutation):
                 # Parsing translations and matching with Swadesh's words
                 transcription_lex = ', '.join(transcription_list)
                 lexeme_lex = ', '.join(lexeme_list or [])
-                for swadesh_num, swadesh_lex in enumerate(swadesh_list):
-                    for translation_lex in translation_list:
-                        if compare_translations(swadesh_lex, translation_lex):
-                            # Store the entry's content in human-readable format
-                            result_pool[perspective_id][entry_id] = {
-                                'group': None,
-                                'borrowed': (" заим." in f" {transcription_lex} {translation_lex} {lexeme_lex}"),
-                                'swadesh': swadesh_lex,
-                                'transcription': transcription_lex,
-                                'translation': translation_lex
-                            }
-                            # Store entry_id and number of the lex within Swadesh's list
-                            entries_set[perspective_id].add(entry_id)
-                            if not result_pool[perspective_id][entry_id]['borrowed']:
-                                # Total list of Swadesh's words in the perspective,
-                                # they can have not any etymological links
-                                swadesh_total[perspective_id].add(swadesh_num)
+
+                # Going through matches in the same order as through Swadesh words and then through
+                # translations, so that the last match for each entry is the same.
+
+                match_list = (
+
+                    sorted(
+                        (swadesh_num, translation_index)
+                        for translation_index, translation_lex in enumerate(translation_list)
+                        for swadesh_num in swadesh_matcher.match(translation_lex)))
+
+                for swadesh_num, translation_index in match_list:
+
+                    swadesh_lex = swadesh_list[swadesh_num]
+                    translation_lex = translation_list[translation_index]
+
+                    # Store the entry's content in human-readable format
+                    result_pool[perspective_id][entry_id] = {
+                        'group': None,
+                        'borrowed': (" заим." in f" {transcription_lex} {translation_lex} {lexeme_lex}"),
+                        'swadesh': swadesh_lex,
+                        'transcription': transcription_lex,
+                        'translation': translation_lex
+                    }
+                    # Store entry_id and number of the lex within Swadesh's list
+                    entries_set[perspective_id].add(entry_id)
+                    if not result_pool[perspective_id][entry_id]['borrowed']:
+                        # Total list of Swadesh's words in the perspective,
+                        # they can have not any etymological links
+                        swadesh_total[perspective_id].add(swadesh_num)
 
             # Forget the dictionary if it contains less than 50 Swadesh words
             if len(swadesh_total[perspective_id]) < 50:
@@ -5184,7 +5760,7 @@ class MorphCognateAnalysis(graphene.Mutation):
         if not debug_flag:
 
             _, group_list, _ = (
-                CognateAnalysis.tag_data_plpgsql(
+                CognateAnalysis.tag_data_union_find(
                     perspective_info_list, group_field_id))
 
         else:
@@ -5214,7 +5790,7 @@ class MorphCognateAnalysis(graphene.Mutation):
 
                 r1, group_list, r3 = (
 
-                    CognateAnalysis.tag_data_plpgsql(
+                    CognateAnalysis.tag_data_union_find(
                         perspective_info_list, group_field_id))
 
                 with gzip.open(tag_data_file_name, 'wb') as tag_data_file:
@@ -5228,6 +5804,19 @@ class MorphCognateAnalysis(graphene.Mutation):
         meaning_re = re.compile('[.\dA-Z<>]+')
         meaning_with_comment_re = re.compile('[.\dA-Z<>]+ *\([.,:;\d\w ]+\)')
 
+        def split_meaning(meaning_str):
+
+            if ((meaning_search := re.search(meaning_with_comment_re, meaning_str)) or
+                    (meaning_search := re.search(meaning_re, meaning_str))):
+                return (" ".join(meaning_search.group(0).split()),)
+
+            return ()
+
+        # Meaning strings repeat a lot across entries and perspectives, so we parse each distinct one only
+        # once.
+
+        meaning_matcher = Lexeme_Matcher(split_f = split_meaning)
+
         for index, (language_id, perspective_id, affix_field_id, meaning_field_id, _) in \
                 enumerate(perspective_info_list):
 
@@ -5315,12 +5904,10 @@ class MorphCognateAnalysis(graphene.Mutation):
                     continue
 
                 affix = list(map(lambda a: a.strip(), affix_list))
-                meaning = []
-                for m in meaning_list:
-                    if ((meaning_search := re.search(meaning_with_comment_re, m)) or
-                            (meaning_search := re.search(meaning_re, m))):
-                        meaning_value = meaning_search.group(0)
-                        meaning.append(" ".join(meaning_value.split()))
+                meaning = [
+                    sub_meaning
+                    for m in meaning_list
+                    for sub_meaning in meaning_matcher.forms(m)]
 
                 if not meaning:
                     continue
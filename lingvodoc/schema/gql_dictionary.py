@@ -704,10 +704,13 @@ class Dictionary(LingvodocObjectType):  # tested
                             accepted_query.cte()))))
 
         perspectives = list()
+        id_list = list()
         for persp in child_persps_query.all():
             persp_object = self.persp_class(id=[persp.client_id, persp.object_id])
             persp_object.dbObject = persp
+            persp_object.acl_batch_id_list = id_list
             perspectives.append(persp_object)
+            id_list.append((persp.client_id, persp.object_id))
         return perspectives
 
     @fetch_object(ACLSubject='dictionary_role', ACLKey='id')
@@ -1573,7 +1573,8 @@ class DictionaryPerspective(LingvodocObjectType):
                 mode != 'not_accepted'):
 
             if not info.context.acl_check_if('view', 'lexical_entries_and_entities',
-                                             (self.dbObject.client_id, self.dbObject.object_id)):
+                                             (self.dbObject.client_id, self.dbObject.object_id),
+                                             self.acl_batch_id_list):
 
                 lexes = lexes.limit(20)
 
@@ -1649,7 +1650,10 @@ class DictionaryPerspective(LingvodocObjectType):
 
         return (
             info.context.acl_check_if(
-                action, subject, (self.dbObject.client_id, self.dbObject.object_id)))
+                action,
+                subject,
+                (self.dbObject.client_id, self.dbObject.object_id),
+                self.acl_batch_id_list))
 
     @fetch_object()
     def resolve_statistic(
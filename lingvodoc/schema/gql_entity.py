@@ -68,6 +68,7 @@ from lingvodoc.utils.creation import create_entity
 from lingvodoc.utils.deletion import real_delete_entity
 from lingvodoc.utils.elan_functions import eaf_wordlist
 from lingvodoc.utils.lexgraph_marker import marker_between_arith as marker_between
+from lingvodoc.utils.search import invalidate_search
 from lingvodoc.utils.verification import check_client_id, check_lingvodoc_id
 
 
@@ -942,6 +943,11 @@ class ApproveAllForUser(graphene.Mutation):
             update_result = update_query.execute()
             update_count = update_result.rowcount
 
+            # Bulk update is not detected by the ORM, so we invalidate cached search results explicitly.
+
+            if update_count > 0:
+                invalidate_search()
+
             log.debug(
                 'approve_all_for_user ({0}): updated {1} entit{2}'.format(
                 language_str,
@@ -1,3 +1,4 @@
+import collections
 import json
 import datetime
 import graphene
@@ -18,13 +19,22 @@ from lingvodoc.models import (
     ObjectTOC,
     DBSession,
     Client as dbClient,
+    Dictionary as dbDictionary,
+    DictionaryPerspective as dbDictionaryPerspective,
+    Entity as dbEntity,
+    Field as dbField,
+    Language as dbLanguage,
     LexicalEntry,
     DictionaryPerspectiveToField,
+    PublishingEntity as dbPublishingEntity,
     TranslationGist as dbTranslationGist,
     TranslationAtom as dbTranslationAtom,
+    TranslationMixin,
+    Translation_Resolver,
     UnstructuredData as dbUnstructuredData,
     User as dbUser
 )
+from lingvodoc.utils import ids_to_id_query
 from lingvodoc.utils.verification import check_client_id
 from lingvodoc.cache.caching import CACHE
 
@@ -140,6 +150,11 @@ class LingvodocObjectType(graphene.ObjectType):
     dbObject = None
     ErrorHappened = None
 
+    # Ids of all objects of the list the object was resolved in, if set, allows to batch permission checks,
+    # see Context.acl_check_many() in query.py.
+
+    acl_batch_id_list = None
+
     def __init__(
         self,
         dbObject = None,
@@ -533,6 +548,241 @@ def undel_object(
 gql_none_value = object()
 
 
+class Batch_Loader(object):
+    """
+    Request-scoped batching loader of DB objects by ids, available as 'loader' attribute of the query
+    execution context.
+
+    Lists of objects returned by resolvers are registered via prime(), and then the first lookup of an
+    object of some type loads all registered objects of this type with a single query, so that resolving
+    fields of a list of N objects takes one query per type instead of N.
+
+    Translation gists of registered and loaded objects are registered for batch translation resolution,
+    see Translation_Resolver.
+    """
+
+    db_type_set = {
+        dbDictionary,
+        dbDictionaryPerspective,
+        dbEntity,
+        dbField,
+        dbLanguage,
+        dbTranslationGist}
+
+    def __init__(self):
+
+        self.object_dict = collections.defaultdict(dict)
+        self.pending_dict = collections.defaultdict(set)
+
+        # Entities of lexical entries, along with their publishing info.
+
+        self.entity_dict = {}
+        self.entity_pending_set = set()
+
+        self.translation_resolver = Translation_Resolver()
+
+    @staticmethod
+    def translation_gist_id(db_object):
+        """
+        Gets id of the translation gist of an object, or None if it has no translations.
+        """
+
+        if isinstance(db_object, dbTranslationGist):
+            return (db_object.client_id, db_object.object_id)
+
+        if isinstance(db_object, TranslationMixin):
+            return (db_object.translation_gist_client_id, db_object.translation_gist_object_id)
+
+        return None
+
+    def prime(self, value):
+        """
+        Registers ids of objects of a resolver result for batch loading.
+        """
+
+        if not isinstance(value, list):
+            return
+
+        for item in value:
+
+            if not isinstance(item, LingvodocObjectType):
+                continue
+
+            db_object = item.dbObject
+
+            if db_object is not None:
+
+                gist_id = self.translation_gist_id(db_object)
+
+                if gist_id is not None:
+                    self.translation_resolver.add((gist_id,))
+
+                # We already have the object, we may then need its lexical entry entities.
+
+                if (isinstance(db_object, LexicalEntry) and
+                    getattr(item, 'gql_Entities', None) is None):
+
+                    entry_id = (
+                        db_object.client_id, db_object.object_id)
+
+                    if entry_id not in self.entity_dict:
+                        self.entity_pending_set.add(entry_id)
+
+                continue
+
+            db_type = getattr(item, 'dbType', None)
+
+            if (db_type in self.db_type_set and
+                isinstance(item.id, (list, tuple)) and
+                len(item.id) == 2):
+
+                object_id = tuple(item.id)
+
+                if object_id not in self.object_dict[db_type]:
+                    self.pending_dict[db_type].add(object_id)
+
+    def get(self, db_type, object_id):
+        """
+        Gets object by its id, loading it along with all other registered objects of the same type if
+        required, returns None if there is no such object.
+        """
+
+        object_id = tuple(object_id)
+        object_dict = self.object_dict[db_type]
+
+        if object_id in object_dict:
+            return object_dict[object_id]
+
+        id_set = self.pending_dict.pop(db_type, set())
+
+        id_set.add(object_id)
+        id_set.difference_update(object_dict)
+
+        id_list = list(id_set)
+
+        for load_id in id_list:
+            object_dict[load_id] = None
+
+        if len(id_list) > 2:
+            id_list = ids_to_id_query(id_list)
+
+        object_query = (
+
+            DBSession
+
+                .query(db_type)
+
+                .filter(
+                    tuple_(db_type.client_id, db_type.object_id)
+                        .in_(id_list)))
+
+        gist_id_list = []
+
+        for db_object in object_query:
+
+            object_dict[
+                (db_object.client_id, db_object.object_id)] = db_object
+
+            gist_id = self.translation_gist_id(db_object)
+
+            if gist_id is not None:
+                gist_id_list.append(gist_id)
+
+        self.translation_resolver.add(gist_id_list)
+
+        return object_dict[object_id]
+
+    def translation(self, db_object, locale_id):
+        """
+        Gets translation of an object, resolving translations of all other registered objects if required.
+        """
+
+        gist_id = self.translation_gist_id(db_object)
+
+        if gist_id is None:
+            return db_object.get_translation(locale_id)
+
+        return (
+            self.translation_resolver.translation(
+                gist_id, locale_id))
+
+    def translations(self, db_object):
+        """
+        Gets all translations of an object, resolving translations of all other registered objects if
+        required.
+        """
+
+        gist_id = self.translation_gist_id(db_object)
+
+        if gist_id is None:
+            return db_object.get_translations()
+
+        return (
+            self.translation_resolver.translations(
+                gist_id))
+
+    def entities(self, entry_id, publish = None, accept = None):
+        """
+        Gets non-deleted entities of a lexical entry with their publishing info, loading them along with
+        entities of all other registered lexical entries if required.
+        """
+
+        entry_id = tuple(entry_id)
+
+        if entry_id not in self.entity_dict:
+
+            id_set = self.entity_pending_set
+            self.entity_pending_set = set()
+
+            id_set.add(entry_id)
+            id_set.difference_update(self.entity_dict)
+
+            id_list = list(id_set)
+
+            for load_id in id_list:
+                self.entity_dict[load_id] = []
+
+            if len(id_list) > 2:
+                id_list = ids_to_id_query(id_list)
+
+            entity_query = (
+
+                DBSession
+
+                    .query(
+                        dbEntity,
+                        dbPublishingEntity)
+
+                    .filter(
+                        tuple_(dbEntity.parent_client_id, dbEntity.parent_object_id)
+                            .in_(id_list),
+                        dbEntity.client_id == dbPublishingEntity.client_id,
+                        dbEntity.object_id == dbPublishingEntity.object_id,
+                        dbEntity.marked_for_deletion == False)
+
+                    .yield_per(100))
+
+            entity_object_dict = self.object_dict[dbEntity]
+
+            for db_entity, db_publishing in entity_query:
+
+                entity_object_dict[
+                    (db_entity.client_id, db_entity.object_id)] = db_entity
+
+                self.entity_dict[
+                    (db_entity.parent_client_id, db_entity.parent_object_id)].append(
+                        (db_entity, db_publishing))
+
+        return [
+
+            (db_entity, db_publishing)
+
+            for db_entity, db_publishing in self.entity_dict[entry_id]
+
+            if (publish is None or db_publishing.published == publish) and
+                (accept is None or db_publishing.accepted == accept)]
+
+
 def fetch_object(attrib_name=None, ACLSubject=None, ACLKey=None):
     """
     This magic decorator, which the resolve_* functions have, sets the dbObject atribute
@@ -549,9 +799,10 @@ def fetch_object(attrib_name=None, ACLSubject=None, ACLKey=None):
         def wrapper(*args, **kwargs):
             cls = args[0]
             context = args[1].context
+            loader = getattr(context, 'loader', None)
 
             if ACLSubject and ACLKey == 'id':
-                context.acl_check('view', ACLSubject, cls.id)
+                context.acl_check('view', ACLSubject, cls.id, cls.acl_batch_id_list)
             if cls.ErrorHappened:
                 return None
 
@@ -577,8 +828,11 @@ def fetch_object(attrib_name=None, ACLSubject=None, ACLKey=None):
                         raise ResponseError(message="%s was not found" % cls.__class__, self_object=cls)
                 elif isinstance(cls.id, (list, tuple)):
                     # example: (id: [2,3])
-                    cls.dbObject = DBSession.query(cls.dbType).filter_by(client_id=cls.id[0],
-                                                                         object_id=cls.id[1]).first()
+                    if loader is not None and cls.dbType in Batch_Loader.db_type_set:
+                        cls.dbObject = loader.get(cls.dbType, cls.id)
+                    else:
+                        cls.dbObject = DBSession.query(cls.dbType).filter_by(client_id=cls.id[0],
+                                                                             object_id=cls.id[1]).first()
                     # cls.dbObject = CACHE.get(objects = {cls.dbType : (cls.id, )})
                     if cls.dbObject is None:
                         #cls.ErrorHappened = True
@@ -587,7 +841,15 @@ def fetch_object(attrib_name=None, ACLSubject=None, ACLKey=None):
                 context.acl_check('view', ACLSubject,
                                   [getattr(cls.dbObject, ACLKey.replace('_', '_client_')),
                                    getattr(cls.dbObject, ACLKey.replace('_', '_object_'))])
-            return func(*args, **kwargs)
+
+            result = func(*args, **kwargs)
+
+            # Lists of objects we've got are registered for batch loading of their data.
+
+            if loader is not None:
+                loader.prime(result)
+
+            return result
 
         return wrapper
 
@@ -826,13 +1088,28 @@ class TranslationHolder(graphene.Interface):
     @fetch_object("translation")
     def resolve_translation(self, info, locale_id = None):
 
+        if locale_id is None:
+            locale_id = info.context.get('locale_id')
+
+        # Translations of lists of objects are resolved in batches, if we have a request-scoped loader.
+
+        loader = getattr(info.context, 'loader', None)
+
+        if loader is not None:
+            return loader.translation(self.dbObject, locale_id)
+
         return (
             self.dbObject.get_translation( # TODO: fix it
-                locale_id if locale_id is not None else info.context.get('locale_id')))
+                locale_id))
 
     @fetch_object("translations")
     def resolve_translations(self, info):
 
+        loader = getattr(info.context, 'loader', None)
+
+        if loader is not None:
+            return loader.translations(self.dbObject)
+
         return (
             self.dbObject.get_translations())
 
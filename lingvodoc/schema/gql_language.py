@@ -1415,10 +1415,16 @@ def toc_translations_cache(self, toc_list):
 
             .all())
 
+    translations_dict = (
+
+        models.get_translations_many(
+            (gist_client_id, gist_object_id)
+            for _, _, gist_client_id, gist_object_id in gist_id_list))
+
     return {
 
         (client_id, object_id):
-            models.get_translations(gist_client_id, gist_object_id)
+            translations_dict[(gist_client_id, gist_object_id)]
 
         for client_id, object_id, gist_client_id, gist_object_id in gist_id_list}
 
@@ -122,17 +122,32 @@ class LexicalEntry(LingvodocObjectType):
         else:
             raise ResponseError(message="mode: <all|published|not_accepted>")
 
-        result = list()
-        entities = DBSession.query(dbEntity, dbPublishingEntity).\
-            filter(dbEntity.parent_client_id == self.dbObject.client_id,
-                   dbEntity.parent_object_id == self.dbObject.object_id,
-                   dbEntity.client_id == dbPublishingEntity.client_id,
-                   dbEntity.object_id == dbPublishingEntity.object_id)
-        if publish is not None:
-            entities = entities.filter(dbPublishingEntity.published == publish)
-        if accept is not None:
-            entities = entities.filter(dbPublishingEntity.accepted == accept)
-        entities = entities.filter(dbEntity.marked_for_deletion == False).yield_per(100)
+        # Entities of this and other lexical entries of the same resolved list are loaded in a single batch
+        # by the request-scoped loader, if we have one.
+
+        loader = getattr(info.context, 'loader', None)
+
+        if loader is not None:
+
+            entities = (
+
+                loader.entities(
+                    (self.dbObject.client_id, self.dbObject.object_id),
+                    publish,
+                    accept))
+
+        else:
+
+            entities = DBSession.query(dbEntity, dbPublishingEntity).\
+                filter(dbEntity.parent_client_id == self.dbObject.client_id,
+                       dbEntity.parent_object_id == self.dbObject.object_id,
+                       dbEntity.client_id == dbPublishingEntity.client_id,
+                       dbEntity.object_id == dbPublishingEntity.object_id)
+            if publish is not None:
+                entities = entities.filter(dbPublishingEntity.published == publish)
+            if accept is not None:
+                entities = entities.filter(dbPublishingEntity.accepted == accept)
+            entities = entities.filter(dbEntity.marked_for_deletion == False).yield_per(100)
 
         def graphene_entity(cur_entity, cur_publishing):
             ent = Entity(id = (cur_entity.client_id, cur_entity.object_id))
@@ -1,5 +1,6 @@
 import collections
 import datetime
+import functools
 import gzip
 import hashlib
 import io
@@ -53,6 +54,8 @@ from lingvodoc.models import (
     Language as dbLanguage,
     LexicalEntry as dbLexicalEntry,
     Entity as dbEntity,
+    EntitySearch as dbEntitySearch,
+    eaf_index_entity,
     PublishingEntity as dbPublishingEntity,
     User as dbUser,
     BaseGroup as dbBaseGroup,
@@ -77,7 +80,11 @@ from lingvodoc.schema.gql_lexicalentry import LexicalEntry
 from lingvodoc.scripts.save_dictionary import Save_Context
 
 from lingvodoc.utils.search import (
+    eaf_index_candidate_set,
+    eaf_index_pattern_list,
+    eaf_index_update,
     recursive_sort,
+    SEARCH_RESULT_CACHE,
     translation_gist_search
 )
 
@@ -139,42 +146,51 @@ def add_as_like(elem):
     query = '%' + elem.replace('"', '').replace('@', '%').replace('?', '_') + '%'
     return query
 
-def boolean_search(test_string,  exclude_char = '-'):
-    regex = '(-?"[^\n\r]+?"|[^\s\n\r]+)'
+
+boolean_search_re = re.compile('(-?"[^\n\r]+?"|[^\s\n\r]+)')
+
+
+@functools.lru_cache(maxsize = 4096)
+def boolean_search_tuple(test_string, exclude_char = '-'):
+    """
+    Parses boolean search query string into a tuple of AND blocks of (matching_type, search_string)
+    conditions, memoized, as the same queries are parsed again and again on each search.
+    """
+
     and_blocks_strings = test_string.split(" | ")
     and_blocks_strings = [x.lower() for x in and_blocks_strings]
     #print(and_blocks_strings)
     and_blocks = []
     for block_string in and_blocks_strings:
-        and_blocks.append(re.findall(regex, block_string))
+        and_blocks.append(boolean_search_re.findall(block_string))
     #print(and_blocks)
 
     and_blocks_queries = []
     #excludes = []
     for and_block in and_blocks:
-        and_blocks_queries.append([])
-        and_block_queries = and_blocks_queries[len(and_blocks_queries) - 1]
+        and_block_queries = []
         for element in and_block:
             if element.startswith(exclude_char):
                 element = element[1:]
-                and_block_queries.append({"matching_type": 'exclude',
-                                          "search_string": element})
+                and_block_queries.append(('exclude', element))
                 #excludes.append(element[1:])
                 continue
             if '"' in element:
                 if has_wildcard(element):
-                    query = add_as_like(element)
-                    and_block_queries.append({"matching_type": 'substring',
-                                          "search_string": query})
+                    and_block_queries.append(('substring', add_as_like(element)))
                 else:
-                    query = add_as_strict(element)
-                    and_block_queries.append({"matching_type": 'full_string',
-                                          "search_string": query})
+                    and_block_queries.append(('full_string', add_as_strict(element)))
             else:
-                query = add_as_like(element)
-                and_block_queries.append({"matching_type": 'substring',
-                                          "search_string": query})
-    return and_blocks_queries
+                and_block_queries.append(('substring', add_as_like(element)))
+        and_blocks_queries.append(tuple(and_block_queries))
+    return tuple(and_blocks_queries)
+
+
+def boolean_search(test_string,  exclude_char = '-'):
+    return [
+        [{"matching_type": matching_type, "search_string": search_string}
+            for matching_type, search_string in and_block]
+        for and_block in boolean_search_tuple(test_string, exclude_char)]
 
 
 def save_xlsx_data(
@@ -518,6 +534,101 @@ def get_perspectives_dictionaries(res_lexical_entries):
     return res_perspectives, res_dictionaries
 
 
+class Search_Plan(object):
+    """
+    Compiled advanced search plan, normalized search conditions and search parameters identifying search
+    results, with a digest keying cached lexical entry id lists of search results, see search_mechanism().
+
+    Conditions of an AND block and AND blocks themselves are sorted and deduplicated, so that the same
+    search with differently ordered conditions, e.g. re-issued for paging or XLSX export, gets the same
+    key.
+    """
+
+    data_version = 1
+
+    def __init__(
+        self,
+        dictionary_id_list,
+        category,
+        search_strings,
+        publish,
+        accept,
+        adopted,
+        etymology,
+        diacritics,
+        field_id_list):
+
+        self.search_list = (
+            self.normalize(search_strings))
+
+        self.generation = None
+
+        self.key_tuple = (
+            self.data_version,
+            tuple(sorted(tuple(dictionary_id) for dictionary_id in dictionary_id_list)),
+            category,
+            self.search_list,
+            publish,
+            accept,
+            adopted,
+            etymology,
+            diacritics,
+            tuple(sorted(tuple(field_id) for field_id in field_id_list)))
+
+        self.digest = (
+
+            hashlib.sha256(
+                repr(self.key_tuple).encode('utf-8')).hexdigest())
+
+    @staticmethod
+    def normalize(search_strings):
+        """
+        Normalizes search conditions into a sorted tuple of sorted AND blocks of (field_id, matching_type,
+        search_string) conditions.
+        """
+
+        block_set = set()
+
+        for search_block in search_strings:
+
+            condition_set = set()
+
+            for search_string in search_block:
+
+                field_id = search_string.get('field_id')
+
+                condition_set.add((
+                    tuple(field_id) if field_id else None,
+                    search_string.get('matching_type'),
+                    search_string['search_string']))
+
+            block_set.add(
+                tuple(sorted(condition_set, key = repr)))
+
+        return tuple(sorted(block_set, key = repr))
+
+    def get_entry_id_list(self):
+        """
+        Gets cached lexical entry id list of the search results, or None if we do not have one.
+
+        Remembers current cache generation, so that results of the search performed on a cache miss are
+        stored as of before the search.
+        """
+
+        self.generation = (
+            SEARCH_RESULT_CACHE.generation())
+
+        return (
+
+            SEARCH_RESULT_CACHE.get(
+                self.digest, self.generation))
+
+    def set_entry_id_list(self, entry_id_list):
+
+        SEARCH_RESULT_CACHE.set(
+            self.digest, entry_id_list, self.generation)
+
+
 def search_mechanism(
     dictionaries,
     category,
@@ -623,6 +734,70 @@ def search_mechanism(
 
             return result_lexical_entries, res_perspectives, res_dictionaries
 
+    # Checking if we already have results of the same search, e.g. if it is re-issued for paging or for
+    # XLSX export.
+
+    search_plan = (
+
+        Search_Plan(
+            dictionaries.all(),
+            category,
+            search_strings,
+            publish,
+            accept,
+            adopted,
+            etymology,
+            diacritics,
+            category_field_cte_query.all()))
+
+    entry_id_list = (
+        search_plan.get_entry_id_list())
+
+    if entry_id_list is not None:
+
+        log.debug(
+            f'\nsearch_plan {search_plan.digest}: '
+            f'{len(entry_id_list)} cached lexical entries')
+
+        if not entry_id_list:
+            return [], [], []
+
+        if load_entities:
+
+            res_lexical_entries, _ = (
+
+                entries_with_entities(
+                    entry_id_list,
+                    accept = True,
+                    delete = False,
+                    mode = None,
+                    publish = True,
+                    check_perspective = False))
+
+        else:
+
+            entry_query = (
+
+                DBSession
+
+                    .query(
+                        dbLexicalEntry)
+
+                    .filter(
+                        tuple_(
+                            dbLexicalEntry.client_id,
+                            dbLexicalEntry.object_id)
+                            .in_(ids_to_id_query(entry_id_list))))
+
+            res_lexical_entries = [
+                graphene_obj(lexical_entry, LexicalEntry)
+                for lexical_entry in entry_query]
+
+        res_perspectives, res_dictionaries = (
+            get_perspectives_dictionaries(res_lexical_entries))
+
+        return res_lexical_entries, res_perspectives, res_dictionaries
+
     lexes = (
 
         DBSession
@@ -668,16 +843,22 @@ def search_mechanism(
     all_block_field_set = set()
     fields_flag = True
 
+    # Entity content is searched via its normalized forms precomputed in the entity search table.
+
     if diacritics == 'ignore':
 
         xform_func = func.diacritic_xform
         xform_bag_func = func.diacritic_xform_bag
 
+        search_content = dbEntitySearch.content_xform
+
     else:
 
         xform_func = func.lower
         xform_bag_func = func.lower_bag
 
+        search_content = dbEntitySearch.content_lower
+
     if category == 0:
 
         for search_block in search_strings:
@@ -706,31 +887,31 @@ def search_mechanism(
                         if ss.get('matching_type') == 'substring':
 
                             all_entity_content_filter.append(
-                                xform_func(dbEntity.content)
+                                search_content
                                     .like(xform_ss))
 
                         elif ss.get('matching_type') == 'full_string':
 
                             all_entity_content_filter.append(
-                                xform_func(dbEntity.content) ==
+                                search_content ==
                                     xform_ss)
 
                         elif ss.get('matching_type') == 'regexp':
 
                             all_entity_content_filter.append(
-                                xform_func(dbEntity.content)
+                                search_content
                                     .op('~*')(xform_ss))
 
                 elif search_string.get('matching_type') == 'full_string':
 
                     all_entity_content_filter.append(
-                        xform_func(dbEntity.content) ==
+                        search_content ==
                             xform_func(search_value))
 
                 elif search_string.get('matching_type') == 'regexp':
 
                     all_entity_content_filter.append(
-                        xform_func(dbEntity.content)
+                        search_content
                             .op('~*')(xform_func(search_value)))
 
     elif category == 1:
@@ -826,10 +1007,13 @@ def search_mechanism(
     select_query = []
     if field_filter:
         select_query += [dbEntity.field_client_id, dbEntity.field_object_id]
+    search_filter = []
     if category == 1:
         select_query += [dbEntity.additional_metadata]
     else:
-        select_query += [dbEntity.content]
+        select_query += [dbEntity.content, search_content.label('search_content')]
+        search_filter += [dbEntitySearch.client_id == dbEntity.client_id,
+         dbEntitySearch.object_id == dbEntity.object_id]
     published_filter = []
     if accept is not None:
         published_filter += [dbPublishingEntity.accepted == accept]
@@ -845,6 +1029,7 @@ def search_mechanism(
                                        *select_query).filter(
                 dbEntity.marked_for_deletion == False,
                 *published_filter,
+                *search_filter,
                 all_entity_content_filter).cte()  # only published entities
 
     # old mechanism + cte
@@ -933,7 +1118,7 @@ def search_mechanism(
                 if matching_type == 'full_string':
 
                     inner_and.append(
-                        xform_func(cur_dbEntity.content) ==
+                        cur_dbEntity.search_content ==
                             xform_func(search_value))
 
                 elif matching_type == 'substring':
@@ -954,25 +1139,25 @@ def search_mechanism(
                             if ss.get('matching_type') == 'substring':
 
                                 bs_and.append(
-                                    xform_func(cur_dbEntity.content)
+                                    cur_dbEntity.search_content
                                         .like(xform_ss))
 
                             elif ss.get('matching_type') == 'full_string':
 
                                 bs_and.append(
-                                    xform_func(cur_dbEntity.content) ==
+                                    cur_dbEntity.search_content ==
                                         xform_ss)
 
                             elif ss.get('matching_type') == 'regexp':
 
                                 bs_and.append(
-                                    xform_func(cur_dbEntity.content)
+                                    cur_dbEntity.search_content
                                         .op('~*')(xform_ss))
 
                             elif ss.get('matching_type') == 'exclude':
 
                                 bs_and.append(
-                                    xform_func(cur_dbEntity.content) !=
+                                    cur_dbEntity.search_content !=
                                         xform_ss)
 
                         bs_or_block_list.append(and_(*bs_and))
@@ -982,7 +1167,7 @@ def search_mechanism(
                 elif matching_type == 'regexp':
 
                     inner_and.append(
-                        xform_func(cur_dbEntity.content)
+                        cur_dbEntity.search_content
                             .op('~*')(xform_func(search_value)))
 
             and_lexes_query = (
@@ -1069,6 +1254,9 @@ def search_mechanism(
             graphene_obj(lexical_entry, LexicalEntry)
             for lexical_entry in entry_query]
 
+    search_plan.set_entry_id_list(
+        [lexical_entry.dbObject.id for lexical_entry in res_lexical_entries])
+
     res_perspectives, res_dictionaries = (
         get_perspectives_dictionaries(res_lexical_entries))
 
@@ -1157,16 +1345,22 @@ def search_mechanism_simple(
             else:
                 lexes = lexes.filter(tuple_(dbEntity.field_client_id, dbEntity.field_object_id).in_(fields))
 
+    # Entity content is searched via its normalized forms precomputed in the entity search table.
+
     if diacritics == 'ignore':
 
         xform_func = func.diacritic_xform
         xform_bag_func = func.diacritic_xform_bag
 
+        search_content_name = 'content_xform'
+
     else:
 
         xform_func = func.lower
         xform_bag_func = func.lower_bag
 
+        search_content_name = 'content_lower'
+
     publish_or_accept = (
         publish is not None and
         accept is not None)
@@ -1182,6 +1376,17 @@ def search_mechanism_simple(
             cur_dbEntity.parent_client_id == dbLexicalEntry.client_id,
             cur_dbEntity.parent_object_id == dbLexicalEntry.object_id))
 
+        if category != 1:
+
+            cur_dbEntitySearch = aliased(dbEntitySearch)
+
+            and_block.extend((
+                cur_dbEntitySearch.client_id == cur_dbEntity.client_id,
+                cur_dbEntitySearch.object_id == cur_dbEntity.object_id))
+
+            cur_search_content = (
+                getattr(cur_dbEntitySearch, search_content_name))
+
         if publish_or_accept:
 
             cur_dbPublishingEntity = aliased(dbPublishingEntity)
@@ -1253,19 +1458,19 @@ def search_mechanism_simple(
                 if matching_type == 'full_string':
 
                     inner_and.append(
-                        xform_func(cur_dbEntity.content) ==
+                        cur_search_content ==
                             xform_func(search_value))
 
                 elif matching_type == 'substring':
 
                     inner_and.append(
-                        xform_func(cur_dbEntity.content)
+                        cur_search_content
                             .like(xform_func('%' + search_value + '%')))
 
                 elif matching_type == 'regexp':
 
                     inner_and.append(
-                        xform_func(cur_dbEntity.content)
+                        cur_search_content
                             .op('~*')(xform_func(search_value)))
 
             or_block.append(and_(*inner_and))
@@ -2294,18 +2499,60 @@ class EafSearch(LingvodocObjectType):
 
         eaf_count = eaf_query.count()
 
+        storage_f = (
+            as_storage_file if __debug_flag__ else storage_file)
+
+        # Indexing tier annotations of EAF corpora we did not index yet, then, if the query allows, using
+        # the index to select EAF corpora which can match it, so that we do not have to parse all the others.
+
+        eaf_index_exists = (
+
+            exists().where(and_(
+                eaf_index_entity.c.client_id == dbEntity.client_id,
+                eaf_index_entity.c.object_id == dbEntity.object_id)))
+
+        index_count = (
+
+            eaf_index_update(
+                eaf_query.filter(~eaf_index_exists).all(),
+                storage,
+                storage_f))
+
+        pattern_list = (
+            eaf_index_pattern_list(search_query))
+
+        candidate_set = (
+
+            None if pattern_list is None else
+
+            eaf_index_candidate_set(
+                eaf_query.with_entities(dbEntity.client_id, dbEntity.object_id),
+                pattern_list))
+
+        log.debug(
+            '\neaf_search'
+            '\n  eaf_count: {0}'
+            '\n  index_count: {1}'
+            '\n  pattern_list: {2}'
+            '\n  candidate_count: {3}'.format(
+                eaf_count,
+                index_count,
+                pattern_list,
+                None if candidate_set is None else len(candidate_set)))
+
         # Processing EAF corpora.
 
         result_list = []
 
         open(xlsx_path, 'w').close()
 
-        storage_f = (
-            as_storage_file if __debug_flag__ else storage_file)
-
         for index, (entity_client_id, entity_object_id, eaf_url) in (
             enumerate(eaf_query.yield_per(256))):
 
+            if (candidate_set is not None and
+                (entity_client_id, entity_object_id) not in candidate_set):
+                continue
+
             log.debug(
                 '\neaf_search {0}/{1}: entity {2}/{3} {4}'.format(
                     index + 1,
@@ -39,6 +39,7 @@ class Task(LingvodocObjectType):
     total_stages = graphene.Int()
     current_stage = graphene.Int()
     user_id = graphene.Int()
+    created_at = graphene.Float()
 
     def resolve_user_id(self, info):
         return int(self.user_id)
@@ -28,6 +28,7 @@ import uuid
 
 import graphene
 import graphene.types
+from graphql.execution.middleware import MiddlewareManager
 
 # So that matplotlib does not require display stuff, in particular, tkinter. See e.g. https://
 # stackoverflow.com/questions/4931376/generating-matplotlib-graphs-without-a-running-x-server.
@@ -209,6 +210,7 @@ from lingvodoc.schema.gql_group import Group
 
 from lingvodoc.schema.gql_holders import (
     AdditionalMetadata,
+    Batch_Loader,
     client_id_check,
     CreatedAt,
     del_object,
@@ -351,10 +353,10 @@ from lingvodoc.utils.search import (
 import lingvodoc.version
 
 from lingvodoc.views.v2.phonology import (
+    Acoustic_Cache,
     get_vowel_class,
     Phonology_Parameters,
-    process_sound_markup,
-    PickleCache)
+    process_sound_markup)
 
 from lingvodoc.views.v2.save_dictionary.core import async_save_dictionary
 
@@ -2072,6 +2074,10 @@ class Query(graphene.ObjectType):
             gql_field.dbObject = db_field
             gql_fields.append(gql_field)
 
+        # Translations of the fields are resolved in a single batch, see Batch_Loader.
+
+        info.context.loader.prime(gql_fields)
+
         return gql_fields
 
 
@@ -2199,11 +2205,21 @@ class Query(graphene.ObjectType):
 
                     dbdicts = [o for o in dbdicts if (o.client_id, o.object_id) in dictstemp_set]
 
+        # Permission checks on dictionaries of the list are batched, see Context.acl_check_many().
+
         dictionaries_list = list()
+        id_list = list()
         for dbdict in dbdicts:
             gql_dict = Dictionary(id=[dbdict.client_id, dbdict.object_id])
             gql_dict.dbObject = dbdict
+            gql_dict.acl_batch_id_list = id_list
             dictionaries_list.append(gql_dict)
+            id_list.append((dbdict.client_id, dbdict.object_id))
+
+        # Translations of the dictionaries are resolved in a single batch, see Batch_Loader.
+
+        info.context.loader.prime(dictionaries_list)
+
         return dictionaries_list
 
     def resolve_dictionary(self, info, id):
@@ -2395,14 +2411,25 @@ class Query(graphene.ObjectType):
             '\nperspective_query:\n' +
             render_statement(perspective_query.statement))
 
+        # Permission checks on perspectives of the list, e.g. by role_check fields, are batched, see
+        # Context.acl_check_many().
+
         perspectives_list = []
+        id_list = []
 
         for db_persp in perspective_query.all():
 
             gql_persp = Perspective(id=[db_persp.client_id, db_persp.object_id])
             gql_persp.dbObject = db_persp
+            gql_persp.acl_batch_id_list = id_list
             perspectives_list.append(gql_persp)
 
+            id_list.append((db_persp.client_id, db_persp.object_id))
+
+        # Translations of the perspectives are resolved in a single batch, see Batch_Loader.
+
+        info.context.loader.prime(perspectives_list)
+
         return perspectives_list
 
 
@@ -5475,7 +5502,7 @@ class PhonologicalStatisticalDistance(graphene.Mutation):
 
         formant_data_list = []
         row_count = 0
-        perspective_cache_dict = {}
+        acoustic_cache = Acoustic_Cache(storage)
 
         x_min, x_max = None, None
         y_min, y_max = None, None
@@ -5488,13 +5515,6 @@ class PhonologicalStatisticalDistance(graphene.Mutation):
             formant_list = []
             vowel_counter = collections.Counter()
 
-            '''
-            Cache initializing
-            '''
-            perspective_id = (perspective.client_id, perspective.object_id)
-            if not perspective_cache_dict.get(perspective_id):
-                perspective_cache_dict[perspective_id] = PickleCache(storage, perspective_id)
-
             for row_index, row in enumerate(query.yield_per(100)):
 
                 # Showing what sound/markup pair we are to process.
@@ -5523,7 +5543,7 @@ class PhonologicalStatisticalDistance(graphene.Mutation):
                         markup_id,
                         markup_url,
                         storage,
-                        perspective_cache_dict[perspective_id],
+                        acoustic_cache,
                         vowel_selection,
                         __debug_flag__))
 
@@ -5710,11 +5730,7 @@ class PhonologicalStatisticalDistance(graphene.Mutation):
                     int(math.floor(95.0 + 2.0 * (perspective_index + 1) / len(info_list))),
                     'Creating formant distribution models')
 
-        '''
-        Writing cache to file if there is any change
-        '''
-        for cache in perspective_cache_dict.values():
-            cache.flush()
+        acoustic_cache.flush()
 
         # Preparing for compilation of modelling results.
 
@@ -9038,13 +9054,29 @@ class Context(dict):
 
         self.acl_cache = {}
 
+        # Request-scoped batch loader of DB objects, see lingvodoc/schema/gql_holders.py.
+
+        self.loader = Batch_Loader()
+
+    def reset_loader(self):
+        """
+        Replaces batch loader with a fresh one, e.g. after a mutation or a query of a batch request, so that
+        subsequent resolvers do not get stale objects loaded before DB changes.
+        """
+
+        self.loader = Batch_Loader()
+
     def acl_check_if(
         self,
         action,
         subject,
-        subject_id):
+        subject_id,
+        batch_id_list = None):
         """
         Checks if the client has permission to perform given action on a specified subject via ACL.
+
+        If a list of ids of subjects the check is likely to be performed for is given, e.g. ids of other
+        objects of the same resolved list, on cache miss checks all of them at once, see acl_check_many().
         """
 
         if type(subject_id) is list:
@@ -9063,6 +9095,23 @@ class Context(dict):
 
             return result
 
+        if (batch_id_list is not None and
+            isinstance(subject_id, tuple)):
+
+            self.acl_check_many(
+                action,
+                subject,
+                batch_id_list)
+
+            result = (
+
+                self.acl_cache.get(
+                    acl_cache_key))
+
+            if result is not None:
+
+                return result
+
         result = (
 
             acl.check_direct(
@@ -9077,11 +9126,55 @@ class Context(dict):
 
         return result
 
+    def acl_check_many(
+        self,
+        action,
+        subject,
+        id_list):
+        """
+        Checks if the client has permission to perform given action on each of the subjects specified by a
+        list of client_id/object_id ids via ACL with a fixed number of queries, caches and returns the list
+        of results.
+        """
+
+        id_list = [
+            tuple(subject_id) for subject_id in id_list]
+
+        check_id_list = [
+
+            subject_id
+            for subject_id in id_list
+
+            if (action, subject, subject_id) not in self.acl_cache]
+
+        if check_id_list:
+
+            permitted_id_set = (
+
+                acl.check_direct_many(
+                    self.client_id,
+                    self.request,
+                    action,
+                    subject,
+                    check_id_list))
+
+            for subject_id in check_id_list:
+
+                self.acl_cache[
+                    (action, subject, subject_id)] = (
+
+                    subject_id in permitted_id_set)
+
+        return [
+            self.acl_cache[(action, subject, subject_id)]
+            for subject_id in id_list]
+
     def acl_check(
         self,
         action,
         subject,
-        subject_id):
+        subject_id,
+        batch_id_list = None):
         """
         Checks if the client has permission to perform given action on a specified subject via ACL, raises
         permission exception otherwise.
@@ -9092,7 +9185,8 @@ class Context(dict):
             self.acl_check_if(
                 action,
                 subject,
-                subject_id))
+                subject_id,
+                batch_id_list))
 
         if not check:
 
@@ -9189,3 +9283,23 @@ class Context(dict):
 
         return client_id
 
+
+def loader_middleware(next, root, info, **args):
+    """
+    GraphQL middleware resetting context's batch loader after each top-level mutation field, mutation
+    fields are executed serially and each can change objects cached by the loader.
+    """
+
+    result = next(root, info, **args)
+
+    if (info.operation.operation == 'mutation' and
+        info.parent_type == info.schema.get_mutation_type()):
+
+        info.context.reset_loader()
+
+    return result
+
+
+# Not wrapping resolver results in promises, as the middleware is applied to each resolved field.
+loader_middleware_manager = (
+    MiddlewareManager(loader_middleware, wrap_in_promise = False))
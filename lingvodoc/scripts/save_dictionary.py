@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import sqlite3
 import base64
+import concurrent.futures
 import requests
 import json
 import hashlib
@@ -89,6 +90,11 @@ import uuid
 
 log = logging.getLogger(__name__)
 
+# Process umask, determined at import as it can be read only by setting it, to give files moved from
+# temporary locations the same permissions as files created directly.
+process_umask = os.umask(0o022)
+os.umask(process_umask)
+
 EAF_TIERS = {
     "literary translation": "Translation of Paradigmatic forms",
     "text": "Transcription of Paradigmatic forms",
@@ -715,6 +721,12 @@ class Save_Context(object):
     Also used in advanced_search.
     """
 
+    # Sound / markup files are fetched by a bounded pool of threads, with a bounded number of fetched files
+    # waiting to be added to the archive, see pack_media().
+
+    media_thread_count = 8
+    media_prefetch_count = 32
+
     def __init__(
         self,
         locale_id,
@@ -724,6 +736,7 @@ class Save_Context(object):
         markup_flag = False,
         storage = None,
         f_type = 'xlsx',
+        stream_flag = False,
         __debug_flag__ = False):
 
         self.locale_id = locale_id
@@ -734,8 +747,27 @@ class Save_Context(object):
         self.sound_flag = sound_flag
         self.markup_flag = markup_flag
 
-        self.stream = io.BytesIO()
-        self.workbook = xlsxDocument(self.stream, {'in_memory': True}) if f_type == 'xlsx' else None
+        # In streaming mode XLSX workbook is compiled into a temporary file in constant memory mode, with each
+        # row flushed to disk as soon as the next one is started, so that memory usage does not depend on
+        # the size of exported data.
+
+        self.stream_path = None
+
+        if stream_flag and f_type == 'xlsx':
+
+            with tempfile.NamedTemporaryFile(
+                suffix = '.xlsx', delete = False) as temporary_file:
+
+                self.stream_path = temporary_file.name
+
+            self.stream = None
+            self.workbook = xlsxDocument(self.stream_path, {'constant_memory': True})
+
+        else:
+
+            self.stream = io.BytesIO()
+            self.workbook = xlsxDocument(self.stream, {'in_memory': True}) if f_type == 'xlsx' else None
+
         self.document = docxDocument() if f_type == 'docx' else None
         self.richtext = rtfDocument() if f_type == 'rtf' else None
 
@@ -2215,6 +2247,39 @@ class Save_Context(object):
 
                 .fetchall())
 
+        # Adding sound / markup files of cognate entries to the archive beforehand, if required.
+
+        if self.sound_flag or self.markup_flag:
+
+            sound_arg_list = []
+            markup_arg_list = []
+
+            for result_item in result_list:
+
+                if self.perspective_info_dict.get(
+                    (result_item[2], result_item[3])) is None:
+
+                    continue
+
+                sound_markup_list = result_item[-1] or []
+
+                if self.sound_flag and self.markup_flag:
+
+                    for s_content, s_created_at, markup_content_list in sound_markup_list:
+
+                        sound_arg_list.append((s_content, s_created_at))
+                        markup_arg_list.extend(markup_content_list)
+
+                elif self.sound_flag:
+                    sound_arg_list.extend(sound_markup_list)
+
+                else:
+                    markup_arg_list.extend(sound_markup_list)
+
+            self.pack_media(
+                sound_arg_list,
+                markup_arg_list)
+
         # Compiling appropriately ordered cognate info.
 
         info_list = []
@@ -2628,6 +2693,70 @@ class Save_Context(object):
                 docx if f_type == 'docx' else
                 rtf)
 
+    def write_file(
+        self,
+        file_path,
+        move_flag = False):
+        """
+        Writes compiled document to a file, in streaming mode just copying or moving the temporary file.
+
+        Compiled document can't be written anywhere else after it is moved.
+        """
+
+        if self.stream_path is not None:
+
+            if move_flag:
+
+                shutil.move(self.stream_path, file_path)
+                self.stream_path = None
+
+                # Temporary files are accessible only by their owner, and the document should be readable
+                # e.g. by a web server serving it from the storage.
+
+                os.chmod(file_path, 0o666 & ~process_umask)
+
+            else:
+                shutil.copyfile(self.stream_path, file_path)
+
+            return
+
+        with open(file_path, 'wb+') as document_file:
+
+            self.stream.seek(0)
+            copyfileobj(self.stream, document_file)
+
+    def write_zip(
+        self,
+        zip_info):
+        """
+        Adds compiled document to the zip archive, in streaming mode directly from the temporary file.
+        """
+
+        if self.stream_path is not None:
+
+            self.zip_file.write(
+                self.stream_path, zip_info.filename)
+
+            return
+
+        self.stream.seek(0)
+
+        self.zip_file.writestr(
+            zip_info,
+            self.stream.read())
+
+    def remove_stream(self):
+        """
+        Removes temporary file of the compiled document in streaming mode, if we still have it.
+        """
+
+        if (self.stream_path is not None and
+            path.exists(self.stream_path)):
+
+            os.remove(self.stream_path)
+
+        self.stream_path = None
+
     def get_zip_info(
         self,
         name,
@@ -2678,18 +2807,35 @@ class Save_Context(object):
 
         return zipfile.ZipInfo(zip_name, zip_date)
 
-    def get_sound_link(
+    def fetch_media(
         self,
-        sound_url,
-        created_at):
+        url):
         """
-        Processes linked sound file, adding it to the archive if necessary.
+        Fetches sound / markup file, returns its contents and their hash.
         """
 
         with self.storage_f(
-            self.storage, sound_url) as sound_stream:
+            self.storage, url) as media_stream:
+
+            media_bytes = media_stream.read()
 
-            sound_bytes = sound_stream.read()
+        return (
+            media_bytes,
+            hashlib.sha256(media_bytes).digest())
+
+    def add_media(
+        self,
+        url,
+        created_at,
+        media_bytes,
+        media_hash,
+        markup_flag = False):
+        """
+        Adds fetched sound / markup file to the archive if necessary, returns its name in the archive.
+
+        Markup and WAV sound files are compressed, other sound formats are already compressed and are stored
+        as is.
+        """
 
         # Checking if we need to save the file, and if we need to rename it to avoid duplicate
         # names.
@@ -2699,75 +2845,233 @@ class Save_Context(object):
             self.get_zip_info(
 
                 path.basename(
-                    urllib.parse.urlparse(sound_url).path),
+                    urllib.parse.urlparse(url).path),
 
-                hashlib.sha256(
-                    sound_bytes).digest(),
+                media_hash,
 
                 datetime.datetime.utcfromtimestamp(
                     created_at)))
 
-        # Saving sound file to the archive, if required.
+        # Saving the file to the archive, if required.
 
         if isinstance(zip_info, str):
+
+            self.zip_url_dict[url] = zip_info
             return zip_info
 
-        if sndhdr.test_wav(
-            sound_bytes, io.BytesIO(sound_bytes)):
+        if (markup_flag or
+            sndhdr.test_wav(media_bytes, io.BytesIO(media_bytes))):
 
             zip_info.compress_type = zipfile.ZIP_DEFLATED
 
-        self.zip_file.writestr(zip_info, sound_bytes)
+        self.zip_file.writestr(zip_info, media_bytes)
 
+        self.zip_url_dict[url] = zip_info.filename
         return zip_info.filename
 
-    def get_markup_link(
+    def pack_media(
         self,
-        markup_url,
-        created_at):
+        sound_arg_list = (),
+        markup_arg_list = ()):
         """
-        Processes linked markup file, adding it to the archive if necessary.
+        Adds sound and markup files given by (url, created_at) pairs to the archive in advance, fetching
+        them concurrently, so that get_sound_link() / get_markup_link() just look up their names.
+
+        Files are deduplicated by URL before fetching and by name and contents after, and are added to the
+        archive in the given order, so that renaming of different files with the same names is
+        deterministic.
         """
 
-        with self.storage_f(
-            self.storage, markup_url) as markup_stream:
+        arg_list = []
+        url_set = set()
 
-            markup_bytes = markup_stream.read()
+        for markup_flag, media_arg_list in (
+            (False, sound_arg_list),
+            (True, markup_arg_list)):
 
-        # Checking if we need to save the file, and if we need to rename it to avoid duplicate
-        # names.
+            for url, created_at in media_arg_list:
 
-        zip_info = (
-                
-            self.get_zip_info(
+                if (url is None or
+                    url in url_set or
+                    url in self.zip_url_dict):
 
-                path.basename(
-                    urllib.parse.urlparse(markup_url).path),
+                    continue
 
-                hashlib.sha256(
-                    markup_bytes).digest(),
+                url_set.add(url)
+                arg_list.append((url, created_at, markup_flag))
 
-                datetime.datetime.utcfromtimestamp(
-                    created_at)))
+        if not arg_list:
+            return
 
-        # Saving markup file to the archive, if required.
+        with concurrent.futures.ThreadPoolExecutor(
+            self.media_thread_count) as executor:
 
-        if isinstance(zip_info, str):
-            return zip_info
+            future_deque = collections.deque()
 
-        zip_info.compress_type = zipfile.ZIP_DEFLATED
+            try:
 
-        self.zip_file.writestr(zip_info, markup_bytes)
+                for url, created_at, markup_flag in arg_list:
 
-        return zip_info.filename
+                    future_deque.append((
+                        url,
+                        created_at,
+                        markup_flag,
+                        executor.submit(self.fetch_media, url)))
+
+                    if len(future_deque) > self.media_prefetch_count:
+
+                        url, created_at, markup_flag, future = future_deque.popleft()
+
+                        self.add_media(
+                            url, created_at, *future.result(), markup_flag)
+
+                while future_deque:
+
+                    url, created_at, markup_flag, future = future_deque.popleft()
+
+                    self.add_media(
+                        url, created_at, *future.result(), markup_flag)
+
+            # Not waiting for files we are not going to add if we failed to fetch one of them.
+
+            finally:
+
+                for _, _, _, future in future_deque:
+                    future.cancel()
+
+    def pack_perspective_media(
+        self,
+        perspective,
+        published):
+        """
+        Adds sound and markup files of lexical entries of the current perspective to the archive in
+        advance, see pack_media().
+        """
+
+        media_field_id_set = set()
+
+        if self.sound_flag:
+            media_field_id_set.update(self.sound_field_id_set)
+
+        if self.markup_flag:
+            media_field_id_set.update(self.markup_field_id_set)
+
+        if not media_field_id_set:
+            return
+
+        media_query = (
+
+            self.session
+
+                .query(
+                    Entity.content,
+                    Entity.created_at,
+                    Entity.field_client_id,
+                    Entity.field_object_id)
+
+                .filter(
+                    LexicalEntry.parent_client_id == perspective.client_id,
+                    LexicalEntry.parent_object_id == perspective.object_id,
+                    LexicalEntry.marked_for_deletion == False,
+                    Entity.parent_client_id == LexicalEntry.client_id,
+                    Entity.parent_object_id == LexicalEntry.object_id,
+                    Entity.marked_for_deletion == False,
+                    Entity.content != None,
+
+                    tuple_(
+                        Entity.field_client_id,
+                        Entity.field_object_id)
+
+                        .in_(
+                            list(media_field_id_set)),
+
+                    PublishingEntity.client_id == Entity.client_id,
+                    PublishingEntity.object_id == Entity.object_id,
+                    PublishingEntity.accepted == True))
+
+        if published is not None:
+
+            media_query = (
+                media_query.filter(PublishingEntity.published == published))
+
+        media_query = (
+
+            media_query.order_by(
+                LexicalEntry.client_id,
+                LexicalEntry.object_id,
+                Entity.client_id,
+                Entity.object_id))
+
+        sound_arg_list = []
+        markup_arg_list = []
+
+        for content, created_at, field_cid, field_oid in media_query.yield_per(4096):
+
+            field_id = (field_cid, field_oid)
+
+            if (self.sound_flag and
+                field_id in self.sound_field_id_set):
+
+                sound_arg_list.append((content, created_at))
+
+            else:
+
+                markup_arg_list.append((content, created_at))
+
+        self.pack_media(
+            sound_arg_list,
+            markup_arg_list)
+
+    def get_sound_link(
+        self,
+        sound_url,
+        created_at):
+        """
+        Processes linked sound file, adding it to the archive if necessary.
+        """
+
+        zip_name = (
+            self.zip_url_dict.get(sound_url))
+
+        if zip_name is not None:
+            return zip_name
+
+        return (
+
+            self.add_media(
+                sound_url,
+                created_at,
+                *self.fetch_media(sound_url)))
+
+    def get_markup_link(
+        self,
+        markup_url,
+        created_at):
+        """
+        Processes linked markup file, adding it to the archive if necessary.
+        """
+
+        zip_name = (
+            self.zip_url_dict.get(markup_url))
+
+        if zip_name is not None:
+            return zip_name
+
+        return (
+
+            self.add_media(
+                markup_url,
+                created_at,
+                *self.fetch_media(markup_url),
+                markup_flag = True))
 
 def write_xlsx(
     context,
-    lex_dict,
+    lex_iter,
     published,
     __debug_flag__ = False):
 
-    for (_, lex) in sorted(lex_dict.items()):
+    for lex in lex_iter:
         context.save_lexical_entry(
             lex,
             published,
@@ -2857,11 +3161,11 @@ def write_xlsx(
 
 def write_docx(
     context,
-    lex_dict,
+    lex_iter,
     published,
     __debug_flag__ = False):
 
-    for (_, lex) in sorted(lex_dict.items()):
+    for lex in lex_iter:
         context.save_lexical_entry(
             lex,
             published,
@@ -2871,11 +3175,11 @@ def write_docx(
 
 def write_rtf(
     context,
-    lex_dict,
+    lex_iter,
     published,
     __debug_flag__ = False):
 
-    for (_, lex) in sorted(lex_dict.items()):
+    for lex in lex_iter:
         context.save_lexical_entry(
             lex,
             published,
@@ -2883,6 +3187,107 @@ def write_rtf(
             __debug_flag__ = __debug_flag__)()
 
 
+def perspective_entry_iter(
+    context,
+    perspective,
+    session,
+    published,
+    batch_size = 1024):
+    """
+    Gets lexical entries of a perspective to be exported as an iterable query fetching them in batches from
+    a server-side cursor.
+
+    If the perspective has ordering entities, entries are ordered by their values and entries without
+    them are skipped, otherwise entries are ordered by their ids.
+
+    Entries are given as (client_id, object_id) rows, which is all we need in
+    Save_Context.save_lexical_entry().
+    """
+
+    entry_query = (
+
+        session
+
+            .query(
+                LexicalEntry.client_id,
+                LexicalEntry.object_id)
+
+            .filter(
+                LexicalEntry.parent_client_id == perspective.client_id,
+                LexicalEntry.parent_object_id == perspective.object_id,
+                LexicalEntry.marked_for_deletion == False,
+                Entity.parent_client_id == LexicalEntry.client_id,
+                Entity.parent_object_id == LexicalEntry.object_id,
+                Entity.marked_for_deletion == False,
+                PublishingEntity.client_id == Entity.client_id,
+                PublishingEntity.object_id == Entity.object_id,
+                PublishingEntity.accepted == True))
+
+    if published is not None:
+
+        entry_query = (
+            entry_query.filter(PublishingEntity.published == published))
+
+    order_query = None
+
+    if context.ordering_type_id:
+
+        order_query = (
+
+            entry_query
+
+                .filter(
+                    Field.client_id == Entity.field_client_id,
+                    Field.object_id == Entity.field_object_id,
+                    Field.data_type_translation_gist_client_id == context.ordering_type_id[0],
+                    Field.data_type_translation_gist_object_id == context.ordering_type_id[1]))
+
+        if not session.query(order_query.exists()).scalar():
+            order_query = None
+
+    if order_query is not None:
+
+        # Safeguarding against unexpected yet possible irregular null ordering entity values, which should
+        # not appear but we can't guarantee against.
+        #
+        # Ordering values are compared by code points, as with Python's string comparison, with 'ucs_basic'
+        # collation of the UTF-8 database.
+
+        order_content = (
+
+            func.coalesce(Entity.content, '')
+                .collate('ucs_basic')
+                .label('order_content'))
+
+        entry_query = (
+
+            order_query
+
+                .add_columns(
+                    order_content)
+
+                .distinct()
+
+                .order_by(
+                    order_content,
+                    LexicalEntry.client_id,
+                    LexicalEntry.object_id))
+
+    else:
+
+        entry_query = (
+
+            entry_query
+
+                .distinct()
+
+                .order_by(
+                    LexicalEntry.client_id,
+                    LexicalEntry.object_id))
+
+    return entry_query.yield_per(batch_size)
+
+
 def compile_document(
     context,
     client_id,
@@ -2910,36 +3315,29 @@ def compile_document(
             perspective,
             __debug_flag__ = __debug_flag__)
 
-        lexical_entries = session.query(LexicalEntry, Entity).join(Entity).join(PublishingEntity) \
-            .filter(LexicalEntry.parent_id == (perspective.client_id, perspective.object_id),
-                    LexicalEntry.marked_for_deletion == False,
-                    Entity.marked_for_deletion == False,
-                    PublishingEntity.accepted == True)
-        if published is not None:
-            lexical_entries = lexical_entries.filter(PublishingEntity.published == published)
-
-        lex_by_id = {}
-        lex_by_order = {}
+        # Adding perspective's sound / markup files to the archive beforehand, if required.
 
-        for lex, entity in lexical_entries:
-            lex_by_id[lex.id] = lex
+        if context.sound_flag or context.markup_flag:
 
-            if context.is_order_field(entity.field_id):
+            context.pack_perspective_media(
+                perspective,
+                published)
 
-                # Safeguarding against unexpected yet possible irregular null ordering entity values, which
-                # should not appear but we can't guarantee against.
+        lex_iter = (
 
-                lex_by_order[(entity.content or '', lex.id)] = lex
-
-        lex_dict = lex_by_order if lex_by_order else lex_by_id
+            perspective_entry_iter(
+                context,
+                perspective,
+                session,
+                published))
 
         if context.workbook:
-            write_xlsx(context, lex_dict, published, __debug_flag__)
+            write_xlsx(context, lex_iter, published, __debug_flag__)
         elif context.document:
-            write_docx(context, lex_dict, published, __debug_flag__)
+            write_docx(context, lex_iter, published, __debug_flag__)
             context.document.save(context.stream)
         elif context.richtext:
-            write_rtf(context, lex_dict, published, __debug_flag__)
+            write_rtf(context, lex_iter, published, __debug_flag__)
             # Write utf to bytes
             wrapper_file = codecs.getwriter('utf-8')(context.stream)
             context.richtext.write(wrapper_file)
@@ -2977,6 +3375,8 @@ def save_dictionary(
     if task_status:
         task_status.set(3, 20, 'Running async process')
 
+    save_context = None
+
     try:
 
         # Creating saving context, compiling dictionary data to a workbook.
@@ -2991,7 +3391,8 @@ def save_dictionary(
                 markup_flag,
                 storage,
                 f_type,
-                __debug_flag__))
+                stream_flag = True,
+                __debug_flag__ = __debug_flag__))
 
         if sound_flag or markup_flag:
 
@@ -3007,6 +3408,7 @@ def save_dictionary(
                 collections.Counter())
 
             save_context.zip_hash_dict = {}
+            save_context.zip_url_dict = {}
 
         compile_document(
             save_context,
@@ -3032,10 +3434,7 @@ def save_dictionary(
 
         if __debug_flag__:
 
-            with open(table_filename, 'wb') as xlsx_file:
-
-                save_context.stream.seek(0)
-                copyfileobj(save_context.stream, xlsx_file)
+            save_context.write_file(table_filename)
 
         # Either adding XLSX file to the Zip archive...
 
@@ -3046,11 +3445,7 @@ def save_dictionary(
                 save_context.get_zip_info(
                     table_filename))
 
-            save_context.stream.seek(0)
-
-            save_context.zip_file.writestr(
-                zip_info,
-                save_context.stream.read())
+            save_context.write_zip(zip_info)
 
             save_context.zip_file.close()
             temporary_zip_file.close()
@@ -3178,10 +3573,8 @@ def save_dictionary(
 
             try:
 
-                with open(storage_path, 'wb+') as workbook_file:
-
-                    save_context.stream.seek(0)
-                    copyfileobj(save_context.stream, workbook_file)
+                save_context.write_file(
+                    storage_path, move_flag = True)
 
             except OSError as os_error:
 
@@ -3197,10 +3590,8 @@ def save_dictionary(
                 table_filename = sanitize_filename(f"{result_filename}.{f_type}")
                 storage_path = path.join(storage_dir, table_filename)
 
-                with open(storage_path, 'wb+') as workbook_file:
-
-                    save_context.stream.seek(0)
-                    copyfileobj(save_context.stream, workbook_file)
+                save_context.write_file(
+                    storage_path, move_flag = True)
 
             # Successfully saved dictionary, finishing and returning links to files with results.
 
@@ -3235,5 +3626,12 @@ def save_dictionary(
 
         return {'error': 'result compilation error'}
 
+    finally:
+
+        # Removing temporary workbook file, if we still have it.
+
+        if save_context is not None:
+            save_context.remove_stream()
+
     session.commit()
     engine.dispose()
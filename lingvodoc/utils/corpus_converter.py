@@ -58,7 +58,7 @@ from lingvodoc.scripts import elan_parser
 from lingvodoc.utils import ids_to_id_query
 from lingvodoc.utils.elan_functions import tgt_to_eaf
 
-from lingvodoc.utils.search import get_id_to_field_dict, field_search
+from lingvodoc.utils.search import get_id_to_field_dict, field_search, invalidate_search
 
 from lingvodoc.views.v2.utils import storage_file
 from lingvodoc.utils.creation import (
@@ -1291,6 +1291,14 @@ def convert_five_tiers(
                 percent_from + percent_step,
                 task_message)
 
+            # Bulk inserts are not detected by the ORM, so we invalidate cached search results explicitly.
+
+            if (entry_insert_list or
+                entity_insert_list or
+                publish_insert_list):
+
+                invalidate_search()
+
             if entry_insert_list:
                 DBSession.execute(
                     LexicalEntry.__table__
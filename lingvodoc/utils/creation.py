@@ -32,6 +32,7 @@ import transaction
 
 # Project imports.
 
+from lingvodoc.acl import invalidate_groups
 import lingvodoc.cache.caching as caching
 from lingvodoc.cache.caching import initialize_cache, TaskStatus
 
@@ -935,6 +936,10 @@ def edit_role(dict_or_persp, user_id, role_id, client_id, organization=False, di
                     if user not in group.organizations:
                         group.users.append(user)
 
+        # Cached group data of users is invalidated after commit, see acl.py.
+
+        invalidate_groups()
+
 
 def find_lexical_entries_by_tags(tags, field_client_id, field_object_id):
     return DBSession.query(LexicalEntry) \
@@ -0,0 +1,233 @@
+
+# Standard library imports.
+
+import collections
+import hashlib
+import logging
+import threading
+
+# Library imports.
+
+from graphql.error import GraphQLError
+from graphql.execution import ExecutionResult, execute
+from graphql.language.parser import parse
+from graphql.language.source import Source
+from graphql.validation import validate
+
+
+# Setting up logging.
+log = logging.getLogger(__name__)
+
+
+def query_hash(query_str):
+    """
+    Computes SHA-256 hash of a GraphQL query string, same as the one used by the Apollo persisted queries
+    protocol.
+    """
+
+    return (
+
+        hashlib.sha256(
+            query_str.encode('utf-8')).hexdigest())
+
+
+class Document_Cache(object):
+    """
+    LRU cache of parsed and validated GraphQL documents keyed by SHA-256 hashes of query strings.
+
+    Supports persisted queries in the form of Apollo automatic persisted queries protocol: a client may send
+    only the hash of a query in the 'extensions.persistedQuery.sha256Hash' field, and if the query is not
+    known, gets 'PersistedQueryNotFound' error and should re-send the request with both the query and its
+    hash.
+    """
+
+    def __init__(self, size = 1024):
+
+        self.size = size
+
+        self.lock = threading.Lock()
+        self.document_dict = collections.OrderedDict()
+
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def configure(self, size):
+        """
+        Sets maximum number of cached documents, evicting least recently used ones if required.
+        """
+
+        with self.lock:
+
+            self.size = size
+
+            while len(self.document_dict) > max(self.size, 0):
+                self.document_dict.popitem(last = False)
+
+    def clear(self):
+
+        with self.lock:
+
+            self.document_dict.clear()
+
+            self.hit_count = 0
+            self.miss_count = 0
+
+    def stats(self):
+        """
+        Returns cache size and hit / miss counts and rates.
+        """
+
+        with self.lock:
+
+            total_count = self.hit_count + self.miss_count
+
+            return {
+                'size': len(self.document_dict),
+                'hit_count': self.hit_count,
+                'miss_count': self.miss_count,
+                'hit_rate': self.hit_count / total_count if total_count else 0.0}
+
+    def get(self, hash_str):
+
+        with self.lock:
+
+            document = self.document_dict.get(hash_str)
+
+            if document is None:
+
+                self.miss_count += 1
+                return None
+
+            self.hit_count += 1
+            self.document_dict.move_to_end(hash_str)
+
+            return document
+
+    def put(self, hash_str, document):
+
+        if self.size <= 0:
+            return
+
+        with self.lock:
+
+            self.document_dict[hash_str] = document
+            self.document_dict.move_to_end(hash_str)
+
+            while len(self.document_dict) > self.size:
+                self.document_dict.popitem(last = False)
+
+    def get_document(self, schema, query_str = None, hash_str = None):
+        """
+        Gets parsed and validated document of a query, parsing and validating it on cache miss.
+
+        Returns either (document, None) or (None, error_list), in the latter case errors are as if from an
+        invalid query.
+        """
+
+        if query_str is not None:
+
+            query_str_hash = query_hash(query_str)
+
+            if hash_str is not None and hash_str != query_str_hash:
+
+                return None, [
+                    GraphQLError('provided sha does not match query')]
+
+            hash_str = query_str_hash
+
+        elif hash_str is None:
+
+            return None, [
+                GraphQLError('query key not found')]
+
+        document = self.get(hash_str)
+
+        if document is not None:
+            return document, None
+
+        # Only a hash of a query we do not know, client should re-send it with the query itself.
+
+        if query_str is None:
+
+            return None, [
+                GraphQLError('PersistedQueryNotFound')]
+
+        try:
+
+            document = (
+                parse(Source(query_str, 'GraphQL request')))
+
+            validation_error_list = (
+                validate(schema, document))
+
+        except Exception as exception:
+
+            return None, [exception]
+
+        if validation_error_list:
+            return None, validation_error_list
+
+        self.put(hash_str, document)
+
+        return document, None
+
+
+DOCUMENT_CACHE = Document_Cache()
+
+
+def persisted_query_hash(json_req):
+    """
+    Gets persisted query hash, if any, from a JSON GraphQL request.
+    """
+
+    extensions = json_req.get('extensions')
+
+    if not isinstance(extensions, dict):
+        return None
+
+    persisted_query = extensions.get('persistedQuery')
+
+    if not isinstance(persisted_query, dict):
+        return None
+
+    return persisted_query.get('sha256Hash')
+
+
+def execute_cached(
+    schema,
+    query_str = None,
+    hash_str = None,
+    context_value = None,
+    variable_values = None,
+    middleware = None,
+    document_cache = DOCUMENT_CACHE):
+    """
+    Executes a GraphQL query given either by its string or by its persisted query hash, getting its parsed
+    and validated document from the cache, with results equivalent to the ones of schema.execute().
+    """
+
+    document, error_list = (
+
+        document_cache.get_document(
+            schema, query_str, hash_str))
+
+    if error_list:
+
+        return (
+            ExecutionResult(errors = error_list, invalid = True))
+
+    try:
+
+        return (
+
+            execute(
+                schema,
+                document,
+                context_value = context_value,
+                variable_values = variable_values,
+                middleware = middleware))
+
+    except Exception as exception:
+
+        return (
+            ExecutionResult(errors = [exception], invalid = True))
@@ -120,6 +120,12 @@ def gql_phonology(request, locale_id, args):
 
         args.get_pd_names(locale_id)
 
+        args.process_count = (
+            request.registry.settings['phonology']['process_count'])
+
+        args.pitch_process_count = (
+            request.registry.settings['phonology']['pitch_process_count'])
+
         # Phonology task status setup.
 
         client_id = request.authenticated_userid
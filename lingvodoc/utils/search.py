@@ -1,20 +1,35 @@
+import collections
 import errno
+import itertools
 import json
+import logging
+import re
+import tempfile
+import threading
+import time
 import urllib
 import os
+import uuid
 import pympi
 from pathvalidate import sanitize_filename
-from sqlalchemy import and_
-from sqlalchemy.orm import aliased
+from sqlalchemy import and_, event, or_, tuple_
+import sqlalchemy.dialects.postgresql as postgresql
+from sqlalchemy.orm import aliased, Session
+
+import lingvodoc.cache.caching as caching
 
 from lingvodoc.models import (
     TranslationAtom as dbTranslationAtom,
     TranslationGist as dbTranslationGist,
+    Dictionary as dbDictionary,
+    DictionaryPerspective as dbPerspective,
     LexicalEntry as dbLexicalEntry,
     Entity as dbEntity,
     PublishingEntity as dbPublishingEntity,
     Field as dbField,
     DBSession,
+    eaf_index_entity,
+    eaf_index_word,
     ENGLISH_LOCALE
 )
 
@@ -23,6 +38,10 @@ from lingvodoc.utils.static_fields import fields_static
 #from lingvodoc.views.v2.translations import translationgist_contents
 
 
+# Setting up logging.
+log = logging.getLogger(__name__)
+
+
 def translation_gist_search(searchstring, session=DBSession, gist_type='Service'):
     return (
         session
@@ -182,6 +201,430 @@ def eaf_words(eaf_obj):
     return annotations
 
 
+def eaf_annotations(eaf_obj):
+    """
+    Returns tier annotations of an EAF file as a list of (tier, value, begin, end) tuples with lowercased
+    tier names and values, as in eaf_words(), and annotation time intervals in milliseconds, or None if
+    unknown; annotations of referring tiers get time intervals of annotations they refer to.
+    """
+
+    def interval(tier_id, annotation_id, depth = 0):
+
+        aligned_dict, reference_dict = eaf_obj.tiers[tier_id][:2]
+
+        if annotation_id in aligned_dict:
+
+            begin_ts, end_ts = aligned_dict[annotation_id][:2]
+
+            return (
+                eaf_obj.timeslots.get(begin_ts),
+                eaf_obj.timeslots.get(end_ts))
+
+        if annotation_id in reference_dict and depth < 16:
+
+            ref_id = reference_dict[annotation_id][0]
+            ref_tier_id = eaf_obj.annotations.get(ref_id)
+
+            if ref_tier_id in eaf_obj.tiers:
+                return interval(ref_tier_id, ref_id, depth + 1)
+
+        return None, None
+
+    annotation_list = []
+
+    for tier_id, (aligned_dict, reference_dict, *_) in eaf_obj.tiers.items():
+
+        value_iter = (
+
+            [(annotation_id, value)
+                for annotation_id, (_, _, value, *_) in aligned_dict.items()] +
+
+            [(annotation_id, value)
+                for annotation_id, (_, value, *_) in reference_dict.items()])
+
+        for annotation_id, value in value_iter:
+
+            if not value or not value.strip():
+                continue
+
+            begin, end = interval(tier_id, annotation_id)
+
+            annotation_list.append(
+                (tier_id.lower(), value.strip().lower(), begin, end))
+
+    return annotation_list
+
+
+def eaf_index_update(eaf_list, storage, storage_f):
+    """
+    Indexes tier annotations of EAF markup entities given as (client_id, object_id, url) tuples, see
+    eaf_index_entity and eaf_index_word tables; entities whose EAF files can't be read or parsed are
+    indexed with error flag set.
+
+    Returns number of indexed entities.
+    """
+
+    index_count = 0
+
+    for client_id, object_id, url in eaf_list:
+
+        try:
+
+            with storage_f(storage, url) as eaf_file:
+                content = eaf_file.read()
+
+            with tempfile.NamedTemporaryFile() as temp_file:
+
+                temp_file.write(content)
+                temp_file.flush()
+
+                eaf_obj = (
+                    pympi.Eaf(file_path = temp_file.name))
+
+            annotation_list = eaf_annotations(eaf_obj)
+            error_flag = False
+
+        except Exception as exception:
+
+            log.warning(
+                'failed to index EAF entity {}/{} {}: {}'.format(
+                    client_id, object_id, repr(url), repr(exception)))
+
+            annotation_list = []
+            error_flag = True
+
+        # Skipping entities concurrently indexed by another search.
+
+        insert_result = (
+
+            DBSession.execute(
+
+                postgresql.insert(eaf_index_entity)
+
+                    .values(
+                        client_id = client_id,
+                        object_id = object_id,
+                        error = error_flag)
+
+                    .on_conflict_do_nothing()
+
+                    .returning(
+                        eaf_index_entity.c.client_id)))
+
+        if insert_result.first() is None:
+            continue
+
+        if annotation_list:
+
+            DBSession.execute(
+                eaf_index_word.insert(),
+
+                [{'client_id': client_id,
+                    'object_id': object_id,
+                    'tier': tier,
+                    'token': token,
+                    'time_begin': begin,
+                    'time_end': end}
+
+                    for tier, token, begin, end in annotation_list])
+
+        index_count += 1
+
+    return index_count
+
+
+eaf_regexp_re = re.compile(r'[.^$*+?{}\[\]\\|()]')
+
+# EAF search query grammar the index prefilter knows about: compound conditions of the form
+# {'type': 'and' | 'or', 'value': [...]} and positive match conditions of the form
+# {'type': 'tier' | 'annotation', 'value': '...'}, see eaf_index_pattern_list().
+
+eaf_query_compound_type_set = {'and', 'or'}
+eaf_query_match_type_set = {'tier', 'annotation'}
+
+eaf_query_key_set = {'type', 'value'}
+
+
+def eaf_index_pattern_list(search_query):
+    """
+    Gets lowercased words of string values of an EAF search query such that any EAF file matching the
+    query has at least one of them in its tier names or annotations.
+
+    Only queries consisting of known conditions, see eaf_query_compound_type_set and
+    eaf_query_match_type_set, are accepted. Returns None for anything else, e.g. for unknown condition
+    types or keys, negations and regular expressions, so that all EAF files are searched.
+    """
+
+    pattern_list = []
+
+    def f(query):
+
+        if (not isinstance(query, dict) or
+            not set(query.keys()) <= eaf_query_key_set):
+
+            return False
+
+        query_type = query.get('type')
+        value = query.get('value')
+
+        if query_type in eaf_query_compound_type_set:
+
+            return (
+                isinstance(value, list) and
+                len(value) > 0 and
+                all(f(subquery) for subquery in value))
+
+        if query_type in eaf_query_match_type_set:
+
+            if (not isinstance(value, str) or
+                eaf_regexp_re.search(value) or
+                not value.split()):
+
+                return False
+
+            pattern_list.extend(value.lower().split())
+            return True
+
+        return False
+
+    if not f(search_query) or not pattern_list:
+        return None
+
+    return pattern_list
+
+
+def eaf_index_candidate_set(eaf_id_query, pattern_list):
+    """
+    Selects EAF entities from the ones given by an id query which have any of the patterns in their tier
+    names or annotations, see eaf_index_pattern_list(), or which could not be indexed.
+    """
+
+    like_list = [
+        '%' + pattern.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        for pattern in pattern_list]
+
+    word_query = (
+
+        DBSession
+
+            .query(
+                eaf_index_word.c.client_id,
+                eaf_index_word.c.object_id)
+
+            .filter(
+
+                tuple_(
+                    eaf_index_word.c.client_id,
+                    eaf_index_word.c.object_id)
+
+                    .in_(eaf_id_query),
+
+                or_(*(
+                    column.like(like_str)
+                    for like_str in like_list
+                    for column in (eaf_index_word.c.token, eaf_index_word.c.tier)))))
+
+    error_query = (
+
+        DBSession
+
+            .query(
+                eaf_index_entity.c.client_id,
+                eaf_index_entity.c.object_id)
+
+            .filter(
+
+                tuple_(
+                    eaf_index_entity.c.client_id,
+                    eaf_index_entity.c.object_id)
+
+                    .in_(eaf_id_query),
+
+                eaf_index_entity.c.error == True))
+
+    return set(
+        tuple(row) for row in word_query.union(error_query).all())
+
+
+class Search_Result_Cache(object):
+    """
+    Cache of lexical entry id lists of search results keyed by search plan digests, see
+    lingvodoc.schema.gql_search.Search_Plan, with in-process LRU in front of the Redis cache.
+
+    Cached results expire after a short TTL and are valid for a generation identified by a token stored in
+    the cache, any change of dictionary data, see invalidate_search(), switches to a new generation after
+    commit.
+    """
+
+    generation_key = 'search_result_generation'
+    key_format_str = 'search_result:%s'
+
+    def __init__(self, size = 256, ttl = 300):
+
+        self.size = size
+        self.ttl = ttl
+
+        self.lock = threading.Lock()
+        self.result_dict = collections.OrderedDict()
+
+        # Used if we do not have a shared cache, e.g. with MockCache.
+
+        self.local_generation = str(uuid.uuid4())
+
+    def generation(self):
+        """
+        Gets current cached data generation token.
+        """
+
+        return (
+
+            caching.cache_generation(
+                self.generation_key,
+                self.local_generation))
+
+    def invalidate(self):
+        """
+        Switches to a new generation, invalidating all cached search results.
+        """
+
+        generation = str(uuid.uuid4())
+
+        with self.lock:
+
+            self.local_generation = generation
+            self.result_dict.clear()
+
+        if caching.CACHE is not None:
+
+            caching.CACHE.set(
+                key = self.generation_key,
+                value = generation)
+
+    def get(self, key, generation = None):
+        """
+        Gets cached lexical entry id list of search results, or None if we do not have valid one.
+        """
+
+        if generation is None:
+            generation = self.generation()
+
+        current_time = time.time()
+
+        with self.lock:
+
+            entry = self.result_dict.get(key)
+
+            if (entry is not None and
+                entry[0] == generation and
+                entry[1] + self.ttl > current_time):
+
+                self.result_dict.move_to_end(key)
+                return entry[2]
+
+        cache = caching.CACHE
+
+        entry = (
+            cache.get(self.key_format_str % key) if cache is not None else None)
+
+        if (entry is None or
+            entry[0] != generation or
+            entry[1] + self.ttl <= current_time):
+
+            return None
+
+        self.put_local(key, entry)
+
+        return entry[2]
+
+    def set(self, key, entry_id_list, generation = None):
+        """
+        Caches lexical entry id list of search results.
+
+        Results should be stored with the generation token gotten before the search, so that results of a
+        search overlapping with a data change are not valid after the change's commit.
+        """
+
+        entry = (
+            generation if generation is not None else self.generation(),
+            time.time(),
+            [tuple(entry_id) for entry_id in entry_id_list])
+
+        self.put_local(key, entry)
+
+        if caching.CACHE is not None:
+
+            caching.CACHE.set(
+                key = self.key_format_str % key,
+                value = entry,
+                ttl = self.ttl)
+
+    def put_local(self, key, entry):
+
+        if self.size <= 0:
+            return
+
+        with self.lock:
+
+            self.result_dict[key] = entry
+            self.result_dict.move_to_end(key)
+
+            while len(self.result_dict) > self.size:
+                self.result_dict.popitem(last = False)
+
+
+SEARCH_RESULT_CACHE = Search_Result_Cache()
+
+
+def invalidate_search(session = DBSession):
+    """
+    Marks dictionary data as changed, cached search results are invalidated after the session's
+    transaction is committed.
+
+    Changes made through the ORM are detected automatically, so it's only required after changes made
+    otherwise, e.g. with bulk Core inserts; otherwise such changes are visible in search results after
+    cached results expire.
+    """
+
+    session.info['search_data_changed'] = True
+
+
+search_invalidate_type_tuple = (
+    dbDictionary,
+    dbPerspective,
+    dbLexicalEntry,
+    dbEntity,
+    dbPublishingEntity)
+
+
+@event.listens_for(Session, 'after_flush')
+def search_after_flush(session, flush_context):
+    """
+    Detects changes of searchable dictionary data.
+    """
+
+    if session.info.get('search_data_changed'):
+        return
+
+    for instance in itertools.chain(
+        session.new, session.dirty, session.deleted):
+
+        if isinstance(instance, search_invalidate_type_tuple):
+
+            session.info['search_data_changed'] = True
+            return
+
+
+@event.listens_for(Session, 'after_commit')
+def search_after_commit(session):
+    """
+    Invalidates cached search results if searchable data was changed.
+    """
+
+    if session.info.pop('search_data_changed', False):
+        SEARCH_RESULT_CACHE.invalidate()
+
+
+
 # auxiliary function for filling simplified permissions. Gets python dictionary, Perspective object and a list of pairs
 # [("permission": boolean), ]
 def fulfill_permissions_on_perspectives(intermediate, perspective, pairs):
@@ -10,7 +10,9 @@ import itertools
 import json
 import logging
 import math
+import os
 import pprint
+import time
 import traceback
 
 from pyramid.httpexceptions import (
@@ -22,7 +24,7 @@ from pyramid.httpexceptions import (
 
 # External imports.
 
-import pylev
+import numpy
 
 from pyramid.request import Request
 from pyramid.security import authenticated_userid
@@ -77,6 +79,12 @@ from lingvodoc.acl import check_direct as acl_check_direct
 log = logging.getLogger(__name__)
 
 
+# Minimal number of distinct Levenshtein-comparable features of a field for which matching is performed in
+# parallel, if enabled, see match_fields().
+
+parallel_feature_count = 4096
+
+
 @view_config(route_name='merge_dictionaries', renderer='json', request_method='POST')
 def merge_dictionaries(request):  # TODO: test
     try:
@@ -637,10 +645,19 @@ def match_simple(entry_data_list, entity_type_primary, entity_type_secondary, th
         match_data_list, match_data_list, float(threshold), int(levenshtein))
 
 
-def match_fields(entry_data_list, field_selection_list, threshold):
+def match_fields(
+    entry_data_list,
+    field_selection_list,
+    threshold,
+    process_count = 1,
+    progress_f = None):
     """
     Matches lexical entries via a newer, more flexible algorithm (cf. match_simple).
 
+    If process_count is greater than 1, matching of Levenshtein-comparable features of sufficiently large
+    fields is split into chunks processed by a pool of processes, with partial match counts reduced as they
+    become available. If specified, progress_f is called with the fraction of processed chunks.
+
     Description of this algorithm follows.
 
     Each lexical entry L is transformed into a feature vector V(L) given fields F1, ..., Fn:
@@ -738,28 +755,6 @@ def match_fields(entry_data_list, field_selection_list, threshold):
             if maybe_field_data is not None:
                 maybe_field_data[1].append(entity_data)
 
-    # Memoized computation of Levenshtein distance.
-
-    levenshtein_cache = {}
-
-    def levenshtein(string_a, string_b):
-        """
-        Computes Levenshtein distances with memoization.
-        """
-
-        if string_a > string_b:
-            string_a, string_b = string_b, string_a
-
-        result = levenshtein_cache.get((string_a, string_b))
-
-        if result is not None:
-            return result
-
-        result = pylev.levenshtein(string_a, string_b)
-        levenshtein_cache[(string_a, string_b)] = result
-
-        return result
-
     # Processing entity data by fields and fields selections.
 
     count_dict = collections.Counter()
@@ -797,7 +792,7 @@ def match_fields(entry_data_list, field_selection_list, threshold):
             # Processing Levenshtein-comparable features.
 
             else:
-                limit = field_selection['levenshtein']
+                limit = int(field_selection['levenshtein'])
 
                 entry_feature_dict = collections.defaultdict(set)
                 feature_entry_dict = collections.defaultdict(set)
@@ -815,52 +810,61 @@ def match_fields(entry_data_list, field_selection_list, threshold):
                 log.debug('entry_feature_dict:\n' + pprint.pformat(entry_feature_dict))
                 log.debug('feature_entry_dict:\n' + pprint.pformat(feature_entry_dict))
 
-                # At the moment we have to compute N^2/2 Levenshtein distances. If such computations will be
-                # found too time consuming, we can try optimized Levenshtein distance computation with
-                # prefix sharing and lazy evaluations.
-
-                levenshtein_dict = collections.defaultdict(list)
                 feature_list = sorted(feature_entry_dict.keys())
 
-                for index, feature_a in enumerate(feature_list):
-                    for feature_b in feature_list[index + 1:]:
-
-                        if levenshtein(feature_a, feature_b) <= limit:
-                            levenshtein_dict[feature_a].append(feature_b)
+                entry_id_list_list = [
+                    sorted(feature_entry_dict[feature]) for feature in feature_list]
 
                 log.debug('feature_list:\n' + pprint.pformat(feature_list))
-                log.debug('levenshtein_dict:\n' + pprint.pformat(levenshtein_dict))
 
                 # Any match between features is a match between their corresponding entries. At first we
                 # process matches on equal features.
 
-                for feature in feature_list:
-                    entry_id_list = sorted(feature_entry_dict[feature])
-
+                for entry_id_list in entry_id_list_list:
                     for index, entry_id in enumerate(entry_id_list):
                         for other_id in entry_id_list[index + 1:]:
 
                             match_dict[(entry_id, other_id)] += 1
 
-                # Then we process matches on different, but sifficiently Levenshtein-similar, features.
+                # Then we process matches on different, but sufficiently Levenshtein-similar, features,
+                # instead of computing N^2/2 Levenshtein distances getting only pairs of features which can
+                # be close enough from an index, see merge_perspectives.edit_distance_pairs().
+
+                pool = (
+
+                    merge_perspectives.edit_distance_match_pool(
+                        process_count, feature_list, entry_id_list_list, limit)
+
+                    if (process_count > 1 and
+                        len(feature_list) >= parallel_feature_count) else
+
+                    None)
+
+                if pool is not None:
 
-                for feature, match_list in levenshtein_dict.items():
+                    chunk_size = (
+                        -(-len(feature_list) // (process_count * 4)))
 
-                    entry_id_set = feature_entry_dict[feature]
+                    range_list = [
+                        (start, min(start + chunk_size, len(feature_list)))
+                        for start in range(0, len(feature_list), chunk_size)]
 
-                    other_id_list = list(itertools.chain(
-                        *[feature_entry_dict[match] for match in match_list]))
+                    with pool:
 
-                    for entry_id in entry_id_set:
-                        for other_id in other_id_list:
+                        for index, match_counter in enumerate(
+                            pool.imap_unordered(
+                                merge_perspectives.edit_distance_match_range, range_list)):
 
-                            if entry_id == other_id:
-                                continue
+                            match_dict.update(match_counter)
 
-                            key = ((entry_id, other_id)
-                                if entry_id <= other_id else (other_id, entry_id))
+                            if progress_f is not None:
+                                progress_f((index + 1) / len(range_list))
 
-                            match_dict[key] += 1
+                else:
+
+                    match_dict.update(
+                        merge_perspectives.edit_distance_match_count(
+                            (feature_list, entry_id_list_list, limit, 0, None)))
 
     # Compiling and returning matching result.
 
@@ -881,96 +885,172 @@ def match_fields(entry_data_list, field_selection_list, threshold):
     return result_list
 
 
-def match_graph(match_result_list):
+def match_graph(match_result_list, perspective_id = None):
     """
-    Compiles lexical entry match graph based on results of lexical entry matching.
+    Compiles lexical entry match graph based on results of lexical entry matching, returns list of sets of
+    ids of lexical entries of its connected components, ordered by their least lexical entry ids.
+
+    Matching lexical entries are compacted into consecutive integer indices, then grouped via an array-based
+    union-find with union by size and path halving, so that there is no recursion, and total lexical entry
+    confidences and link confidences are computed via numpy bincount over arrays of match links.
     """
 
-    confidence_dict = collections.defaultdict(lambda: 0.0)
-    weight_dict = collections.defaultdict(lambda: 0.0)
-    adjacency_dict = collections.defaultdict(set)
+    if not match_result_list:
+        return []
 
-    def canonical_id_id_key(id_a, id_b):
-        return (id_a, id_b) if id_a <= id_b else (id_b, id_a)
+    perspective_str = (
+        '{0}/{1}'.format(*perspective_id) if perspective_id is not None else '-')
 
-    for id_a, id_b, confidence in match_result_list:
+    entry_id_list = sorted(set(
+        id
+        for id_a, id_b, confidence in match_result_list
+            for id in (id_a, id_b)))
 
-        # Building adjacency lists, total lexical entry confidence map and link confidence map.
+    entry_count = len(entry_id_list)
 
-        adjacency_dict[id_a].add(id_b)
-        adjacency_dict[id_b].add(id_a)
+    index_dict = {
+        entry_id: index
+        for index, entry_id in enumerate(entry_id_list)}
 
-        weight_dict[id_a] += confidence / 2
-        weight_dict[id_b] += confidence / 2
+    log.debug(
+        'merge_suggestions {0}: {1} matching entries'.format(
+            perspective_str, entry_count))
 
-        confidence_dict[canonical_id_id_key(id_a, id_b)] += confidence
+    # Arrays of match links, with link ends ordered, and total lexical entry confidence.
 
-    entry_id_list = sorted(adjacency_dict.keys())
+    index_a_array = numpy.fromiter(
+        (index_dict[id_a] for id_a, id_b, confidence in match_result_list),
+        dtype = numpy.int64, count = len(match_result_list))
 
-    log.debug(
-        'merge_suggestions {0}/{1}: {2} matching entries\n'.format(
-            perspective_client_id, perspective_object_id, len(entry_id_list)) +
-        pprint.pformat(entry_id_list))
+    index_b_array = numpy.fromiter(
+        (index_dict[id_b] for id_a, id_b, confidence in match_result_list),
+        dtype = numpy.int64, count = len(match_result_list))
+
+    confidence_array = numpy.fromiter(
+        (confidence for id_a, id_b, confidence in match_result_list),
+        dtype = numpy.float64, count = len(match_result_list))
+
+    index_a_array, index_b_array = (
+        numpy.minimum(index_a_array, index_b_array),
+        numpy.maximum(index_a_array, index_b_array))
+
+    weight_array = (
+        numpy.bincount(index_a_array, confidence_array / 2, entry_count) +
+        numpy.bincount(index_b_array, confidence_array / 2, entry_count))
+
+    # Distinct links with their total confidences, and numbers of distinct links of lexical entries.
+
+    link_array, link_inverse_array = numpy.unique(
+        index_a_array * entry_count + index_b_array, return_inverse = True)
+
+    link_confidence_array = numpy.bincount(
+        link_inverse_array, confidence_array, len(link_array))
+
+    link_a_array, link_b_array = numpy.divmod(link_array, entry_count)
+
+    degree_array = (
+        numpy.bincount(link_a_array, minlength = entry_count) +
+        numpy.bincount(link_b_array, minlength = entry_count))
+
+    # Grouping matching lexical entries via union-find.
+
+    parent_list = list(range(entry_count))
+    size_list = [1] * entry_count
+
+    def find(index):
+
+        while parent_list[index] != index:
+
+            parent_list[index] = parent_list[parent_list[index]]
+            index = parent_list[index]
 
-    # Grouping matching lexical entries via depth-first search.
+        return index
+
+    for index_a, index_b in zip(link_a_array.tolist(), link_b_array.tolist()):
+
+        root_a = find(index_a)
+        root_b = find(index_b)
+
+        if root_a == root_b:
+            continue
+
+        if size_list[root_a] < size_list[root_b]:
+            root_a, root_b = root_b, root_a
+
+        parent_list[root_b] = root_a
+        size_list[root_a] += size_list[root_b]
+
+    # Lexical entry indices are ordered same as their ids, so groups are ordered by their least ids.
 
     group_list = []
-    group_dict = {}
+    group_index_dict = {}
 
-    def df_search(lexical_entry_id, group_index):
+    group_index_list = []
 
-        if lexical_entry_id in group_dict:
-            return
+    for index in range(entry_count):
 
-        group_list[-1].add(lexical_entry_id)
-        group_dict[lexical_entry_id] = group_index
+        root = find(index)
+        group_index = group_index_dict.get(root)
 
-        for id in adjacency_dict[lexical_entry_id]:
-            df_search(id, group_index)
+        if group_index is None:
 
-    for lexical_entry_id in entry_id_list:
-        if lexical_entry_id not in group_dict:
+            group_index = len(group_list)
+            group_index_dict[root] = group_index
 
             group_list.append(set())
-            df_search(lexical_entry_id, len(group_list) - 1)
+
+        group_list[group_index].add(entry_id_list[index])
+        group_index_list.append(group_index)
 
     # Reporting lexical entry groups.
 
-    log.debug('merge_suggestions {0}/{1}: {2} match groups'.format(
-        perspective_client_id, perspective_object_id, len(group_list)))
+    log.debug('merge_suggestions {0}: {1} match groups'.format(
+        perspective_str, len(group_list)))
 
-    for group_index, group_set in enumerate(group_list):
+    if log.isEnabledFor(logging.DEBUG):
 
-        group_entry_list = list(sorted(
-            (entry_id, len(adjacency_dict[entry_id]), weight_dict[entry_id])
-                for entry_id in sorted(group_set)))
+        group_confidence_array = numpy.bincount(
+            numpy.array(group_index_list, dtype = numpy.int64)[link_a_array],
+            link_confidence_array,
+            len(group_list))
 
-        log.debug(
-            'group {0}, {1} lexical entries:\n'.format(group_index, len(group_set)) +
-            pprint.pformat(group_entry_list))
+        group_entry_dict = collections.defaultdict(list)
 
+        for index, group_index in enumerate(group_index_list):
 
-def merge_suggestions_compute(
-    request,
+            group_entry_dict[group_index].append(
+                (entry_id_list[index], int(degree_array[index]), float(weight_array[index])))
+
+        for group_index, group_set in enumerate(group_list):
+
+            log.debug(
+                'group {0}, {1} lexical entries, {2:.4f} total link confidence:\n'.format(
+                    group_index, len(group_set), group_confidence_array[group_index]) +
+                pprint.pformat(group_entry_dict[group_index]))
+
+    return group_list
+
+
+def merge_suggestions_match(
     perspective_client_id, perspective_object_id,
     algorithm,
     entity_type_primary, entity_type_secondary,
     threshold, levenshtein,
-    field_selection_list, locale_id):
-    """
-    Computes merge suggestions.
+    field_selection_list, locale_id,
+    process_count = 1,
+    task_status = None):
     """
+    Gets data of lexical entries of a perspective and matches them, see merge_suggestions_compute().
 
-    log.debug('merge_suggestions {0}/{1}'.format(
-        perspective_client_id, perspective_object_id))
-
-    # Checking if the user has sufficient permissions to perform suggested merges.
-
-    user_has_permissions = check_user_merge_permissions(
-        request, perspective_client_id, perspective_object_id)
+    Does not require a request, so can be run in a background task, in which case progress is reported via
+    the task status.
+    """
 
     # Getting data of the undeleted lexical entries of the perspective.
 
+    if task_status is not None:
+        task_status.set(1, 0, 'Getting lexical entries')
+
     lexical_entry_list = list(DBSession.query(LexicalEntry).filter_by(
         parent_client_id = perspective_client_id,
         parent_object_id = perspective_object_id,
@@ -981,7 +1061,7 @@ def merge_suggestions_compute(
         log.debug('merge_suggestions {0}/{1}: 0 lexical entries'.format(
             perspective_client_id, perspective_object_id))
 
-        return [], [], user_has_permissions
+        return [], []
 
     # Aggregated entity tracking without checking lexical entries' perspective.
 
@@ -1013,6 +1093,9 @@ def merge_suggestions_compute(
 
     # Matching lexical entries.
 
+    if task_status is not None:
+        task_status.set(2, 0, 'Matching lexical entries')
+
     if algorithm == 'simple':
 
         match_result_list = match_simple(entry_data_list,
@@ -1020,27 +1103,68 @@ def merge_suggestions_compute(
 
     else:
 
+        progress_f = None
+
+        if task_status is not None:
+
+            progress_f = (lambda fraction:
+                task_status.set(2, int(math.floor(fraction * 99)), 'Matching lexical entries'))
+
         match_result_list = match_fields(entry_data_list,
-            field_selection_list, threshold)
+            field_selection_list, threshold, process_count, progress_f)
 
     log.debug('merge_suggestions {0}/{1}: {2} matches'.format(
         perspective_client_id, perspective_object_id, len(match_result_list)))
 
-    return entry_data_list, match_result_list, user_has_permissions
+    return entry_data_list, match_result_list
 
 
-@view_config(
-    route_name = 'merge_suggestions',
-    renderer = 'json',
-    request_method = 'POST',
-    permission = 'view')
-def merge_suggestions(request):
+def merge_suggestions_compute(
+    request,
+    perspective_client_id, perspective_object_id,
+    algorithm,
+    entity_type_primary, entity_type_secondary,
+    threshold, levenshtein,
+    field_selection_list, locale_id,
+    process_count = None):
     """
-    Finds groups of mergeable lexical entries according to specified criteria.
+    Computes merge suggestions.
+
+    Number of processes used for matching, if not specified, is taken from the 'suggestions_process_count'
+    option of the 'merge' section of the config, with the default of 1, i.e. no parallel processing.
     """
 
-    perspective_client_id = request.matchdict.get('perspective_client_id')
-    perspective_object_id = request.matchdict.get('perspective_object_id')
+    log.debug('merge_suggestions {0}/{1}'.format(
+        perspective_client_id, perspective_object_id))
+
+    # Checking if the user has sufficient permissions to perform suggested merges.
+
+    user_has_permissions = check_user_merge_permissions(
+        request, perspective_client_id, perspective_object_id)
+
+    if process_count is None:
+
+        process_count = (
+            request.registry.settings.get('merge', {}).get('suggestions_process_count', 1))
+
+    entry_data_list, match_result_list = (
+
+        merge_suggestions_match(
+            perspective_client_id, perspective_object_id,
+            algorithm,
+            entity_type_primary, entity_type_secondary,
+            threshold, levenshtein,
+            field_selection_list, locale_id,
+            process_count))
+
+    return entry_data_list, match_result_list, user_has_permissions
+
+
+def merge_suggestions_options(request):
+    """
+    Gets merge suggestions options from a merge suggestions request, returns either (option dict, None) or
+    (None, error message).
+    """
 
     request_json = request.json
 
@@ -1048,7 +1172,7 @@ def merge_suggestions(request):
     threshold = request_json.get('threshold') or 0.1
 
     if algorithm not in set(['simple', 'fields']):
-        return {'error': message('Unknown entity matching algorithm \'{0}\'.'.format(algorithm))}
+        return None, message('Unknown entity matching algorithm \'{0}\'.'.format(algorithm))
 
     # Getting merge suggestions options.
 
@@ -1071,15 +1195,22 @@ def merge_suggestions(request):
 
     locale_id = int(request.cookies.get('locale_id') or 2)
 
-    # Computing merge suggestions.
-
-    entry_data_list, match_result_list, user_has_permissions = merge_suggestions_compute(
-        request,
-        perspective_client_id, perspective_object_id,
-        algorithm,
-        entity_type_primary, entity_type_secondary,
-        threshold, levenshtein,
-        field_selection_list, locale_id)
+    return {
+        'perspective_client_id': request.matchdict.get('perspective_client_id'),
+        'perspective_object_id': request.matchdict.get('perspective_object_id'),
+        'algorithm': algorithm,
+        'entity_type_primary': entity_type_primary,
+        'entity_type_secondary': entity_type_secondary,
+        'threshold': threshold,
+        'levenshtein': levenshtein,
+        'field_selection_list': field_selection_list,
+        'locale_id': locale_id}, None
+
+
+def merge_suggestions_result(entry_data_list, match_result_list, user_has_permissions):
+    """
+    Compiles merge suggestions result as returned by the 'merge_suggestions' route.
+    """
 
     if not match_result_list:
 
@@ -1109,6 +1240,175 @@ def merge_suggestions(request):
         'user_has_permissions': user_has_permissions}
 
 
+@view_config(
+    route_name = 'merge_suggestions',
+    renderer = 'json',
+    request_method = 'POST',
+    permission = 'view')
+def merge_suggestions(request):
+    """
+    Finds groups of mergeable lexical entries according to specified criteria.
+    """
+
+    option_dict, error_message = merge_suggestions_options(request)
+
+    if option_dict is None:
+        return {'error': error_message}
+
+    # Computing merge suggestions.
+
+    entry_data_list, match_result_list, user_has_permissions = merge_suggestions_compute(
+        request, **option_dict)
+
+    return merge_suggestions_result(
+        entry_data_list, match_result_list, user_has_permissions)
+
+
+def merge_suggestions_task_try(task_status, storage, user_has_permissions, option_dict, process_count):
+    """
+    Helper function for asynchronous background merge suggestions task.
+    """
+
+    try:
+
+        entry_data_list, match_result_list = (
+
+            merge_suggestions_match(
+                process_count = process_count,
+                task_status = task_status,
+                **option_dict))
+
+        result_dict = (
+
+            merge_suggestions_result(
+                entry_data_list, match_result_list, user_has_permissions))
+
+        # Saving merge suggestions as a JSON file in the storage.
+
+        cur_time = time.time()
+        storage_dir = os.path.join(storage['path'], 'merge_suggestions', str(cur_time))
+
+        os.makedirs(storage_dir, exist_ok = True)
+
+        file_name = 'merge_suggestions_{0}_{1}.json'.format(
+            option_dict['perspective_client_id'], option_dict['perspective_object_id'])
+
+        with open(os.path.join(storage_dir, file_name), 'w', encoding = 'utf-8') as result_file:
+            json.dump(result_dict, result_file, ensure_ascii = False, default = str)
+
+        result_url = ''.join([
+            storage['prefix'], storage['static_route'],
+            'merge_suggestions', '/', str(cur_time), '/', file_name])
+
+        task_status.set(2, 100, 'Finished', result_link = result_url)
+
+        return True, None
+
+    # If something is not right, we report it.
+
+    except Exception as exception:
+
+        traceback_string = ''.join(traceback.format_exception(
+            exception, exception, exception.__traceback__))[:-1]
+
+        log.debug('merge_suggestions_async: exception')
+        log.debug('\n' + traceback_string)
+
+        if task_status is not None:
+            task_status.set(2, 100, 'Finished (ERROR), external error')
+
+        return False, traceback_string
+
+
+@celery.task
+def merge_suggestions_task(
+    task_key, cache_kwargs, sqlalchemy_url, storage, user_has_permissions, option_dict, process_count):
+    """
+    Computes merge suggestions asynchronously.
+    """
+
+    engine = create_engine(sqlalchemy_url)
+    DBSession.configure(bind = engine)
+
+    initialize_cache(cache_kwargs)
+    task_status = TaskStatus.get_from_cache(task_key)
+
+    with manager:
+        try_ok, traceback_string = merge_suggestions_task_try(
+            task_status, storage, user_has_permissions, option_dict, process_count)
+
+    if not try_ok:
+
+        transaction.abort()
+
+        return {'error': message('\n' + traceback_string)}
+
+
+@view_config(
+    route_name = 'merge_suggestions_async',
+    renderer = 'json',
+    request_method = 'POST',
+    permission = 'view')
+def merge_suggestions_async(request):
+    """
+    Launches asynchronous background merge suggestions computation task, parameters are the same as of the
+    'merge_suggestions' route, suggestions are saved as a JSON file linked from the task status.
+    """
+
+    option_dict, error_message = merge_suggestions_options(request)
+
+    if option_dict is None:
+        return {'error': error_message}
+
+    client_id = request.authenticated_userid
+    user = Client.get_user_by_client_id(client_id) if client_id else None
+
+    if not user:
+        return {'error': message('Unrecognized client.')}
+
+    task_status = None
+
+    try:
+
+        user_has_permissions = check_user_merge_permissions(
+            request, option_dict['perspective_client_id'], option_dict['perspective_object_id'])
+
+        settings = request.registry.settings
+
+        task_status = TaskStatus(user.id, 'Merge suggestions',
+            'perspective {0}/{1}'.format(
+                option_dict['perspective_client_id'], option_dict['perspective_object_id']), 2)
+
+        merge_suggestions_task.delay(
+            task_status.key,
+            settings['cache_kwargs'],
+            settings['sqlalchemy.url'],
+            settings['storage'],
+            user_has_permissions,
+            option_dict,
+            settings.get('merge', {}).get('suggestions_process_count', 1))
+
+    # If something is not right, we report it.
+
+    except Exception as exception:
+
+        traceback_string = ''.join(traceback.format_exception(
+            exception, exception, exception.__traceback__))[:-1]
+
+        log.debug('merge_suggestions_async: exception')
+        log.debug('\n' + traceback_string)
+
+        if task_status is not None:
+            task_status.set(2, 100, 'Finished (ERROR), external error')
+
+        request.response.status = HTTPInternalServerError.code
+
+        return {'error': message('\n' + traceback_string)}
+
+    request.response.status = HTTPOk.code
+    return {'result': task_status.key}
+
+
 def build_merge_tree(entry):
     """
     Recursively builds merge tree of a 1st or 2nd version merged lexical entry, compiles merge authorship
@@ -4,12 +4,16 @@
 import base64
 import bisect
 import collections
+import concurrent.futures
 import configparser
+import contextlib
 import csv
 import datetime
 from errno import EEXIST
+import fcntl
 import glob
 import gzip
+import hashlib
 from hashlib import md5
 import io
 import itertools
@@ -28,6 +32,7 @@ import string
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import traceback
 import types
@@ -174,6 +179,30 @@ def get_kaiser_window(half_window_size):
     return (window_list, window_sum)
 
 
+#: Dictionary used for memoization of Kaiser window function computation as numpy arrays.
+kaiser_window_array_dict = dict()
+
+
+def get_kaiser_window_array(half_window_size):
+    """
+    Returns (2N + 1)-sample Kaiser window, where N is a half window size in samples, as a numpy array
+    together with the sum of its values.
+
+    Employs memoization.
+    """
+
+    if half_window_size in kaiser_window_array_dict:
+        return kaiser_window_array_dict[half_window_size]
+
+    window_list, window_sum = get_kaiser_window(half_window_size)
+
+    window_array = numpy.array(window_list)
+    window_array.flags.writeable = False
+
+    kaiser_window_array_dict[half_window_size] = (window_array, window_sum)
+    return (window_array, window_sum)
+
+
 #: Dictionary used for memoization of Gaussian window function computation.
 gaussian_window_dict = dict()
 
@@ -340,6 +369,200 @@ def compute_formants(sample_list, nyquist_frequency):
     return formant_list
 
 
+def burg_numpy(sample_array, coefficient_number):
+    """
+    Computes Linear Prediction coefficients via Burg method, same as burg(), using numpy.
+
+    Accepts either a 1-dimensional array of samples, or a 2-dimensional array of sample frames, in which
+    case coefficients of all frames are computed at once. Returns a0 value(s) and array(s) of coefficients.
+    """
+
+    sample_array = numpy.asarray(sample_array, dtype = numpy.float64)
+
+    single_flag = sample_array.ndim == 1
+
+    if single_flag:
+        sample_array = sample_array[numpy.newaxis, :]
+
+    frame_count, sample_count = sample_array.shape
+
+    a0 = (sample_array ** 2).sum(axis = 1) / sample_count
+
+    b1 = sample_array[:, :-1].copy()
+    b2 = sample_array[:, 1:].copy()
+
+    aa = numpy.zeros((frame_count, coefficient_number))
+    coefficient_array = numpy.zeros((frame_count, coefficient_number))
+
+    for i in range(coefficient_number):
+
+        length = sample_count - i - 1
+
+        numerator = (b1[:, :length] * b2[:, :length]).sum(axis = 1)
+        denominator = (b1[:, :length] ** 2 + b2[:, :length] ** 2).sum(axis = 1)
+
+        coefficient_array[:, i] = 2.0 * numerator / denominator
+        a0 *= 1.0 - coefficient_array[:, i] ** 2
+
+        if i > 0:
+
+            coefficient_array[:, :i] = (
+                aa[:, :i] - coefficient_array[:, i : i + 1] * aa[:, i - 1 :: -1][:, :i])
+
+        aa[:, : i + 1] = coefficient_array[:, : i + 1]
+
+        # In burg() updates of b1 and b2 use only their previous values, so they can be done at once.
+
+        length = sample_count - i - 2
+        factor = aa[:, i : i + 1]
+
+        b1_next = b1[:, :length] - factor * b2[:, :length]
+        b2_next = b2[:, 1 : length + 1] - factor * b1[:, 1 : length + 1]
+
+        b1[:, :length] = b1_next
+        b2[:, :length] = b2_next
+
+    if single_flag:
+        return a0[0], coefficient_array[0]
+
+    return a0, coefficient_array
+
+
+def compute_formants_numpy(sample_array, nyquist_frequency):
+    """
+    Computes formants of an audio sample, same as compute_formants(), using numpy.
+
+    Accepts either a 1-dimensional array of samples, or a 2-dimensional array of sample frames, in which
+    case formants of all frames are computed at once, with LPC coefficients, polynomial roots and root
+    refinement computed for all frames together. Returns array(s) of 5 lowest formants.
+    """
+
+    sample_array = numpy.asarray(sample_array, dtype = numpy.float64)
+
+    single_flag = sample_array.ndim == 1
+
+    if single_flag:
+        sample_array = sample_array[numpy.newaxis, :]
+
+    frame_count, sample_count = sample_array.shape
+
+    sample_array = sample_array * numpy.array(get_gaussian_window(sample_count))
+
+    with numpy.errstate(divide = 'ignore', invalid = 'ignore'):
+        a0, coefficient_array = burg_numpy(sample_array, 10)
+
+    # Frames without any signal have no formants, such frames are not computed at all.
+
+    formant_array = numpy.full((frame_count, 5), float(nyquist_frequency))
+
+    valid_array = numpy.isfinite(coefficient_array).all(axis = 1) & (coefficient_array[:, -1] != 0)
+    coefficient_array = coefficient_array[valid_array]
+
+    if not len(coefficient_array):
+        return formant_array[0] if single_flag else formant_array
+
+    # Roots of characteristic polynomials 1 - a[1] * x - ... - a[10] * x^10 as eigenvalues of rotated
+    # companion matrices, exactly as numpy.polynomial.Polynomial.roots() does it, but for all frames at
+    # once.
+
+    c_array = numpy.concatenate(
+        (numpy.ones((len(coefficient_array), 1)), -coefficient_array), axis = 1)
+
+    companion_array = numpy.zeros((len(coefficient_array), 10, 10))
+    companion_array[:, numpy.arange(1, 10), numpy.arange(9)] = 1.0
+    companion_array[:, :, -1] -= c_array[:, :-1] / c_array[:, -1:]
+
+    root_array = numpy.linalg.eigvals(companion_array[:, ::-1, ::-1]).astype(numpy.complex128)
+    root_array.sort(axis = 1)
+
+    # Refining all roots via Newton-Raphson iteration, each root until its polynomial value stops
+    # decreasing.
+
+    polynomial_array = c_array[:, ::-1]
+    derivative_array = polynomial_array[:, :-1] * numpy.arange(10, 0, -1)
+
+    def evaluate(c_array, value_array):
+
+        result_array = numpy.zeros_like(value_array)
+
+        for i in range(c_array.shape[1]):
+            result_array = result_array * value_array + c_array[:, i : i + 1]
+
+        return result_array
+
+    previous_array = root_array
+    previous_delta_array = numpy.abs(evaluate(polynomial_array, previous_array))
+
+    while True:
+
+        with numpy.errstate(divide = 'ignore', invalid = 'ignore'):
+
+            current_array = (
+                previous_array -
+                evaluate(polynomial_array, previous_array) / evaluate(derivative_array, previous_array))
+
+        current_delta_array = numpy.abs(evaluate(polynomial_array, current_array))
+
+        better_array = current_delta_array < previous_delta_array
+
+        if not better_array.any():
+            break
+
+        previous_array = numpy.where(better_array, current_array, previous_array)
+        previous_delta_array = numpy.where(better_array, current_delta_array, previous_delta_array)
+
+    # Same as in compute_formants(), if a refined root is complex, the next root is replaced by its complex
+    # conjugate, with a possible conjugate of the last root in an additional column.
+
+    previous_array = numpy.concatenate(
+        (previous_array, numpy.full((len(previous_array), 1), numpy.nan, dtype = numpy.complex128)),
+        axis = 1)
+
+    better_root_array = numpy.empty_like(previous_array)
+    skip_array = numpy.zeros(len(previous_array), dtype = bool)
+
+    for i in range(11):
+
+        better_root_array[:, i] = (
+
+            numpy.where(
+                skip_array,
+                numpy.conj(better_root_array[:, i - 1]),
+                previous_array[:, i]))
+
+        skip_array = ~skip_array & (previous_array[:, i].imag != 0)
+
+    # Moving all roots into the unit circle and looking at roots above the real line.
+
+    with numpy.errstate(divide = 'ignore', invalid = 'ignore'):
+
+        better_root_array = (
+
+            numpy.where(
+                numpy.abs(better_root_array) > 1.0,
+                1.0 / numpy.conj(better_root_array),
+                better_root_array))
+
+    frequency_array = (
+        numpy.abs(numpy.arctan2(better_root_array.imag, better_root_array.real)) *
+        nyquist_frequency / math.pi)
+
+    frequency_array[
+        numpy.isnan(frequency_array) |
+        (better_root_array.imag < 0) |
+        (frequency_array < 50) |
+        (frequency_array > nyquist_frequency - 50)] = numpy.inf
+
+    frequency_array.sort(axis = 1)
+    frequency_array = frequency_array[:, :5]
+
+    frequency_array[numpy.isinf(frequency_array)] = nyquist_frequency
+
+    formant_array[valid_array] = frequency_array
+
+    return formant_array[0] if single_flag else formant_array
+
+
 def pitch_path_finder(
         silenceThreshold,
         voicingThreshold,
@@ -450,7 +673,11 @@ def sound_into_pitch_frame(
         brent_ixmax, globalPeak,
         window, windowR, frame,
         ac, r, imax, localMean,
-        x1, dx, nx, ny, z, **rest):
+        x1, dx, nx, ny, z, zOffset = 0, **rest):
+    """
+    Sample index i is at z[channel][i - zOffset], so that z can be only the part of samples required for
+    some frames, see sound_into_pitch_mapped().
+    """
 
     leftSample = (t - x1) // dx
     rightSample = leftSample + 1
@@ -466,7 +693,7 @@ def sound_into_pitch_frame(
 
         localMean[channel] = 0.0
         for i in range(startSample, endSample + 1):
-            localMean[channel] += z[channel][i]
+            localMean[channel] += z[channel][i - zOffset]
         localMean[channel] /= 2 * nsamp_period
 
         '''
@@ -479,7 +706,7 @@ def sound_into_pitch_frame(
         assert endSample < nx
 
         for j in range(nsamp_window):
-            frame[channel][j] = (z[channel][j + startSample] - localMean[channel]) * window[j]
+            frame[channel][j] = (z[channel][j + startSample - zOffset] - localMean[channel]) * window[j]
         for j in range(nsamp_window, nsampFFT):
             frame[channel][j] = 0.0
 
@@ -619,30 +846,124 @@ def sound_into_pitch_frame(
 
 
 def sound_into_pitch(arg):
-    def f(arg, firstFrame, lastFrame, x1, dx, frames, **rest):
+    def f(arg, firstFrame, lastFrame, x1, dx, frames, frameOffset = 0, **rest):
         for iframe in range(firstFrame, lastFrame):
-            sound_into_pitch_frame(pitch_frame := frames[iframe],
+            sound_into_pitch_frame(pitch_frame := frames[iframe - frameOffset],
                                    t := x1 + iframe * dx,
                                    **arg, **(arg.get('sound')))
     f(arg, **arg, **(arg.get('pitch')))
 
 
+def sound_into_pitch_mapped(arg):
+    """
+    Computes pitch frames of a chunk in a worker process, getting samples from a memory-mapped file
+    instead of receiving them pickled, and returns computed frames.
+
+    In the argument, 'pitch' contains only the frames of the chunk, 'sound' instead of samples contains
+    path and shape of the memory-mapped sample array, and 'zRange' is the range of samples used by the
+    frames of the chunk.
+    """
+
+    sound = arg['sound']
+    start, stop = arg['zRange']
+
+    z_mapped = (
+
+        numpy.memmap(
+            sound['z_path'],
+            dtype = numpy.float64,
+            mode = 'r',
+            shape = sound['z_shape']))
+
+    # Frame computation accesses samples one by one, which is much faster with lists than with arrays, and
+    # we convert only the samples of the chunk.
+
+    z = z_mapped[:, start : stop].tolist()
+    del z_mapped
+
+    sound_into_pitch(
+        dict(arg, sound = dict(sound, z = z, zOffset = start)))
+
+    return arg['pitch']['frames']
+
+
+#: Persistent process pools for parallel computations by name, with their process counts, see
+#: get_process_pool().
+process_pool_dict = {}
+process_pool_lock = threading.Lock()
+
+
+def get_process_pool(name, process_count):
+    """
+    Returns named persistent process pool with specified number of worker processes, e.g. 'pitch' for
+    parallel pitch computation or 'phonology' for parallel sound analysis, creating it if required, or None
+    if we can't create it, e.g. in a daemonic process.
+    """
+
+    # Daemonic processes, e.g. workers of another pool, are not allowed to have children.
+
+    if multiprocessing.current_process().daemon:
+        return None
+
+    with process_pool_lock:
+
+        pool, pool_process_count = (
+            process_pool_dict.get(name, (None, None)))
+
+        if (pool is not None and
+            pool_process_count == process_count):
+
+            return pool
+
+        if pool is not None:
+
+            pool.terminate()
+            del process_pool_dict[name]
+
+        try:
+            pool = multiprocessing.Pool(process_count)
+
+        except AssertionError:
+
+            log.warning(
+                'failed to create \'{}\' process pool, falling back to single process computation'.format(
+                    name))
+
+            return None
+
+        process_pool_dict[name] = (pool, process_count)
+
+        return pool
+
+
 class AudioPraatLike(object):
     """
     Allows computations of sound intensity and formants using algorithms mimicking as close as possible
     corresponding algorithms of the Praat [http://www.fon.hum.uva.nl/praat] software.
     """
 
+    #: Default formant computation engine, either 'numpy', computing formants of multiple points at once via
+    #: compute_formants_numpy(), or 'python', computing them point by point via reference implementation
+    #: compute_formants().
+    default_formant_engine = 'numpy'
+
     def __init__(
         self,
         source_sound,
         args = None,
-        vowel_range_list = None):
+        vowel_range_list = None,
+        formant_engine = None):
 
         self.intensity_sound = source_sound
         self.args = args
         self.vowel_range_list = vowel_range_list
 
+        self.formant_engine = (
+            formant_engine or self.default_formant_engine)
+
+        if self.formant_engine not in ('numpy', 'python'):
+            raise ValueError('unknown formant engine \'{}\''.format(self.formant_engine))
+
         #
         # Praat's intensity window size is computed as 3.2/minimum_pitch (see http://www.fon.hum.uva.nl/
         # praat/manual/Sound__To_Intensity___.html), where standard minimum_pitch in Praat 6.0.04 in Ubuntu
@@ -668,6 +989,7 @@ class AudioPraatLike(object):
             math.floor((self.intensity_sound.frame_count() - 1) // self.intensity_step_size + 1))
 
         self.intensity_list = [None for i in range(self.intensity_step_count)]
+        self.intensity_init_flag = False
 
         self.fast_track_flag = (
             args and args.use_fast_track)
@@ -801,12 +1123,92 @@ class AudioPraatLike(object):
         self.intensity_list[step_index] = intensity
         return intensity
 
+    #: Number of intensity time steps processed at once during whole recording intensity computation,
+    #: bounds size of the temporary window matrix.
+    intensity_chunk_size = 256
+
+    def init_intensity(self):
+        """
+        Computes intensity at all time steps of the recording at once, with the same results as
+        get_intensity().
+        """
+
+        if self.intensity_init_flag:
+            return
+
+        channel_count = self.intensity_sound.channels
+        amplitude_limit = self.intensity_sound.max_possible_amplitude
+
+        # Summing squared normalized amplitudes of all channels for each frame.
+
+        sample_array = (
+
+            numpy.array(
+                self.intensity_sound.get_array_of_samples(),
+                dtype = numpy.float64))
+
+        frame_count = len(sample_array) // channel_count
+
+        energy_array = (
+
+            numpy.square(
+                sample_array[: frame_count * channel_count].reshape(frame_count, channel_count) /
+                    amplitude_limit)
+
+                .sum(axis = 1))
+
+        # Intensity at step k is computed from the window starting at the frame (k - 4) * step size, so
+        # for each of the valid steps from 4 to step count - 5 we take a strided window view and convolve
+        # it with the Kaiser window in chunks of steps.
+
+        step_from = 4
+        step_to = self.intensity_step_count - 4
+
+        if step_to <= step_from:
+
+            self.intensity_init_flag = True
+            return
+
+        window_array, window_sum = (
+            get_kaiser_window_array(self.intensity_half_window_size))
+
+        frame_window_array = (
+
+            numpy.lib.stride_tricks.sliding_window_view(
+                energy_array, self.intensity_window_size)
+
+                [: (step_to - step_from - 1) * self.intensity_step_size + 1 : self.intensity_step_size])
+
+        sum_array = (
+            numpy.empty(step_to - step_from))
+
+        for i in range(0, len(sum_array), self.intensity_chunk_size):
+
+            sum_array[i : i + self.intensity_chunk_size] = (
+                frame_window_array[i : i + self.intensity_chunk_size] @ window_array)
+
+        # Multiplication by 2.5e9 is taken directly from Praat source code, see get_intensity().
+
+        ratio_array = sum_array / (channel_count * window_sum) * 2.5e9
+
+        intensity_array = (
+
+            numpy.where(
+                ratio_array < 1e-30,
+                -300.0,
+                10 * numpy.log10(numpy.maximum(ratio_array, 1e-30))))
+
+        self.intensity_list[step_from : step_to] = intensity_array.tolist()
+        self.intensity_init_flag = True
+
     def get_interval_intensity(self, begin, end):
         """
         Computes mean-energy intensity, intensity maximum and intensity minimum of an interval specified by
         beginning and end in seconds.
         """
 
+        self.init_intensity()
+
         # Due to windowed nature of intensity computation, we can't compute it for points close to the
         # beginning and the end of the recording; such points are skipped.
 
@@ -1228,10 +1630,11 @@ class AudioPraatLike(object):
 
         formant_list = (
 
-            compute_formants(
+            (compute_formants_numpy if self.formant_engine == 'numpy' else compute_formants)(
                 sample_list, self.formant_frame_rate * 0.5))
 
-        self.formant_list[step_index] = formant_list[:3]
+        formant_list = list(formant_list[:3])
+        self.formant_list[step_index] = formant_list
 
         return formant_list[:3]
 
@@ -1288,13 +1691,82 @@ class AudioPraatLike(object):
 
         formant_list = (
 
-            compute_formants(
+            (compute_formants_numpy if self.formant_engine == 'numpy' else compute_formants)(
                 sample_list, self.formant_frame_rate_list[ft_index] * 0.5))
 
-        formant_list_list[step_index] = formant_list[:3]
+        formant_list = list(formant_list[:3])
+        formant_list_list[step_index] = formant_list
 
         return formant_list[:3]
 
+    def prepare_formants(self, step_index_list, ft_index = None):
+        """
+        Computes not yet computed point formant values at points specified by formant time step indices all
+        at once, if numpy formant engine is used, for the standard formant computation algorithm or, if
+        ft_index is specified, for the Fast Track algorithm.
+        """
+
+        if self.formant_engine != 'numpy':
+            return
+
+        if self.formant_list is None:
+            self.init_formant_f()
+
+        if ft_index is None:
+
+            formant_list = self.formant_list
+            formant_sample_list = self.formant_sample_list
+
+            step_shift = self.formant_step_shift
+            step_count = self.formant_step_count
+
+            step_size = self.formant_step_size
+            half_window_size = self.formant_half_window_size
+            window_size = self.formant_window_size
+
+            frame_rate = self.formant_frame_rate
+
+        else:
+
+            formant_list = self.formant_list_list[ft_index]
+            formant_sample_list = self.formant_sample_list_list[ft_index]
+
+            step_shift = self.formant_step_shift_list[ft_index]
+            step_count = self.formant_step_count_list[ft_index]
+
+            step_size = self.formant_step_size_list[ft_index]
+            half_window_size = self.formant_half_window_size_list[ft_index]
+            window_size = self.formant_window_size_list[ft_index]
+
+            frame_rate = self.formant_frame_rate_list[ft_index]
+
+        # Out of bounds step indices are left to get_formants() / get_formants_fast_track() to report.
+
+        step_index_list = [
+            step_index
+            for step_index in step_index_list
+            if step_shift <= step_index < step_count - step_shift and
+                formant_list[step_index] is None]
+
+        if not step_index_list:
+            return
+
+        sample_array = numpy.array([
+
+            formant_sample_list[
+                step_index * step_size - half_window_size :
+                step_index * step_size - half_window_size + window_size]
+
+            for step_index in step_index_list])
+
+        formant_array = (
+
+            compute_formants_numpy(
+                sample_array, frame_rate * 0.5))
+
+        for step_index, formant_row in zip(step_index_list, formant_array.tolist()):
+            formant_list[step_index] = formant_row[:3]
+
     def get_interval_formants(self, begin, end):
         """
         Computes first and second formants of an interval specified by beginning and end in seconds.
@@ -1331,6 +1803,9 @@ class AudioPraatLike(object):
 
             # Getting point formant values.
 
+            self.prepare_formants(
+                range(begin_step, end_step + 1))
+
             for step_index in range(begin_step, end_step + 1):
 
                 f1, f2, f3 = self.get_formants(step_index)
@@ -1382,6 +1857,9 @@ class AudioPraatLike(object):
                 ft_f2_list = []
                 ft_f3_list = []
 
+                self.prepare_formants(
+                    range(begin_step, end_step + 1), i)
+
                 for step_index in range(begin_step, end_step + 1):
 
                     f1, f2, f3 = self.get_formants_fast_track(i, step_index)
@@ -1557,11 +2035,19 @@ class AudioPraatLike(object):
             sum(f1_list) / len(f1_list), sum(f2_list) / len(f2_list), sum(f3_list) / len(f3_list)]
 
 
-    def get_pitch(self, begin=0, end=None):
+    def get_pitch(self, begin=0, end=None, process_count=None):
         """
         Computes pitches of an audio sample.
+
+        If the number of processes is not specified, it is taken from the 'pitch_process_count' parameter,
+        and with more then one process frame chunks are computed in parallel with the same results.
         """
 
+        if process_count is None:
+
+            process_count = (
+                self.args.pitch_process_count if self.args else 1)
+
         x1 = max(0, begin)
 
         if end is None:
@@ -1707,15 +2193,19 @@ class AudioPraatLike(object):
 
         brent_ixmax = math.floor(nsamp_window * interpolation_depth)
 
-        # Calculating threads number
+        # Calculating threads number. It does not depend on the number of processors or processes, as
+        # frames of a chunk are computed sequentially reusing the same buffers, so to get the same results
+        # regardless of the machine and of the parallel or serial computation we always split frames into
+        # chunks in the same way.
         numberOfFramesPerThread = 20
         numberOfThreads = (numberOfFrames - 1) // numberOfFramesPerThread + 1
-        numberOfProcessors = multiprocessing.cpu_count()
-        log.debug(f"{numberOfProcessors} processors")
-        numberOfThreads = min(numberOfThreads, numberOfProcessors)
         numberOfThreads = max(1, min(numberOfThreads, 16))
         numberOfFramesPerThread = (numberOfFrames - 1) // numberOfThreads + 1
 
+        pool = (
+            get_process_pool('pitch', process_count)
+                if process_count > 1 and numberOfThreads > 1 else None)
+
         firstFrame = 0
         lastFrame = numberOfFramesPerThread
         #cancelled = [False]
@@ -1763,15 +2253,62 @@ class AudioPraatLike(object):
             lastFrame += numberOfFramesPerThread
 
             # single-thread
-            sound_into_pitch(arg)
+            if pool is None:
+                sound_into_pitch(arg)
 
-        '''
-        # multi-thread
-        pool = multiprocessing.Pool(numberOfThreads)
-        pool.map(sound_into_pitch, args)
-        pool.close()
-        pool.join()
-        '''
+        # Multi-process, samples are shared with worker processes through a memory-mapped temporary file,
+        # and each worker gets only the frames of its chunk and sends back computed frames.
+        if pool is not None:
+
+            with tempfile.NamedTemporaryFile(suffix = '.z') as z_file:
+
+                z_mapped = numpy.memmap(
+                    z_file.name, dtype = numpy.float64, mode = 'w+', shape = (ny, nx))
+
+                z_mapped[:] = z
+                z_mapped.flush()
+                del z_mapped
+
+                mapped_sound = {
+                    key: value
+                    for key, value in sound.items()
+                    if key != 'z'}
+
+                mapped_sound['z_path'] = z_file.name
+                mapped_sound['z_shape'] = (ny, nx)
+
+                # Samples used by frames of a chunk, with frame sample indices computed same as in
+                # sound_into_pitch_frame() and a margin of a longest period and a window to both sides.
+
+                z_margin = int(nsamp_period + nsamp_window) + 2
+
+                def z_range(arg):
+
+                    left_first = (thee['x1'] + arg['firstFrame'] * thee['dx'] - x1) // dx
+                    left_last = (thee['x1'] + (arg['lastFrame'] - 1) * thee['dx'] - x1) // dx
+
+                    return (
+                        max(0, int(left_first) - z_margin),
+                        min(nx, int(left_last) + z_margin + 1))
+
+                mapped_args = [
+
+                    dict(
+                        arg,
+                        sound = mapped_sound,
+                        pitch = {
+                            'x1': thee['x1'],
+                            'dx': thee['dx'],
+                            'frames': thee['frames'][arg['firstFrame'] : arg['lastFrame']]},
+                        frameOffset = arg['firstFrame'],
+                        zRange = z_range(arg))
+
+                    for arg in args]
+
+                for arg, frame_list in zip(
+                    args, pool.map(sound_into_pitch_mapped, mapped_args)):
+
+                    thee['frames'][arg['firstFrame'] : arg['lastFrame']] = frame_list
 
         log.debug("Sound to Pitch: path finder - 95% complete")
         pitch_path_finder(silenceThreshold, voicingThreshold, octaveCost,
@@ -2540,9 +3077,377 @@ def process_sound(tier_data_list, sound, vowel_selection = None):
                     interval_data_list,
                     source_interval_list))
 
-    # Returning analysis results.
+    # Returning analysis results.
+
+    return textgrid_result_list
+
+
+class Acoustic_Cache(object):
+    """
+    Persistent cache of sound/markup analysis results shared by phonology, sound/markup iteration and
+    acoustic analysis.
+
+    Each entry is stored in its own gzipped pickle file named by SHA-256 hash of the cache key, which
+    identifies sound and markup entities, and of the cache version, in a directory sharded by the first
+    two hash digits, so that lookups and updates do not depend on the cache size and changing cache
+    version invalidates all previous entries.
+
+    Entries are written to temporary files and atomically renamed, so concurrent tasks never see partially
+    written entries and do not overwrite each other's results. Entry modification times are updated on
+    access, and on flush() least recently used entries are evicted if the cache exceeds its maximum size.
+
+    Total size of entry files is tracked in a size record file updated under a file lock on each entry
+    write or removal, so that checking if eviction is needed does not require listing the whole cache,
+    which is done only when the cache actually exceeds its maximum size. The record can drift on
+    concurrent replacements of the same entry, it is corrected by the listing on each eviction.
+    """
+
+    #: Default maximum total size of cache entry files in bytes.
+    default_max_size = 4 << 30
+
+    #: Name of the cache directory in the storage.
+    cache_dir_name = 'phonology_cache'
+
+    #: Name of the total entry size record file in the cache directory.
+    size_file_name = 'size'
+
+    def __init__(
+        self,
+        storage,
+        perspective_id = None,
+        debug_flag = False,
+        max_size = None):
+        """
+        Perspective id is accepted for compatibility and is not used, as entries are addressed by sound
+        and markup entities.
+        """
+
+        self.cache_dir = (
+            path.join(storage['path'], self.cache_dir_name))
+
+        self.max_size = (
+            self.default_max_size if max_size is None else max_size)
+
+        self.debug_flag = debug_flag
+
+        self.hit_count = 0
+        self.miss_count = 0
+        self.set_count = 0
+
+    def entry_path(self, cache_key):
+
+        hash_str = (
+
+            hashlib.sha256(
+                f'{cache_version}:{cache_key}'.encode('utf-8')).hexdigest())
+
+        return (
+            path.join(self.cache_dir, hash_str[:2], hash_str + '.pickle.gz'))
+
+    def get(self, cache_key):
+        """
+        Returns cached value, or None if it is absent or can't be read.
+        """
+
+        entry_path = self.entry_path(cache_key)
+
+        try:
+
+            with gzip.open(entry_path, 'rb') as entry_file:
+                cache_key_stored, value = pickle.load(entry_file)
+
+            # Checking for a hash collision, however improbable.
+
+            if cache_key_stored != cache_key:
+                raise ValueError(cache_key_stored)
+
+            os.utime(entry_path)
+
+        except FileNotFoundError:
+
+            self.miss_count += 1
+            return None
+
+        except Exception as exception:
+
+            log.warning(
+                'failed to read phonology cache entry {} \'{}\': {}'.format(
+                    entry_path, cache_key, repr(exception)))
+
+            self.miss_count += 1
+            return None
+
+        self.hit_count += 1
+        return value
+
+    def contains(self, cache_key):
+        """
+        Checks if there is a cache entry for a key without reading it, may be called from multiple threads.
+        """
+
+        return path.exists(self.entry_path(cache_key))
+
+    def set(self, cache_key, value):
+        """
+        Atomically writes cache entry.
+        """
+
+        entry_path = self.entry_path(cache_key)
+        entry_dir = path.dirname(entry_path)
+
+        makedirs(entry_dir, exist_ok = True)
+
+        file_descriptor, temp_path = (
+            tempfile.mkstemp(dir = entry_dir, prefix = '.', suffix = '.tmp'))
+
+        try:
+
+            with os.fdopen(file_descriptor, 'wb') as temp_file:
+
+                with gzip.GzipFile(fileobj = temp_file, mode = 'wb') as entry_file:
+                    pickle.dump((cache_key, value), entry_file)
+
+                size = temp_file.tell()
+
+            previous_size = self.entry_size(entry_path)
+
+            os.replace(temp_path, entry_path)
+
+        except:
+
+            try:
+                os.remove(temp_path)
+
+            except OSError:
+                pass
+
+            raise
+
+        self.set_count += 1
+
+        self.update_size(size - previous_size)
+
+    def delete(self, cache_key):
+
+        entry_path = self.entry_path(cache_key)
+        size = self.entry_size(entry_path)
+
+        try:
+            os.remove(entry_path)
+
+        except FileNotFoundError:
+            return
+
+        self.update_size(-size)
+
+    @staticmethod
+    def entry_size(entry_path):
+        """
+        Returns size of an entry file, or 0 if there is no such file.
+        """
+
+        try:
+            return os.stat(entry_path).st_size
+
+        except FileNotFoundError:
+            return 0
+
+    @contextlib.contextmanager
+    def size_record(self):
+        """
+        Opens and exclusively locks the total entry size record file.
+        """
+
+        makedirs(self.cache_dir, exist_ok = True)
+
+        with open(path.join(self.cache_dir, self.size_file_name), 'a+') as size_file:
+
+            fcntl.flock(size_file, fcntl.LOCK_EX)
+
+            try:
+                yield size_file
+
+            finally:
+                fcntl.flock(size_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def read_size(size_file):
+        """
+        Reads total entry size from a locked size record file, returns None if there is no valid record.
+        """
+
+        size_file.seek(0)
+
+        try:
+            return int(size_file.read())
+
+        except ValueError:
+            return None
+
+    @staticmethod
+    def write_size(size_file, total_size):
+
+        size_file.seek(0)
+        size_file.truncate()
+
+        size_file.write(str(total_size))
+        size_file.flush()
+
+    def update_size(self, delta):
+        """
+        Changes recorded total entry size, returns the updated size.
+        """
+
+        with self.size_record() as size_file:
+
+            total_size = self.read_size(size_file)
+
+            # No size record, e.g. for a cache created before records were introduced, so we compute it once,
+            # the listing already accounting for the change.
+
+            if total_size is None:
+
+                total_size = (
+                    sum(size for _, _, size in self.scan()))
+
+            else:
+
+                total_size = max(total_size + delta, 0)
+
+            self.write_size(size_file, total_size)
+
+        return total_size
+
+    def items(self):
+        """
+        Iterates over all readable cache entries of the current cache version, yielding keys and values.
+        """
+
+        for entry_path, _, _ in self.scan():
+
+            try:
+
+                with gzip.open(entry_path, 'rb') as entry_file:
+                    cache_key, value = pickle.load(entry_file)
+
+            except Exception:
+                continue
+
+            if self.entry_path(cache_key) == entry_path:
+                yield cache_key, value
+
+    def scan(self):
+        """
+        Lists cache entry files with their modification times and sizes.
+        """
+
+        entry_list = []
+
+        try:
+            shard_list = list(os.scandir(self.cache_dir))
+
+        except FileNotFoundError:
+            return entry_list
+
+        for shard in shard_list:
+
+            if not shard.is_dir():
+                continue
+
+            for entry in os.scandir(shard.path):
+
+                if not entry.name.endswith('.pickle.gz'):
+                    continue
+
+                try:
+                    stat = entry.stat()
+
+                except FileNotFoundError:
+                    continue
+
+                entry_list.append(
+                    (entry.path, stat.st_mtime, stat.st_size))
+
+        return entry_list
+
+    def evict(self):
+        """
+        If the cache is larger than its maximum size, removes least recently used entries until it fits
+        into 90% of the maximum size.
+
+        Cache size is checked via the size record, with the cache listed only if the record exceeds the
+        maximum size or is absent, in which case the record is updated with the actual size.
+
+        Returns number of removed entries.
+        """
+
+        with self.size_record() as size_file:
+
+            total_size = self.read_size(size_file)
+
+            if (total_size is not None and
+                total_size <= self.max_size):
+
+                return 0
+
+            entry_list = self.scan()
+
+            total_size = (
+                sum(size for _, _, size in entry_list))
+
+            target_size = (
+                self.max_size * 0.9 if total_size > self.max_size else total_size)
+
+            entry_list.sort(key = lambda entry: entry[1])
+
+            remove_count = 0
+
+            for entry_path, _, size in entry_list:
+
+                if total_size <= target_size:
+                    break
+
+                try:
+                    os.remove(entry_path)
+
+                except FileNotFoundError:
+                    pass
+
+                total_size -= size
+                remove_count += 1
+
+            self.write_size(size_file, total_size)
+
+        return remove_count
+
+    def stats(self):
+        """
+        Returns hit / miss / set counts and hit rate of this cache instance.
+        """
+
+        total_count = self.hit_count + self.miss_count
+
+        return {
+            'hit_count': self.hit_count,
+            'miss_count': self.miss_count,
+            'set_count': self.set_count,
+            'hit_rate': self.hit_count / total_count if total_count else 0.0}
+
+    def flush(self):
+        """
+        Entries are written immediately, so we only log usage statistics and evict old entries, if
+        required.
+        """
 
-    return textgrid_result_list
+        remove_count = (
+            self.evict() if self.set_count > 0 else 0)
+
+        log.debug(
+            'phonology cache {}: {}, {} evicted'.format(
+                self.cache_dir, self.stats(), remove_count))
+
+        if self.debug_flag:
+            print(f'{self.cache_dir=}: {self.stats()}, {remove_count} evicted')
 
 
 def process_sound_markup(
@@ -4203,6 +5108,13 @@ class Phonology_Parameters(object):
     Stores phonology computation parameters.
     """
 
+    #: Number of processes used for pitch computation, set from phonology settings, see get_pitch().
+    pitch_process_count = 1
+
+    #: Number of processes used for parallel sound analysis, set from phonology settings, see
+    #: phonology_prefetch_iter().
+    process_count = 1
+
     def parse_keep_join_list(self, keep_list, join_list):
         """
         Checks if we are given a list of characters specified by their code points to keep in the vowel
@@ -4497,6 +5409,12 @@ def phonology(request):
 
         args.__debug_flag__ = False
 
+        args.process_count = (
+            request.registry.settings['phonology']['process_count'])
+
+        args.pitch_process_count = (
+            request.registry.settings['phonology']['pitch_process_count'])
+
         log.debug(
             'phonology {0}/{1}: {2}, {3}, {4}, {5}, {6}, {7}, {8}, {9}, {10}, {11}, {12}, {13}'.format(
                 args.perspective_cid, args.perspective_oid,
@@ -4618,6 +5536,287 @@ def async_phonology(args, task_key, cache_kwargs, storage, sqlalchemy_url):
             return {'error': 'external error'}
 
 
+class Sound_Markup_Data(object):
+    """
+    Gets and decodes data of a sound/markup pair, either when required or in advance in a prefetch thread,
+    see prefetch_iter().
+    """
+
+    def __init__(self, storage, sound_url, markup_url, storage_f = storage_file):
+
+        self.storage = storage
+        self.storage_f = storage_f
+
+        self.sound_url = sound_url
+        self.markup_url = markup_url
+
+        self.markup_bytes = None
+        self.textgrid = None
+        self.sound_bytes = None
+
+        self.swap_flag = False
+        self.exception = None
+
+        self.textgrid_result_list = None
+        self.analysis_exception = None
+
+    def fetch_markup(self):
+        """
+        Gets and parses TextGrid markup, checks if sound and markup files were swapped.
+        """
+
+        with self.storage_f(self.storage, self.markup_url) as markup_stream:
+            markup_bytes = markup_stream.read()
+
+        try:
+            textgrid = pympi.Praat.TextGrid(ifile = io.BytesIO(markup_bytes),
+                                            codec = chardet.detect(markup_bytes)['encoding'])
+
+        except:
+
+            # If we failed to parse TextGrid markup, we assume that sound and markup files were
+            # accidentally swapped and try again.
+
+            self.swap_flag = True
+            self.markup_url, self.sound_url = self.sound_url, self.markup_url
+
+            with self.storage_f(self.storage, self.markup_url) as markup_stream:
+                markup_bytes = markup_stream.read()
+
+            textgrid = pympi.Praat.TextGrid(ifile = io.BytesIO(markup_bytes),
+                                            codec = chardet.detect(markup_bytes)['encoding'])
+
+        self.markup_bytes = markup_bytes
+        self.textgrid = textgrid
+
+    def prefetch(self, sound_flag = True, analysis_f = None):
+        """
+        Gets markup and, optionally, sound data, saving exception, if any, to be re-raised on access.
+
+        If specified, analysis_f is then called to get sound analysis results in advance, with its
+        exception, if any, also saved to be re-raised later.
+        """
+
+        try:
+
+            self.fetch_markup()
+
+            if sound_flag:
+                self.get_sound_bytes()
+
+        except Exception as exception:
+
+            self.exception = exception
+            return self
+
+        if analysis_f is not None:
+
+            try:
+                self.textgrid_result_list = analysis_f(self)
+
+            except Exception as exception:
+                self.analysis_exception = exception
+
+        return self
+
+    def get_textgrid(self):
+
+        if self.exception is not None:
+            raise self.exception
+
+        if self.textgrid is None:
+            self.fetch_markup()
+
+        return self.textgrid
+
+    def get_sound_bytes(self):
+
+        if self.sound_bytes is None:
+
+            with self.storage_f(self.storage, self.sound_url) as sound_stream:
+                self.sound_bytes = sound_stream.read()
+
+        return self.sound_bytes
+
+
+def prefetch_iter(
+    item_iter,
+    data_f,
+    sound_flag = True,
+    analysis_f = None,
+    thread_count = 4,
+    prefetch_count = 16):
+    """
+    Iterates over items together with their sound/markup data, which is fetched and decoded in advance by
+    a bounded pool of threads while previous items are processed, preserving item order.
+
+    Sound/markup data objects are created by data_f in the calling thread, it can return None for items
+    which do not need any data, e.g. which have cached analysis results. See Sound_Markup_Data.prefetch()
+    for analysis_f.
+    """
+
+    with concurrent.futures.ThreadPoolExecutor(thread_count) as executor:
+
+        future_deque = collections.deque()
+
+        try:
+
+            for item in item_iter:
+
+                data = data_f(item)
+
+                future_deque.append((
+                    item,
+                    data and executor.submit(data.prefetch, sound_flag, analysis_f)))
+
+                if len(future_deque) > prefetch_count:
+
+                    item, future = future_deque.popleft()
+                    yield item, future and future.result()
+
+            while future_deque:
+
+                item, future = future_deque.popleft()
+                yield item, future and future.result()
+
+        # Not waiting for data we are not going to use if the iteration is stopped early.
+
+        finally:
+
+            for item, future in future_deque:
+
+                if future:
+                    future.cancel()
+
+
+def sound_markup_cache_key(args, row):
+    """
+    Phonological analysis cache key of a sound/markup pair.
+    """
+
+    return (
+        f'{row.Sound.client_id}:'
+        f'{row.Sound.object_id}:'
+        f'{row.Markup.client_id}:'
+        f'{row.Markup.object_id}'
+        f'{"+ft" if args and args.use_fast_track else ""}')
+
+
+def sound_markup_data_f(args, storage, cache):
+    """
+    Returns function creating sound/markup data objects for prefetching in phonological analysis, skipping
+    sound/markup pairs with cached analysis results.
+    """
+
+    storage_f = (
+        as_storage_file if args.__debug_flag__ else storage_file)
+
+    def f(row):
+
+        if (not args.no_cache and
+            cache.contains(sound_markup_cache_key(args, row))):
+
+            return None
+
+        return (
+
+            Sound_Markup_Data(
+                storage, row.Sound.content, row.Markup.content, storage_f))
+
+    return f
+
+
+def analyze_sound_bytes(
+    sound_bytes,
+    extension,
+    tier_data_list,
+    vowel_range_list,
+    args):
+    """
+    Analyzes sound recording given by its data and its processed markup, used in worker processes of the
+    parallel phonology mode.
+    """
+
+    with tempfile.NamedTemporaryFile(suffix = extension) as temp_file:
+
+        temp_file.write(sound_bytes)
+        temp_file.flush()
+
+        sound = (
+
+            AudioPraatLike(
+                pydub.AudioSegment.from_file(temp_file.name),
+                args,
+                vowel_range_list if args.interval_only else None))
+
+    return (
+        process_sound(tier_data_list, sound, args.vowel_selection))
+
+
+def sound_analysis_f(args, pool):
+    """
+    Returns function performing sound analysis of sound/markup data in a process pool, see
+    Sound_Markup_Data.prefetch().
+    """
+
+    def f(sound_markup_data):
+
+        tier_data_list, vowel_flag, vowel_range_list = (
+
+            process_textgrid(
+                sound_markup_data.textgrid,
+                interval_only = args.interval_only))
+
+        if not vowel_flag:
+            return None
+
+        extension = path.splitext(
+            urllib.parse.urlparse(sound_markup_data.sound_url).path)[1]
+
+        return (
+
+            pool.apply(
+                analyze_sound_bytes,
+                (sound_markup_data.get_sound_bytes(),
+                    extension,
+                    tier_data_list,
+                    vowel_range_list,
+                    args)))
+
+    return f
+
+
+def phonology_prefetch_iter(row_iter, args, storage, cache):
+    """
+    Iterates over sound/markup rows with their prefetched data for phonological analysis.
+
+    If parallel phonology is enabled via 'process_count' parameter, also analyzes sounds in advance in the
+    'phonology' process pool, with the number of prefetching threads enough to keep all processes busy.
+    """
+
+    data_f = (
+        sound_markup_data_f(args, storage, cache))
+
+    pool = (
+        get_process_pool('phonology', args.process_count)
+            if args.process_count > 1 else None)
+
+    if pool is None:
+
+        return (
+            prefetch_iter(row_iter, data_f))
+
+    return (
+
+        prefetch_iter(
+            row_iter,
+            data_f,
+            sound_flag = False,
+            analysis_f = sound_analysis_f(args, pool),
+            thread_count = max(4, args.process_count),
+            prefetch_count = max(16, args.process_count * 2)))
+
+
 def analyze_sound_markup(
     args,
     task_status,
@@ -4631,9 +5830,11 @@ def analyze_sound_markup(
     row_str,
     text_list,
     fails_dict,
-    cache):
+    cache,
+    sound_markup_data = None):
     """
-    Performs phonological analysis of a single sound/markup pair.
+    Performs phonological analysis of a single sound/markup pair, possibly with its already prefetched
+    data.
     """
 
     markup_url = row.Markup.content
@@ -4642,11 +5843,7 @@ def analyze_sound_markup(
     warn_msg = ""
 
     cache_key = (
-        f'{row.Sound.client_id}:'
-        f'{row.Sound.object_id}:'
-        f'{row.Markup.client_id}:'
-        f'{row.Markup.object_id}'
-        f'{"+ft" if args and args.use_fast_track else ""}')
+        sound_markup_cache_key(args, row))
 
     fails_dict[row_str] = {
         'urls': f"sound_url: {sound_url}\nmarkup_url: {markup_url}",
@@ -4754,43 +5951,39 @@ def analyze_sound_markup(
 
     try:
 
-        storage_f = (
-            as_storage_file if args.__debug_flag__ else storage_file)
+        if sound_markup_data is None:
 
-        # Getting markup, checking for each tier if it needs to be processed.
-        # !! markup_stream has <class 'http.client.HTTPResponse'> type
-        with storage_f(storage, markup_url) as markup_stream:
-            markup_bytes = markup_stream.read()
+            storage_f = (
+                as_storage_file if args.__debug_flag__ else storage_file)
 
-            if args.__debug_flag__:
+            sound_markup_data = (
+                Sound_Markup_Data(storage, sound_url, markup_url, storage_f))
 
-                with open('__markup__.TextGrid', 'wb') as markup_file:
-                    copyfileobj(markup_stream, markup_file)
+        # Getting markup, checking for each tier if it needs to be processed, checking if sound and markup
+        # were swapped.
 
         try:
-            textgrid = pympi.Praat.TextGrid(ifile = io.BytesIO(markup_bytes),
-                                            codec = chardet.detect(markup_bytes)['encoding'])
+            textgrid = sound_markup_data.get_textgrid()
+
         except:
 
-            try:
-                # If we failed to parse TextGrid markup, we assume that sound and markup files were
-                # accidentally swapped and try again.
+            if sound_markup_data.swap_flag:
+                err_msg += "ERROR: Sound-markup swap failed.\n"
 
-                markup_url, sound_url = sound_url, markup_url
+            raise
 
-                with storage_f(storage, markup_url) as markup_stream:
-                    markup_bytes = markup_stream.read()
+        markup_url = sound_markup_data.markup_url
+        sound_url = sound_markup_data.sound_url
 
-                textgrid = pympi.Praat.TextGrid(ifile = io.BytesIO(markup_bytes),
-                                                codec = chardet.detect(markup_bytes)['encoding'])
+        if sound_markup_data.swap_flag:
 
-                # Parsed sound as markup and markup as sound and succeeded.
-                warn_msg += "WARNING: Sound-markup swap occurred.\n"
+            # Parsed sound as markup and markup as sound and succeeded.
+            warn_msg += "WARNING: Sound-markup swap occurred.\n"
 
-            except Exception as e:
+        if args.__debug_flag__:
 
-                err_msg += "ERROR: Sound-markup swap failed.\n"
-                raise e
+            with open('__markup__.TextGrid', 'wb') as markup_file:
+                markup_file.write(sound_markup_data.markup_bytes)
 
         # Some helper functions.
 
@@ -4852,28 +6045,36 @@ def analyze_sound_markup(
                 '\nvowel_range_list:\n' +
                 pprint.pformat(vowel_range_list, width = 108))
 
-        # Otherwise we retrieve the sound file and analyze each vowel-containing markup.
+        # Otherwise we retrieve the sound file and analyze each vowel-containing markup, unless it was
+        # already analyzed in parallel.
         # Partially inspired by source code at scripts/convert_five_tiers.py:307.
 
-        extension = path.splitext(
-            urllib.parse.urlparse(sound_url).path)[1]
+        if sound_markup_data.analysis_exception is not None:
+            raise sound_markup_data.analysis_exception
 
-        sound = None
-        with tempfile.NamedTemporaryFile(suffix = extension, delete = (not args.__debug_flag__)) as temp_file:
+        elif sound_markup_data.textgrid_result_list is not None:
+            textgrid_result_list = sound_markup_data.textgrid_result_list
 
-            with storage_f(storage, sound_url) as sound_stream:
-                temp_file.write(sound_stream.read())
+        else:
+
+            extension = path.splitext(
+                urllib.parse.urlparse(sound_url).path)[1]
+
+            sound = None
+            with tempfile.NamedTemporaryFile(suffix = extension, delete = (not args.__debug_flag__)) as temp_file:
+
+                temp_file.write(sound_markup_data.get_sound_bytes())
                 temp_file.flush()
 
-            sound = (
+                sound = (
 
-                AudioPraatLike(
-                    pydub.AudioSegment.from_file(temp_file.name),
-                    args,
-                    vowel_range_list if args.interval_only else None))
+                    AudioPraatLike(
+                        pydub.AudioSegment.from_file(temp_file.name),
+                        args,
+                        vowel_range_list if args.interval_only else None))
 
-        textgrid_result_list = (
-            process_sound(tier_data_list, sound, args.vowel_selection))
+            textgrid_result_list = (
+                process_sound(tier_data_list, sound, args.vowel_selection))
 
         cache.set(cache_key, textgrid_result_list)
 
@@ -5135,16 +6336,18 @@ def perform_phonology(args, task_status, storage):
 
     result_group_set = set()
 
-    '''
-    Cache initializing
-    '''
-    cache = PickleCache(storage, (args.perspective_cid, args.perspective_oid))
+    # Sound/markup analysis results cache, shared with linked perspectives processing.
+
+    cache = Acoustic_Cache(storage)
 
-    # Skipping automatic markup, if required.
+    # Skipping automatic markup, if required, prefetching sound/markup data.
 
-    for index, row in enumerate(row
+    row_iter = (row
         for row in data_query.yield_per(100)
-        if args.use_automatic_markup or 'amr' not in row.Markup.additional_metadata):
+        if args.use_automatic_markup or 'amr' not in row.Markup.additional_metadata)
+
+    for index, (row, sound_markup_data) in enumerate(
+        phonology_prefetch_iter(row_iter, args, storage, cache)):
 
         text_list = ([] if not text_field else
             [text for text in row[3] if text])
@@ -5171,7 +6374,8 @@ def perform_phonology(args, task_status, storage):
                 index, row, row_str,
                 text_list,
                 fails_dict,
-                cache))
+                cache,
+                sound_markup_data))
 
         # If we had cache processing error, we terminate.
 
@@ -5216,11 +6420,6 @@ def perform_phonology(args, task_status, storage):
         if break_flag:
             break
 
-    '''
-    Writing cache to file if there is any change
-    '''
-    cache.flush()
-
     log.debug(
         'phonology {}/{}: {} result{}, {} no vowels, {} exceptions, {:.3f}s elapsed time'.format(
             args.perspective_cid,
@@ -5234,7 +6433,6 @@ def perform_phonology(args, task_status, storage):
     # We also process data linked through specified link fields, if we have any.
 
     perspective_field_dict = {}
-    perspective_cache_dict = {}
 
     # Query for lexical entries of the source perspective with sound/markup data.
 
@@ -5418,17 +6616,14 @@ def perform_phonology(args, task_status, storage):
             state.exception_counter = 0
             state.no_vowel_counter = 0
 
-            '''
-            Cache initializing
-            '''
-            if not perspective_cache_dict.get(tuple(perspective_id)):
-                perspective_cache_dict[tuple(perspective_id)] = PickleCache(storage, perspective_id)
-
-            # Skipping automatic markup, if required.
+            # Skipping automatic markup, if required, prefetching sound/markup data.
 
-            for index, row in enumerate(row
+            row_iter = (row
                 for row in data_query.yield_per(100)
-                if args.use_automatic_markup or 'amr' not in row.Markup.additional_metadata):
+                if args.use_automatic_markup or 'amr' not in row.Markup.additional_metadata)
+
+            for index, (row, sound_markup_data) in enumerate(
+                phonology_prefetch_iter(row_iter, args, storage, cache)):
 
                 text_list = ([] if not text_field else
                     [text for text in row[7] if text])
@@ -5464,7 +6659,8 @@ def perform_phonology(args, task_status, storage):
                     index, row, row_str,
                     text_list,
                     fails_dict,
-                    perspective_cache_dict[tuple(perspective_id)])
+                    cache,
+                    sound_markup_data)
 
                 # If we had cache processing error, we terminate.
 
@@ -5522,11 +6718,7 @@ def perform_phonology(args, task_status, storage):
                     perspective_result_count, '' if perspective_result_count == 1 else 's',
                     state.no_vowel_counter, state.exception_counter))
 
-    '''
-    Writing cache to file if there is any change
-    '''
-    for cache in perspective_cache_dict.values():
-        cache.flush()
+    cache.flush()
 
     #for row in fails_dict.values(): print(row.get('errs'))
     #sys.stdout.flush()
@@ -5745,12 +6937,33 @@ class Sound_Markup_Iterator(object):
 
         self.markup_count = 0
 
-        '''
-        Cache initializing
-        '''
-        cache = PickleCache(self.storage, self.perspective_id)
+        cache = Acoustic_Cache(self.storage)
 
-        for index, row in enumerate(data_query.yield_per(100)):
+        def cache_key_f(row):
+
+            return (
+                f'{self.cache_key_str}:'
+                f'{row.Sound.client_id}:'
+                f'{row.Sound.object_id}:'
+                f'{row.Markup.client_id}:'
+                f'{row.Markup.object_id}')
+
+        # Prefetching markup of sound/markup pairs without cached results.
+
+        def data_f(row):
+
+            if cache.contains(cache_key_f(row)):
+                return None
+
+            return (
+
+                Sound_Markup_Data(
+                    self.storage, row.Sound.content, row.Markup.content))
+
+        for index, (row, sound_markup_data) in enumerate(
+
+            prefetch_iter(
+                data_query.yield_per(100), data_f, sound_flag = False)):
 
             self.markup_count += 1
             markup_url = row.Markup.content
@@ -5765,13 +6978,7 @@ class Sound_Markup_Iterator(object):
 
             # Checking if we have cached tier list for this pair of sound/markup.
 
-            cache_key = (
-                f'{self.cache_key_str}:'
-                f'{row.Sound.client_id}:'
-                f'{row.Sound.object_id}:'
-                f'{row.Markup.client_id}:'
-                f'{row.Markup.object_id}')
-
+            cache_key = cache_key_f(row)
             cache_result = cache.get(cache_key)
 
             if cache_result is not None:
@@ -5783,30 +6990,14 @@ class Sound_Markup_Iterator(object):
 
             try:
 
-                with urllib.request.urlopen(
-                    urllib.parse.quote(markup_url, safe = '/:')) as markup_stream:
+                if sound_markup_data is None:
 
-                    markup_bytes = markup_stream.read()
-
-                try:
-
-                    textgrid = pympi.Praat.TextGrid(ifile = io.BytesIO(markup_bytes),
-                                                    codec = chardet.detect(markup_bytes)['encoding'])
-
-                except:
-
-                    # If we failed to parse TextGrid markup, we assume that sound and markup files were
-                    # accidentally swapped and try again.
-
-                    markup_url = row.Sound.content
-
-                    with urllib.request.urlopen(
-                        urllib.parse.quote(markup_url, safe = '/:')) as markup_stream:
+                    sound_markup_data = (
 
-                        markup_bytes = markup_stream.read()
+                        Sound_Markup_Data(
+                            self.storage, row.Sound.content, markup_url))
 
-                    textgrid = pympi.Praat.TextGrid(ifile = io.BytesIO(markup_bytes),
-                                                    codec = chardet.detect(markup_bytes)['encoding'])
+                textgrid = sound_markup_data.get_textgrid()
 
                 result = self.process_sound_markup(row_str, textgrid)
                 cache.set(cache_key, result)
@@ -5821,9 +7012,6 @@ class Sound_Markup_Iterator(object):
                 log.debug('{0}: exception'.format(row_str))
                 log.debug(traceback_string)
 
-        '''
-        Writing cache to file if there is any change
-        '''
         cache.flush()
 
 
@@ -7095,39 +8283,29 @@ def cpu_time(reference_cpu_time = 0.0):
 
 def main_cache_delete_exceptions(args):
     """
-    Removes cached phonology exceptions from the redis cache.
+    Removes cached phonology exceptions from the phonology cache in the storage directory specified by the
+    first argument.
     """
 
-    storage_dir = path.join(storage['path'], 'phonology')
-    makedirs(storage_dir, exist_ok=True)
+    if not args:
 
-    cache_path_list = glob.iglob(path.join(storage_dir, '*_*.pickle.gz'))
+        print('Please specify storage directory.')
+        return
 
-    count = 0
-    for cache_path in cache_path_list:
-        try:
-            with gzip.open(cache_path, 'rb') as cache_file:
-                cache_result = pickle.load(cache_file)
+    cache = Acoustic_Cache({'path': args[0]})
 
-                if type(cache_result) is not dict:
-                    continue
+    count = 0
 
-        except (FileNotFoundError, OSError, EOFError, ValueError):
-            continue
+    for cache_key, cache_result in cache.items():
 
-        start_count = count
-        for cache_key, cache_block in cache_result.items():
-            if (isinstance(cache_block, tuple) and
-                    cache_block[0] == 'exception'):
+        if (isinstance(cache_result, tuple) and
+            cache_result[0] == 'exception'):
 
-                print(cache_block[1])
-                del cache_result[cache_key]
-                count += 1
-                print(cache_key)
+            print(cache_result[1])
+            print(cache_key)
 
-        if count > start_count:
-            with gzip.open(cache_path, 'wb') as cache_file:
-                pickle.dump(cache_object, cache_file)
+            cache.delete(cache_key)
+            count += 1
 
     print('{} cached exceptions removed'.format(count))
 
@@ -7472,54 +8650,3 @@ if __name__ == '__main__':
 
     else:
         print('Please specify command to execute.')
-
-
-# Read or write cache from/into pickle file
-
-class PickleCache(object):
-
-    def __init__(self, storage, perspective_id, debug_flag=False):
-
-        storage_dir = path.join(storage['path'], 'phonology')
-        pickle_path = path.join(storage_dir, f'{perspective_id[0]}_{perspective_id[1]}.pickle.gz')
-
-        if debug_flag:
-            print(f"{pickle_path=}")
-
-        makedirs(storage_dir, exist_ok=True)
-        init_flag = False
-
-        try:
-            with gzip.open(pickle_path, 'rb') as pickle_file:
-                cache_object = pickle.load(pickle_file)
-                if (type(cache_object) is not dict or
-                        '__version__' not in cache_object or
-                        cache_object['__version__'] < cache_version):
-                    init_flag = True
-
-        except (FileNotFoundError, OSError, EOFError, ValueError):
-            init_flag = True
-
-        if init_flag:
-            cache_object = {'__version__': cache_version}
-
-        self.pickle_path = pickle_path
-        self.cache_object = cache_object
-        self.init_flag = init_flag
-        self.dirty_flag = False
-        self.debug_flag = debug_flag
-
-    def get(self, cache_key):
-        return self.cache_object.get(cache_key)
-
-    def set(self, cache_key, input_data):
-        self.cache_object[cache_key] = input_data
-        self.dirty_flag = True
-
-    def flush(self):
-        if self.init_flag or self.dirty_flag:
-            with gzip.open(self.pickle_path, 'wb') as pickle_file:
-                pickle.dump(self.cache_object, pickle_file)
-
-            self.init_flag = False
-            self.dirty_flag = False
@@ -73,9 +73,13 @@ from lingvodoc.schema.gql_holders import (
 
 from sqlalchemy.orm.attributes import flag_modified
 
-from lingvodoc.schema.query import schema, Context
+from lingvodoc.schema.query import schema, Context, loader_middleware_manager
 
 from lingvodoc.utils.creation import translationgist_contents
+from lingvodoc.utils.graphql_cache import (
+    DOCUMENT_CACHE,
+    execute_cached,
+    persisted_query_hash)
 from lingvodoc.utils.proxy import ProxyPass
 from lingvodoc.utils.verification import check_client_id
 
@@ -1138,6 +1142,11 @@ def graphql(request):
 
     {"variables": {}, "query": "query perspective{ perspective(id: [630,9]) {id translation tree{id} fields{id} }}"}
 
+    or a persisted query, see lingvodoc/utils/graphql_cache.py, sent either with its hash only or, if the
+    server does not know it yet, with both the query and its hash:
+
+    {"variables": {}, "extensions": {"persistedQuery": {"version": 1, "sha256Hash": "..."}}}
+
     or a batch of queries:
 
     [
@@ -1171,6 +1180,9 @@ def graphql(request):
         batch = False
         variable_values = {}
 
+        request_string = None
+        request_hash = None
+
         client_id = (
             request.authenticated_userid or None)
 
@@ -1238,10 +1250,13 @@ def graphql(request):
 
             if type(json_req) is not list:
 
-                if "query" not in json_req:
+                request_hash = (
+                    persisted_query_hash(json_req))
+
+                if "query" not in json_req and request_hash is None:
                     return {'errors': [{"message": 'query key not found'}]}
 
-                request_string = json_req["query"]
+                request_string = json_req.get("query")
 
                 if "variables" in json_req:
                     variable_values = json_req["variables"]
@@ -1278,15 +1293,25 @@ def graphql(request):
 
             for query in json_req:
 
-                if "query" not in query:
+                query_hash = (
+                    persisted_query_hash(query))
+
+                if "query" not in query and query_hash is None:
                     return {'errors': [{"message": 'query key not found'}]}
 
                 result_item = (
 
-                    schema.execute(
-                        query["query"],
+                    execute_cached(
+                        schema,
+                        query.get("query"),
+                        query_hash,
                         context_value = context,
-                        variable_values = query.get("variables", {})))
+                        variable_values = query.get("variables", {}),
+                        middleware = loader_middleware_manager))
+
+                # Objects loaded by the query's resolvers can be changed by subsequent ones.
+
+                context.reset_loader()
 
                 if result_item.invalid:
 
@@ -1298,7 +1323,7 @@ def graphql(request):
                     error_flag = True
                     break
 
-                if result.errors:
+                if result_item.errors:
 
                     sp.rollback()
 
@@ -1321,10 +1346,13 @@ def graphql(request):
 
             result = (
 
-                schema.execute(
+                execute_cached(
+                    schema,
                     request_string,
+                    request_hash,
                     context_value = context,
-                    variable_values = variable_values))
+                    variable_values = variable_values,
+                    middleware = loader_middleware_manager))
 
             if result.invalid:
 
@@ -1387,7 +1415,8 @@ def graphql(request):
 
         log.debug(
             '\nschema.execute() elapsed time real, process: '
-            f'{t_elapsed_real:.6f}s, {t_elapsed_process:.6f}s')
+            f'{t_elapsed_real:.6f}s, {t_elapsed_process:.6f}s'
+            f'\nquery document cache: {DOCUMENT_CACHE.stats()}')
 
         request.response.headerlist.append((
             'Server-Timing',
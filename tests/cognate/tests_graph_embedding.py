@@ -0,0 +1,66 @@
+
+import unittest
+
+import numpy
+import scipy.optimize
+
+from lingvodoc.schema.gql_cognate import CognateAnalysis
+
+
+class GraphEmbeddingTest(unittest.TestCase):
+    """
+    Checks of the gradient of the graph embedding stress against finite differences.
+    """
+
+    def setUp(self):
+
+        self.random = numpy.random.RandomState(2)
+
+    def random_distance_matrix(self, N, zero_count = 0):
+
+        d_ij = self.random.random_sample((N, N)) * 10 + 0.5
+
+        for _ in range(zero_count):
+
+            i, j = self.random.choice(N, 2, replace = False)
+            d_ij[i, j] = d_ij[j, i] = 0
+
+        d_lower = numpy.tril(d_ij, -1)
+
+        return d_lower + d_lower.T
+
+    def check_gradient(self, N, dimension, zero_count = 0):
+
+        d_ij = self.random_distance_matrix(N, zero_count)
+
+        f, df = (
+            CognateAnalysis.graph_embedding_stress(d_ij, dimension))
+
+        for _ in range(5):
+
+            xy = self.random.random_sample(N * dimension) * 10
+
+            error = scipy.optimize.check_grad(f, df, xy)
+            norm = numpy.linalg.norm(df(xy))
+
+            self.assertLess(error, 1e-5 * max(norm, 1.0))
+
+    def test_gradient_2d(self):
+
+        self.check_gradient(10, 2)
+        self.check_gradient(100, 2)
+
+    def test_gradient_3d(self):
+
+        self.check_gradient(10, 3)
+        self.check_gradient(100, 3)
+
+    def test_gradient_zero_2d(self):
+
+        self.check_gradient(10, 2, zero_count = 5)
+        self.check_gradient(100, 2, zero_count = 50)
+
+    def test_gradient_zero_3d(self):
+
+        self.check_gradient(10, 3, zero_count = 5)
+        self.check_gradient(100, 3, zero_count = 50)
@@ -0,0 +1,101 @@
+
+import collections
+import random
+import unittest
+
+from pylev import levenshtein
+
+from lingvodoc.merge_perspectives import (
+    bounded_edit_distance,
+    edit_distance_match_count,
+    edit_distance_pairs)
+
+
+class EditDistanceTest(unittest.TestCase):
+    """
+    Randomized checks of bounded and indexed Levenshtein distance computations against plain Levenshtein
+    distance, so that lexical entry matching results are the same as with pairwise pylev comparisons.
+    """
+
+    def setUp(self):
+
+        self.random = random.Random(2)
+
+    def random_string_list(self, count, alphabet = 'abcд', max_length = 8):
+
+        return sorted(set(
+
+            ''.join(
+                self.random.choice(alphabet)
+                for _ in range(self.random.randint(0, max_length)))
+
+            for _ in range(count)))
+
+    def test_bounded_edit_distance(self):
+
+        string_list = self.random_string_list(150)
+
+        for _ in range(5000):
+
+            a = self.random.choice(string_list)
+            b = self.random.choice(string_list)
+            limit = self.random.randint(0, 4)
+
+            self.assertEqual(
+                bounded_edit_distance(a, b, limit),
+                min(levenshtein(a, b), limit + 1),
+                (a, b, limit))
+
+    def test_edit_distance_pairs(self):
+
+        for limit in range(4):
+
+            string_list = self.random_string_list(120)
+
+            pair_list = [
+                (index_a, index_b)
+                for index_b, b in enumerate(string_list)
+                for index_a, a in enumerate(string_list[:index_b])
+                if levenshtein(a, b) <= limit]
+
+            self.assertEqual(
+                list(edit_distance_pairs(string_list, limit)),
+                pair_list)
+
+            # Chunks of the pair space give the same pairs.
+
+            chunk_list = []
+
+            for start in range(0, len(string_list), 17):
+
+                chunk_list.extend(
+                    edit_distance_pairs(string_list, limit, start, start + 17))
+
+            self.assertEqual(chunk_list, pair_list)
+
+    def test_edit_distance_match_count(self):
+
+        string_list = self.random_string_list(100)
+
+        entry_id_list_list = [
+            sorted(set((self.random.randint(1, 2), self.random.randint(1, 30)) for _ in range(2)))
+            for _ in string_list]
+
+        match_counter = collections.Counter()
+
+        for index_b, b in enumerate(string_list):
+            for index_a, a in enumerate(string_list[:index_b]):
+
+                if levenshtein(a, b) > 2:
+                    continue
+
+                for entry_id in entry_id_list_list[index_a]:
+                    for other_id in entry_id_list_list[index_b]:
+
+                        if entry_id != other_id:
+                            match_counter[tuple(sorted((entry_id, other_id)))] += 1
+
+        self.assertEqual(
+            edit_distance_match_count(
+                (string_list, entry_id_list_list, 2, 0, None)),
+            match_counter)
@@ -0,0 +1,101 @@
+# 
+# NOTE
+#
+# See information on how tests are organized and how they should work in the tests' package __init__.py file
+# (currently lingvodoc/tests/__init__.py).
+#
+
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from lingvodoc.views.v2.phonology import Acoustic_Cache
+
+
+class AcousticCacheTest(unittest.TestCase):
+    """
+    Checks of tracking of the total size of acoustic cache entries and of their eviction.
+    """
+
+    def setUp(self):
+
+        self.storage_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+
+        shutil.rmtree(self.storage_dir)
+
+    def cache(self, max_size = None):
+
+        return (
+            Acoustic_Cache({'path': self.storage_dir}, max_size = max_size))
+
+    def scan_size(self, cache):
+
+        return sum(size for _, _, size in cache.scan())
+
+    def recorded_size(self, cache):
+
+        with cache.size_record() as size_file:
+            return cache.read_size(size_file)
+
+    def test_size_record(self):
+
+        cache = self.cache()
+
+        for i in range(32):
+            cache.set(str(i), os.urandom(i * 64))
+
+        # Replacing entries.
+
+        for i in range(0, 32, 3):
+            cache.set(str(i), os.urandom(i * 16))
+
+        for i in range(0, 32, 5):
+            cache.delete(str(i))
+
+        cache.delete('absent')
+
+        self.assertEqual(self.recorded_size(cache), self.scan_size(cache))
+        self.assertIsNotNone(cache.get('1'))
+        self.assertIsNone(cache.get('0'))
+
+    def test_missing_size_record(self):
+
+        cache = self.cache()
+
+        for i in range(8):
+            cache.set(str(i), os.urandom(256))
+
+        os.remove(
+            os.path.join(cache.cache_dir, cache.size_file_name))
+
+        cache.set('8', os.urandom(256))
+
+        self.assertEqual(self.recorded_size(cache), self.scan_size(cache))
+
+    def test_evict(self):
+
+        cache = self.cache(max_size = 1 << 20)
+
+        for i in range(16):
+            cache.set(str(i), os.urandom(4096))
+
+        # Under the maximum size the cache is not listed.
+
+        with mock.patch.object(cache, 'scan', side_effect = AssertionError):
+            self.assertEqual(cache.evict(), 0)
+
+        cache.max_size = self.scan_size(cache) // 2
+
+        remove_count = cache.evict()
+
+        self.assertGreater(remove_count, 0)
+
+        total_size = self.scan_size(cache)
+
+        self.assertLessEqual(total_size, cache.max_size * 0.9)
+        self.assertEqual(self.recorded_size(cache), total_size)
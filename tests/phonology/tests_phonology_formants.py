@@ -0,0 +1,115 @@
+# 
+# NOTE
+#
+# See information on how tests are organized and how they should work in the tests' package __init__.py file
+# (currently lingvodoc/tests/__init__.py).
+#
+
+
+import math
+import unittest
+
+import numpy
+
+from lingvodoc.views.v2.phonology import (
+    burg,
+    burg_numpy,
+    compute_formants,
+    compute_formants_numpy)
+
+
+def synthetic_frame(frame_rate, frequency_list, length, phase = 0.0):
+    """
+    Generates a frame of a sum of decaying sinusoids with specified frequencies, resembling a vowel.
+    """
+
+    return [
+
+        sum(
+            math.exp(-i * 0.002 * (j + 1)) *
+                math.sin(2 * math.pi * frequency * i / frame_rate + phase * (j + 1))
+            for j, frequency in enumerate(frequency_list))
+
+        for i in range(length)]
+
+
+class FormantEngineTest(unittest.TestCase):
+    """
+    Checks that numpy formant computation engine gives the same results as the reference pure Python
+    implementation.
+    """
+
+    frame_rate = 11025
+    frame_length = 275
+
+    frequency_list_list = [
+        [700, 1220, 2600],
+        [300, 870, 2240],
+        [270, 2290, 3010],
+        [570, 840, 2410]]
+
+    def frame_list(self):
+
+        return [
+
+            synthetic_frame(
+                self.frame_rate, frequency_list, self.frame_length, phase = 0.1 * index)
+
+            for index, frequency_list in enumerate(self.frequency_list_list)]
+
+    def test_burg(self):
+
+        for sample_list in self.frame_list():
+
+            window_list = [
+                sample * (1 - math.cos(2 * math.pi * i / (len(sample_list) - 1))) * 0.5
+                for i, sample in enumerate(sample_list)]
+
+            a0, coefficient_list = burg(window_list, 10)
+            a0_array, coefficient_array = burg_numpy(numpy.array(window_list), 10)
+
+            self.assertTrue(math.isclose(a0_array, a0, rel_tol = 1e-9))
+
+            self.assertTrue(
+                numpy.allclose(coefficient_array, coefficient_list, rtol = 0, atol = 1e-9))
+
+    def test_formants(self):
+
+        nyquist_frequency = self.frame_rate * 0.5
+
+        for sample_list in self.frame_list():
+
+            reference_list = compute_formants(sample_list, nyquist_frequency)
+            formant_array = compute_formants_numpy(numpy.array(sample_list), nyquist_frequency)
+
+            self.assertEqual(formant_array.shape, (5,))
+
+            self.assertTrue(
+                numpy.allclose(formant_array, reference_list, rtol = 0, atol = 1e-6))
+
+    def test_formants_batch(self):
+
+        nyquist_frequency = self.frame_rate * 0.5
+        frame_list = self.frame_list()
+
+        formant_array = (
+            compute_formants_numpy(numpy.array(frame_list), nyquist_frequency))
+
+        self.assertEqual(formant_array.shape, (len(frame_list), 5))
+
+        for sample_list, formant_row in zip(frame_list, formant_array):
+
+            self.assertTrue(
+                numpy.allclose(
+                    formant_row,
+                    compute_formants_numpy(numpy.array(sample_list), nyquist_frequency),
+                    rtol = 0, atol = 1e-9))
+
+    def test_formants_silence(self):
+
+        nyquist_frequency = self.frame_rate * 0.5
+
+        formant_array = (
+            compute_formants_numpy(numpy.zeros(self.frame_length), nyquist_frequency))
+
+        self.assertEqual(formant_array.tolist(), [nyquist_frequency] * 5)
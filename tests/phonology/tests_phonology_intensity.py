@@ -0,0 +1,76 @@
+# 
+# NOTE
+#
+# See information on how tests are organized and how they should work in the tests' package __init__.py file
+# (currently lingvodoc/tests/__init__.py).
+#
+
+
+import math
+import unittest
+
+import numpy
+import pydub
+
+from lingvodoc.views.v2.phonology import AudioPraatLike
+
+
+def synthetic_sound(frame_rate, channel_count, duration):
+    """
+    Generates a 16-bit sound recording of amplitude-modulated noise with a silent beginning.
+    """
+
+    random_state = numpy.random.RandomState(1)
+    frame_count = int(frame_rate * duration)
+
+    envelope_array = (
+        numpy.sin(numpy.arange(frame_count) / frame_rate * 3) ** 2)
+
+    envelope_array[: frame_count // 4] = 0
+
+    sample_array = (
+
+        (random_state.normal(0, 3000, (frame_count, channel_count)) * envelope_array[:, None])
+            .astype(numpy.int16))
+
+    return (
+
+        pydub.AudioSegment(
+            data = sample_array.tobytes(),
+            sample_width = 2,
+            frame_rate = frame_rate,
+            channels = channel_count))
+
+
+class IntensityTest(unittest.TestCase):
+    """
+    Checks that whole recording intensity computation gives the same results as the point by point one.
+    """
+
+    def check_intensity(self, frame_rate, channel_count, duration):
+
+        sound = synthetic_sound(frame_rate, channel_count, duration)
+
+        reference = AudioPraatLike(sound)
+        step_count = reference.intensity_step_count
+
+        reference_list = [
+            reference.get_intensity(step_index)
+            for step_index in range(4, step_count - 4)]
+
+        audio = AudioPraatLike(sound)
+        audio.init_intensity()
+
+        self.assertEqual(len(audio.intensity_list), step_count)
+
+        for value, reference_value in zip(audio.intensity_list[4 : step_count - 4], reference_list):
+            self.assertTrue(math.isclose(value, reference_value, rel_tol = 1e-9, abs_tol = 1e-9))
+
+    def test_mono(self):
+        self.check_intensity(22050, 1, 3.0)
+
+    def test_stereo(self):
+        self.check_intensity(44100, 2, 2.0)
+
+    def test_short(self):
+        self.check_intensity(8000, 1, 0.05)
@@ -0,0 +1,66 @@
+
+import unittest
+
+from lingvodoc.utils.search import eaf_index_pattern_list
+
+
+class EafIndexPatternTest(unittest.TestCase):
+    """
+    Tests of EAF search index prefilter patterns, any query the prefilter is not sure of must give None, so
+    that all EAF files are searched.
+    """
+
+    def test_match(self):
+
+        self.assertEqual(
+            eaf_index_pattern_list(
+                {'type': 'annotation', 'value': 'Kuda Idesh'}),
+            ['kuda', 'idesh'])
+
+        self.assertEqual(
+            eaf_index_pattern_list(
+                {'type': 'tier', 'value': 'Transcription'}),
+            ['transcription'])
+
+    def test_compound(self):
+
+        search_query = {
+            'type': 'and',
+            'value': [
+                {'type': 'tier', 'value': 'translation'},
+                {'type': 'or', 'value': [
+                    {'type': 'annotation', 'value': 'dog'},
+                    {'type': 'annotation', 'value': 'cat'}]}]}
+
+        self.assertEqual(
+            eaf_index_pattern_list(search_query),
+            ['translation', 'dog', 'cat'])
+
+    def test_unknown(self):
+
+        for search_query in [
+
+            None,
+            'dog',
+            {},
+            {'value': 'dog'},
+            {'type': 'not', 'value': [{'type': 'annotation', 'value': 'dog'}]},
+            {'type': 'annotation', 'value': 'dog', 'exclude': True},
+            {'type': 'annotation', 'value': 'dog', 'mode': 'regexp'},
+            {'type': 'annotation_regexp', 'value': 'dog'},
+            {'type': 'and', 'value': []},
+            {'type': 'and', 'value': 'dog'},
+            {'type': 'or', 'value': [
+                {'type': 'annotation', 'value': 'dog'},
+                {'type': 'gloss', 'value': 'cat'}]}]:
+
+            self.assertIsNone(
+                eaf_index_pattern_list(search_query), search_query)
+
+    def test_regexp_empty(self):
+
+        for value in ['do.', 'd[o]g', '^dog', '', '  ', None, ['dog']]:
+
+            self.assertIsNone(
+                eaf_index_pattern_list(
+                    {'type': 'annotation', 'value': value}), value)